@@ -5,30 +5,83 @@ import dash_bootstrap_components as dbc
 from dash import Dash
 
 from src.unicycle.dashboard.callbacks import register_callbacks
+from src.unicycle.dashboard.change_feed import register_change_feed
 from src.unicycle.dashboard.components import build_layout
 from src.unicycle.dashboard.data_service import DataService
+from src.unicycle.dashboard.score_storage import STORAGE_WIDE
+from src.unicycle.db_handler.connection_pool import (
+    CONNECTION_POOL,
+    SQLITE_BUSY_TIMEOUT_MS,
+)
 
 
 class Dashboard:
     """Main dashboard class for the unicycle scoring dashboard."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        config: dict = None,
+        max_result_streams: int = None,
+        watch_results: bool = False,
+    ):
+        """
+        Build the Dash application and its data service.
+        Keyword arguments:
+            config -- dashboard configuration, read from config.json if not given
+            max_result_streams -- maximum number of live result streams, None for
+                no limit; participant pages beyond the limit poll the results
+            watch_results -- whether the live result feed also pushes results
+                written by other processes, needed with several server workers
+        """
         self.app = Dash(
             __name__,
             title="Fahrerinnen & Jury Dashboard",
             suppress_callback_exceptions=True,
             external_stylesheets=[dbc.themes.DARKLY],
         )
-        self.config = load_config(get_path_config_file())
+        self.config = config or load_config(get_path_config_file())
         self.stored_hash = self.config["jury_password_hash"].encode()
-        self.data_service = DataService(get_path_project_root())
+        CONNECTION_POOL.busy_timeout_ms = self.config.get(
+            "sqlite_busy_timeout_ms", SQLITE_BUSY_TIMEOUT_MS
+        )
+        self.data_service = DataService(
+            get_path_project_root(),
+            write_behind=self.config.get("write_behind", False),
+            score_storage=self.config.get("score_storage", STORAGE_WIDE),
+        )
+        self.data_service.change_feed.max_subscribers = max_result_streams
+        if watch_results:
+            self.data_service.watch_results()
+
+        self.app.layout = build_layout
+        register_change_feed(self.app.server, self.data_service.change_feed)
+        register_callbacks(
+            self.app,
+            self.data_service,
+            self.stored_hash,
+            server_side_table=self.config.get("server_side_table", False),
+        )
+
+    def run(self, debug: bool = True):
+        """Start the Dash development server, see serve.py for production."""
+        self.app.run(debug=debug)
 
-        self.app.layout = build_layout()
-        register_callbacks(self.app, self.data_service, self.stored_hash)
 
-    def run(self):
-        """Start the Dash development server."""
-        self.app.run(debug=True)
+def create_app(
+    config: dict = None, max_result_streams: int = None, watch_results: bool = False
+) -> Dash:
+    """
+    Create a new dashboard application.
+    Every worker process of a production server calls this once after it was
+    started, so each worker builds its own data service, writer thread and
+    database connections.
+    Keyword arguments:
+        config -- dashboard configuration, read from config.json if not given
+        max_result_streams -- maximum number of live result streams, None for no limit
+        watch_results -- whether the live result feed also pushes results written
+            by other processes
+    """
+    return Dashboard(config, max_result_streams, watch_results).app
 
 
 if __name__ == "__main__":
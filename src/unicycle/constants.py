@@ -52,6 +52,9 @@ MAX_TP_SCORE = 10
 
 CATEGORY_COL = "category"
 
+PARTICIPANT_PAGE_SIZE = 50
+RESULT_POLL_INTERVAL_MS = 5000
+
 COLUMN_LABELS = {
     "routine_name": "Kür-Name",
     "names": "Namen*",
@@ -142,6 +145,8 @@ DARK_THEME = {
     "border": "#444444",
 }
 
+THEME_VARS = {key: f"var(--theme-{key})" for key in LIGHT_THEME}
+
 
 def get_path_project_root() -> Path:
     """return path to project root."""
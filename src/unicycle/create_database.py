@@ -1,18 +1,80 @@
+import argparse
+import hashlib
+import importlib.util
+import os
 import string
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
+import numpy as np
+import openpyxl
 import pandas as pd
 
 from pandas import DataFrame
 
 from src.unicycle.constants import *
 from src.unicycle.db_handler.points_db_handler import PointsDbHandler
+from src.unicycle.db_handler.registration_files_db_handler import (
+    RegistrationFilesDbHandler,
+)
 from src.unicycle.db_handler.riders_db_handler import RidersDbHandler
 from src.unicycle.db_handler.routines_db_handler import RoutinesDbHandler
 from src.unicycle.db_handler.riders_routines_db_handler import RidersRoutinesDbHandler
+from src.unicycle.db_handler.score_events_db_handler import ScoreEventsDbHandler
 
 SHEET_NAME_REGISTRATION_DATA = "Teilnehmer"
 SHEET_NAME_REGISTRATION_OVERVIEW = "Allg. Daten"
 CELL_WITH_CLUB = (7, "E")
+# first data row of the registration sheet, after the rows skipped by read_excel and the header
+FIRST_ROW_REGISTRATION_DATA = 6
+# strings read_excel reads as missing values
+NA_STRINGS = {
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+}
+# increase whenever a registration parser changes its result, which invalidates the cache
+PARSER_VERSION = 1
+PARSER_PANDAS = "pandas"
+PARSER_STREAMING = "streaming"
+DIRECTORY_REGISTRATION_CACHE = Path("data/registration_cache")
+
+SQL_NEXT_ID_ROUTINE = """
+    SELECT MAX(
+        COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'routines'), 0),
+        COALESCE((SELECT MAX(id_routine) FROM routines), 0)
+    ) + 1 AS id_routine"""
+
+SQL_SELECT_FILE_RIDERS = """
+    SELECT id_rider, name, date_of_birth FROM riders WHERE registration_file = ?
+    ORDER BY id_rider"""
+
+SQL_SELECT_FILE_ROUTINES = """
+    SELECT routines.id_routine, routines.routine_name, routines.category,
+        riders.name, riders.date_of_birth
+    FROM routines
+    JOIN riders_routines ON riders_routines.id_routine = routines.id_routine
+    JOIN riders ON riders.id_rider = riders_routines.id_rider
+    WHERE riders.registration_file = ?"""
+
+SQL_SELECT_RIDER_WITHOUT_FILE = """
+    SELECT 1 FROM riders WHERE registration_file IS NULL LIMIT 1"""
 
 COL_NAMES_REGISTRATION_FILE = [
     "name",
@@ -68,6 +130,156 @@ def read_registration_file(path: Path) -> pd.DataFrame:
     return registration_stripped
 
 
+def read_registration_file_streaming(path: Path) -> pd.DataFrame:
+    """
+    Read the registration file like read_registration_file, but stream the rows of
+    the read-only workbook instead of loading both sheets with pandas. Strings are
+    stripped and missing values are converted while streaming.
+    Keyword arguments:
+        path -- path to registration file
+    return pd.Dataframe with registration data
+    """
+    workbook = openpyxl.load_workbook(
+        path, read_only=True, data_only=True, keep_links=False
+    )
+    try:
+        club = convert_registration_cell(
+            workbook[SHEET_NAME_REGISTRATION_OVERVIEW][
+                f"{CELL_WITH_CLUB[1]}{CELL_WITH_CLUB[0]}"
+            ].value
+        )
+        number_of_columns = len(COL_NAMES_REGISTRATION_FILE)
+        rows, index = [], []
+        for row_number, row in enumerate(
+            workbook[SHEET_NAME_REGISTRATION_DATA].iter_rows(
+                min_row=FIRST_ROW_REGISTRATION_DATA,
+                max_col=number_of_columns,
+                values_only=True,
+            )
+        ):
+            values = [convert_registration_cell(value) for value in row]
+            if not values or values[0] is None:
+                continue
+            rows.append(values + [None] * (number_of_columns - len(values)))
+            index.append(row_number)
+    finally:
+        workbook.close()
+
+    # the constructor infers the same dtypes as the cell-wise strip of read_registration_file
+    registration = pd.DataFrame(rows, index=index, columns=COL_NAMES_REGISTRATION_FILE)
+    registration = registration.drop(columns="entry_fee")
+    # read_excel reads columns without any value as float
+    registration = registration.astype(
+        {col: float for col in registration.columns[registration.isna().all()]}
+    )
+    registration["date_of_birth"] = pd.to_datetime(
+        registration["date_of_birth"]
+    ).dt.date
+    registration.insert(4, "club", [club] * len(registration))
+    return registration
+
+
+def convert_registration_cell(value):
+    """
+    Convert a cell value of a registration file like read_excel does and strip strings
+    Keyword arguments:
+        value -- cell value read by openpyxl
+    return converted value, None for missing values
+    """
+    if isinstance(value, str):
+        if value in NA_STRINGS:
+            return None
+        return value.strip()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+REGISTRATION_PARSERS = {
+    PARSER_PANDAS: read_registration_file,
+    PARSER_STREAMING: read_registration_file_streaming,
+}
+
+
+def is_registration_cache_available() -> bool:
+    """
+    Check whether pyarrow is installed, which is needed to write the Parquet files
+    of the registration cache
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def read_registration_file_cached(
+    path: Path, cache_directory: Path = None, parser: str = PARSER_PANDAS
+) -> pd.DataFrame:
+    """
+    Read the registration file from the cache of parsed registration files.
+    On a cache miss the file is parsed and its registration data is cached as
+    Parquet file keyed by file hash, parser and parser version. Without cache
+    directory or pyarrow the file is always parsed.
+    Keyword arguments:
+        path -- path to registration file
+        cache_directory -- directory of the cache, None to disable the cache
+        parser -- name of the parser in REGISTRATION_PARSERS
+    return pd.Dataframe with registration data
+    """
+    read_file = REGISTRATION_PARSERS[parser]
+    if cache_directory is None or not is_registration_cache_available():
+        return read_file(path)
+
+    cache_path = Path(
+        cache_directory,
+        f"{hash_registration_file(path)}_{parser}_v{PARSER_VERSION}.parquet",
+    )
+    if cache_path.exists():
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception as e:
+            print(f"❌ Failed to read cached registration {cache_path.name}: {e}")
+
+    registration = read_file(path)
+    try:
+        cache_directory.mkdir(parents=True, exist_ok=True)
+        # written under a temporary name, so parallel imports never read a partial file
+        temporary_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        registration.to_parquet(temporary_path)
+        os.replace(temporary_path, cache_path)
+    except Exception as e:
+        print(f"❌ Failed to cache registration {path.name}: {e}")
+    return registration
+
+
+def read_registration_files(
+    files: list,
+    jobs: int = 1,
+    cache_directory: Path = None,
+    parser: str = PARSER_PANDAS,
+) -> list[pd.DataFrame]:
+    """
+    Read several registration files, in parallel worker processes if jobs > 1
+    Keyword arguments:
+        files -- paths to registration files
+        jobs -- number of worker processes parsing the files
+        cache_directory -- directory of the cache of parsed registration files,
+            None to always parse the files
+        parser -- name of the parser in REGISTRATION_PARSERS
+    return list of dataframes with registration data in the order of files, with
+        the name of its file in the column registration_file
+    """
+    read_file = partial(
+        read_registration_file_cached, cache_directory=cache_directory, parser=parser
+    )
+    if jobs <= 1 or len(files) <= 1:
+        registrations = [read_file(file) for file in files]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+            registrations = list(executor.map(read_file, files))
+    return [
+        registration.assign(registration_file=Path(file).name)
+        for file, registration in zip(files, registrations)
+    ]
+
+
 def fill_database_riders(
     registration: pd.DataFrame, rider_db_handler=RidersDbHandler()
 ):
@@ -78,16 +290,74 @@ def fill_database_riders(
         rider_db_handler:
     """
 
-    df_riders = registration[["name", "gender", "date_of_birth", "age", "club"]]
-    df_riders.assign(
-        age=df_riders["date_of_birth"].apply(
-            lambda date_of_birth: calculate_age(date_of_birth, DATE_COMPETITION)
-        )
-    )
-    sql_insert = """INSERT INTO riders (name, gender, date_of_birth, age_competition_day, club) VALUES (? , ? , ? , ? , ?) """
+    df_riders = build_riders(registration)
+    sql_insert = """INSERT INTO riders (name, gender, date_of_birth, age_competition_day, club, registration_file) VALUES (? , ? , ? , ? , ? , ?) """
     rider_db_handler.execute(sql_insert, df_riders.itertuples(index=False, name=None))
 
 
+def build_riders(registration: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the rows of the table riders from registration data
+    Keyword arguments:
+        registration: dataframe with registration data
+    return dataframe with name, gender, date_of_birth, age_competition_day, club
+        and registration_file, missing values as None
+    """
+    df_riders = registration[["name", "gender", "date_of_birth"]].assign(
+        age_competition_day=calculate_ages(
+            registration["date_of_birth"], DATE_COMPETITION
+        ),
+        club=registration["club"],
+        registration_file=registration.get("registration_file"),
+    )
+    df_riders = df_riders.astype(object)
+    return df_riders.where(df_riders.notna(), None)
+
+
+def build_routines(registration: pd.DataFrame, first_id_routine: int) -> tuple:
+    """
+    Build the routines of a registration and the riders taking part in them
+    Routines are numbered in the order of Categories, age group and routine name.
+    Keyword arguments:
+        registration -- dataframe with registration data
+        first_id_routine -- id of the first new routine
+    return (dataframe with id_routine, routine_name, category and age_group,
+        dataframe with name, date_of_birth and id_routine)
+    """
+    df_entries = pd.concat(
+        [
+            registration[
+                ["name", "date_of_birth", "name_" + category, "age_group_" + category]
+            ]
+            .set_axis(["name", "date_of_birth", "routine_name", "age_group"], axis=1)
+            .dropna()
+            .assign(category=str(category), category_rank=rank)
+            for rank, category in enumerate(Categories)
+        ],
+        ignore_index=True,
+    )
+    df_entries = df_entries[
+        ~df_entries["routine_name"].astype(str).str.isspace()
+    ].astype({"routine_name": object, "age_group": object})
+
+    df_routines = (
+        df_entries[["category_rank", "age_group", "routine_name", "category"]]
+        .drop_duplicates()
+        .sort_values(["category_rank", "age_group", "routine_name"])
+        .reset_index(drop=True)
+    )
+    df_routines.insert(
+        0, "id_routine", range(first_id_routine, first_id_routine + len(df_routines))
+    )
+    df_entries = df_entries.merge(
+        df_routines, on=["category_rank", "category", "age_group", "routine_name"]
+    )
+    return (
+        df_routines[["id_routine", "routine_name", "category", "age_group"]],
+        df_entries[["name", "date_of_birth", "id_routine"]],
+    )
+
+
 def fill_database_routines(
     registration: pd.DataFrame,
     riders_db_handler=RidersDbHandler(),
@@ -96,69 +366,67 @@ def fill_database_routines(
 ):
     """
     create the databases routines.db and riders_routines.db
+    Riders are linked by the exact combination of name and date of birth; if
+    several riders share it, the latest inserted one is used. All rows are
+    written in one transaction.
     Keyword arguments:
         registration: dataframe with registration data
     """
 
-    for category in Categories:
-        for age_group in set(
-            registration["age_group_" + str(category)].dropna()
-        ):  # age groups in this category
-            for routine_name in set(
-                (
-                    registration[str("name_" + category)].where(
-                        registration[str("age_group_" + category)] == age_group
-                    )
-                ).dropna()
-            ):
-                if routine_name.isspace():
-                    continue
-
-                sql_insert = """INSERT INTO routines (routine_name, category, age_group) VALUES (? , ? , ? )"""
-                data = (
-                    (
-                        routine_name,
-                        category,
-                        age_group,
-                    ),
-                )
-                routines_db_handler.execute(sql_insert, data)
-                id_routine = routines_db_handler.cursor.lastrowid
-
-                name_riders = (
-                    registration[["name", "date_of_birth"]]
-                    .where(
-                        (registration[str("name_" + category)] == routine_name)
-                        & (registration[str("age_group_" + category)] == age_group)
-                    )
-                    .dropna()
-                )
+    df_next_id = routines_db_handler.get_data(SQL_NEXT_ID_ROUTINE)
+    df_routines, df_entries = build_routines(
+        registration, int(df_next_id["id_routine"].iloc[0])
+    )
+    if df_routines.empty:
+        return
 
-                placeholders = ", ".join(["?"] * len(name_riders))
-                sql_select_id_rider = f"""
-                        SELECT id_rider FROM riders
-                        WHERE name IN ({placeholders})
-                          AND date_of_birth IN ({placeholders})
-                        """
-
-                id_rider = riders_db_handler.get_data(
-                    sql_select_id_rider,
-                    name_riders["name"].tolist()
-                    + name_riders["date_of_birth"].tolist(),
-                )
+    df_riders = riders_db_handler.get_data(
+        "SELECT id_rider, name, date_of_birth FROM riders ORDER BY id_rider"
+    )
+    insert_routines(df_routines, df_entries, df_riders, routines_db_handler)
 
-                sql_insert = """INSERT INTO riders_routines (id_rider, id_routine) VALUES (?, ? ) """
 
-                data = list(
-                    zip(
-                        id_rider["id_rider"].tolist(),
-                        [
-                            id_routine,
-                        ]
-                        * len(id_rider["id_rider"].tolist()),
-                    )
-                )
-                riders_routines_db_handler.execute(sql_insert, data)
+def insert_routines(
+    df_routines: pd.DataFrame,
+    df_entries: pd.DataFrame,
+    df_riders: pd.DataFrame,
+    routines_db_handler=RoutinesDbHandler(),
+):
+    """
+    Insert routines and link them with their riders
+    Riders are linked by the exact combination of name and date of birth; if
+    several riders share it, the latest inserted one is used.
+    Keyword arguments:
+        df_routines -- routines from build_routines
+        df_entries -- riders of the routines from build_routines
+        df_riders -- riders with id_rider, name and date_of_birth ordered by id_rider
+        routines_db_handler -- DbHandler for Database with routine data
+    """
+    df_riders = df_riders.drop_duplicates(["name", "date_of_birth"], keep="last")
+    df_riders_routines = df_entries.merge(
+        df_riders, on=["name", "date_of_birth"]
+    ).drop_duplicates(["id_rider", "id_routine"])
+
+    sql_insert_routines = """INSERT INTO routines (id_routine, routine_name, category, age_group) VALUES (?, ?, ?, ?)"""
+    sql_insert_riders_routines = (
+        """INSERT INTO riders_routines (id_rider, id_routine) VALUES (?, ? ) """
+    )
+    routines_db_handler.execute_statements(
+        [
+            (
+                sql_insert_routines,
+                list(df_routines.astype(object).itertuples(index=False, name=None)),
+            ),
+            (
+                sql_insert_riders_routines,
+                list(
+                    df_riders_routines[["id_rider", "id_routine"]]
+                    .astype(object)
+                    .itertuples(index=False, name=None)
+                ),
+            ),
+        ]
+    )
 
 
 def create_database_points(
@@ -173,10 +441,258 @@ def create_database_points(
     """
 
     id_routine = routines_db_handler.get_data("""SELECT id_routine FROM routines""")
-    id_routine_str = [f"({val})" for val in id_routine["id_routine"].values]
-    id_routine_str = ", ".join(id_routine_str)
-    sql_insert_keys = f"INSERT INTO points (id_routine) VALUES {id_routine_str};"
-    points_db_handler.execute(sql_insert_keys)
+    sql_insert_keys = "INSERT OR IGNORE INTO points (id_routine) VALUES (?)"
+    points_db_handler.execute(
+        sql_insert_keys, [(int(val),) for val in id_routine["id_routine"].values]
+    )
+
+
+def hash_registration_file(path: Path) -> str:
+    """
+    Calculate the content hash of a registration file
+    Keyword arguments:
+        path -- path to registration file
+    return SHA-256 hex digest of the file content
+    """
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def routine_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    Build a key of every routine which does not depend on its id, its age group or
+    the split of the category individual: category, routine name and riders
+    Keyword arguments:
+        df -- one row per routine and rider with id_routine, category, routine_name,
+            name and date_of_birth
+    return series with the key of every id_routine
+    """
+    if df.empty:
+        return pd.Series(dtype=object)
+    df = df.assign(
+        category=df["category"].replace(
+            {"individual male": "individual", "individual female": "individual"}
+        ),
+        date_of_birth=df["date_of_birth"].astype(str),
+    )
+    return df.groupby("id_routine").apply(
+        lambda routine: (
+            routine["category"].iloc[0],
+            routine["routine_name"].iloc[0],
+            tuple(sorted(zip(routine["name"], routine["date_of_birth"]))),
+        ),
+        include_groups=False,
+    )
+
+
+def upsert_file_riders(
+    registration: pd.DataFrame, riders_db_handler=RidersDbHandler()
+) -> pd.DataFrame:
+    """
+    Update the riders of the registration file on the key name, date of birth
+    and registration file; new riders are inserted and riders missing in the
+    registration are removed together with their links to routines. Riders of
+    other files stay untouched, even if they belong to the same club.
+    Keyword arguments:
+        registration: dataframe with registration data of one file
+        riders_db_handler -- DbHandler for Database with rider data
+    return riders of the file with id_rider, name and date_of_birth ordered by id_rider
+    """
+    file_name = registration["registration_file"].iloc[0]
+    df_riders = build_riders(registration).drop_duplicates(["name", "date_of_birth"])
+    df_existing = riders_db_handler.get_data(SQL_SELECT_FILE_RIDERS, [file_name])
+    if df_existing.empty:
+        df_existing = pd.DataFrame(columns=["id_rider", "name", "date_of_birth"])
+    df_existing = df_existing.astype({"id_rider": object})
+
+    df_merged = df_riders.merge(
+        df_existing.drop_duplicates(["name", "date_of_birth"], keep="last"),
+        on=["name", "date_of_birth"],
+        how="left",
+    )
+    is_new = df_merged["id_rider"].isna()
+    df_updates = df_merged.loc[~is_new, ["gender", "age_competition_day", "id_rider"]]
+    df_inserts = df_merged.loc[
+        is_new,
+        [
+            "name",
+            "gender",
+            "date_of_birth",
+            "age_competition_day",
+            "club",
+            "registration_file",
+        ],
+    ]
+    id_riders_removed = df_existing.loc[
+        ~df_existing["id_rider"].isin(df_merged["id_rider"].dropna()), "id_rider"
+    ]
+
+    removed = [(int(id_rider),) for id_rider in id_riders_removed]
+    riders_db_handler.execute_statements(
+        [
+            (
+                """UPDATE riders SET gender = ?, age_competition_day = ? WHERE id_rider = ?""",
+                list(df_updates.itertuples(index=False, name=None)),
+            ),
+            (
+                """INSERT INTO riders (name, gender, date_of_birth, age_competition_day, club, registration_file) VALUES (? , ? , ? , ? , ? , ?) """,
+                list(df_inserts.itertuples(index=False, name=None)),
+            ),
+            ("""DELETE FROM riders_routines WHERE id_rider = ?""", removed),
+            ("""DELETE FROM riders WHERE id_rider = ?""", removed),
+        ]
+    )
+    return riders_db_handler.get_data(SQL_SELECT_FILE_RIDERS, [file_name])
+
+
+def build_delete_routines_statements(
+    removed: list, routines_db_handler=RoutinesDbHandler()
+) -> list:
+    """
+    Build the statements deleting routines with their riders links, points and scores
+    Keyword arguments:
+        removed -- list of (id_routine,) of the routines to delete
+        routines_db_handler -- DbHandler for Database with routine data
+    return list of (sql query, list of parameter sets)
+    """
+    statements = [
+        ("""DELETE FROM riders_routines WHERE id_routine = ?""", removed),
+        ("""DELETE FROM points WHERE id_routine = ?""", removed),
+        ("""DELETE FROM routines WHERE id_routine = ?""", removed),
+    ]
+    df_tables = routines_db_handler.get_data(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'scores'"
+    )
+    if not df_tables.empty:
+        statements.append(("""DELETE FROM scores WHERE id_routine = ?""", removed))
+    return statements
+
+
+def update_file_routines(
+    registration: pd.DataFrame,
+    df_existing_routines: pd.DataFrame,
+    df_riders: pd.DataFrame,
+    routines_db_handler=RoutinesDbHandler(),
+):
+    """
+    Compare the routines of a registration file with its routines in the
+    database. Routines with the same category, name and riders are kept with
+    their points, removed routines are deleted with their points and new
+    routines are inserted.
+    Keyword arguments:
+        registration: dataframe with registration data of one file
+        df_existing_routines -- routines of the file with their riders, read
+            before the riders were updated
+        df_riders -- riders of the file from upsert_file_riders
+        routines_db_handler -- DbHandler for Database with routine data
+    """
+    file_name = registration["registration_file"].iloc[0]
+    existing_keys = routine_keys(df_existing_routines)
+    df_next_id = routines_db_handler.get_data(SQL_NEXT_ID_ROUTINE)
+    first_id_routine = int(df_next_id["id_routine"].iloc[0])
+    df_routines, df_entries = build_routines(registration, first_id_routine)
+    new_keys = routine_keys(
+        df_entries.merge(
+            df_routines[["id_routine", "routine_name", "category"]], on="id_routine"
+        )
+    )
+
+    id_routines_removed = existing_keys.index[~existing_keys.isin(set(new_keys))]
+    id_routines_added = new_keys.index[~new_keys.isin(set(existing_keys))]
+
+    # number the added routines without gaps left by the kept ones
+    new_ids = dict(
+        zip(
+            id_routines_added,
+            range(first_id_routine, first_id_routine + len(id_routines_added)),
+        )
+    )
+    df_routines = df_routines[df_routines["id_routine"].isin(new_ids)].assign(
+        id_routine=lambda df: df["id_routine"].map(new_ids)
+    )
+    df_entries = df_entries[df_entries["id_routine"].isin(new_ids)].assign(
+        id_routine=lambda df: df["id_routine"].map(new_ids)
+    )
+
+    removed = [(int(id_routine),) for id_routine in id_routines_removed]
+    routines_db_handler.execute_statements(
+        build_delete_routines_statements(removed, routines_db_handler)
+    )
+    if not df_routines.empty:
+        insert_routines(df_routines, df_entries, df_riders, routines_db_handler)
+    print(
+        f"INFO: {file_name}: {len(df_routines)} routines added, "
+        f"{len(removed)} removed, {len(existing_keys) - len(removed)} kept"
+    )
+
+
+def remove_registration_file(
+    file_name: str,
+    riders_db_handler=RidersDbHandler(),
+    routines_db_handler=RoutinesDbHandler(),
+):
+    """
+    Remove the riders and routines of a registration file which was deleted or
+    has no riders left, together with the points of its routines
+    Keyword arguments:
+        file_name -- name of the registration file
+        riders_db_handler -- DbHandler for Database with rider data
+        routines_db_handler -- DbHandler for Database with routine data
+    """
+    df_routines = routines_db_handler.get_data(SQL_SELECT_FILE_ROUTINES, [file_name])
+    df_riders = riders_db_handler.get_data(SQL_SELECT_FILE_RIDERS, [file_name])
+    removed_routines = (
+        [(int(id_routine),) for id_routine in df_routines["id_routine"].unique()]
+        if not df_routines.empty
+        else []
+    )
+    removed_riders = (
+        [(int(id_rider),) for id_rider in df_riders["id_rider"]]
+        if not df_riders.empty
+        else []
+    )
+    riders_db_handler.execute_statements(
+        build_delete_routines_statements(removed_routines, routines_db_handler)
+        + [
+            ("""DELETE FROM riders_routines WHERE id_rider = ?""", removed_riders),
+            ("""DELETE FROM riders WHERE id_rider = ?""", removed_riders),
+        ]
+    )
+    print(
+        f"INFO: {file_name}: {len(removed_riders)} riders and "
+        f"{len(removed_routines)} routines removed"
+    )
+
+
+def import_registration_incrementally(
+    registration: pd.DataFrame,
+    file_name: str,
+    riders_db_handler=RidersDbHandler(),
+    routines_db_handler=RoutinesDbHandler(),
+):
+    """
+    Update riders and routines of a registration file, keeping the points of
+    unchanged routines
+    Keyword arguments:
+        registration: dataframe with registration data of one file, see
+            read_registration_files
+        file_name -- name of the registration file, needed if it has no riders
+        riders_db_handler -- DbHandler for Database with rider data
+        routines_db_handler -- DbHandler for Database with routine data
+    """
+    if registration.empty:
+        remove_registration_file(file_name, riders_db_handler, routines_db_handler)
+        return
+    df_existing_routines = routines_db_handler.get_data(
+        SQL_SELECT_FILE_ROUTINES, [file_name]
+    )
+    df_riders = upsert_file_riders(registration, riders_db_handler)
+    update_file_routines(
+        registration, df_existing_routines, df_riders, routines_db_handler
+    )
 
 
 def split_individual_male_female(
@@ -224,6 +740,8 @@ def check_age_groups(
     """
     Checks for all routines whether the age groups in the registration file are correct.
     If not the age group will be corrected.
+    Routines without riders, without known age or of a category without age groups
+    are not changed.
     Keyword arguments:
         age_groups -- dictionary with age groups for each category
         riders_db_handler -- DbHandler for Database with rider data
@@ -244,35 +762,93 @@ def check_age_groups(
         df_routines, on="id_routine", how="left"
     )
 
-    df_max = df.groupby(["id_routine"]).max()
-    df_update_age_groups = DataFrame(columns=["id_routine", "age_group"])
+    df_max = df.groupby("id_routine", as_index=False).agg(
+        age_competition_day=("age_competition_day", "max"),
+        category=("category", "first"),
+        age_group=("age_group", "first"),
+    )
+    df_max["age_group_corrected"] = assign_age_groups(
+        df_max["age_competition_day"],
+        df_max["category"],
+        compile_age_groups(age_groups),
+    )
+    df_update_age_groups = df_max[
+        df_max["age_group_corrected"].notna()
+        & (df_max["age_group_corrected"] != df_max["age_group"])
+    ]
 
-    for row in range(df_routines.shape[0]):
-        age_group_routine = set_age_group(
-            df_max["age_competition_day"].iloc[row],
-            age_groups[df_max["category"].iloc[row]],
+    for id_routine, age_group, age_group_corrected in df_update_age_groups[
+        ["id_routine", "age_group", "age_group_corrected"]
+    ].itertuples(index=False, name=None):
+        print(
+            "INFO: the age group of routine",
+            id_routine,
+            " was corrected from ",
+            age_group,
+            " to ",
+            age_group_corrected,
         )
-        if age_group_routine != df_max["age_group"].iloc[row]:
-            new_row = pd.DataFrame(
-                {"id_routine": df_max.index[row], "age_group": age_group_routine},
-                index=[0],
-            )
-            df_update_age_groups = pd.concat(
-                [new_row, df_update_age_groups.loc[:]]
-            ).reset_index(drop=True)
-            print(
-                "INFO: the age group of routine",
-                df_max.index[row],
-                " was corrected from ",
-                df_max["age_group"].iloc[row],
-                " to ",
-                age_group_routine,
-            )
 
     if not df_update_age_groups.empty:
         routines_db_handler.update_multiple_rows(
-            df_update_age_groups, ["id_routine"], ["age_group"]
+            df_update_age_groups[["id_routine", "age_group_corrected"]].rename(
+                columns={"age_group_corrected": "age_group"}
+            ),
+            ["id_routine"],
+            ["age_group"],
+        )
+
+
+def compile_age_groups(age_groups: dict) -> dict:
+    """
+    Compiles the age groups of every category into bin edges for np.searchsorted.
+    Between two edges set_age_group returns the same age group, so it is only
+    evaluated once per bin.
+    Keyword arguments:
+        age_groups -- dictionary with age groups for each category
+    return dictionary with (bin edges, age group of every bin) for each category
+    """
+    compiled_age_groups = {}
+    for category, list_age_group in age_groups.items():
+        edges = sorted(
+            {
+                int(age_group[1:]) if age_group[0] == "U" else int(age_group[:-1])
+                for age_group in list_age_group
+                if age_group[0] == "U" or age_group[-1] == "+"
+            }
+        )
+        if not edges:
+            continue
+        ages_in_bins = [edges[0] - 1] + edges
+        compiled_age_groups[category] = (
+            np.array(edges),
+            np.array(
+                [set_age_group(age, list_age_group) for age in ages_in_bins],
+                dtype=object,
+            ),
         )
+    return compiled_age_groups
+
+
+def assign_age_groups(
+    ages: pd.Series, categories: pd.Series, compiled_age_groups: dict
+) -> pd.Series:
+    """
+    Assigns the correct age group to many routines at once.
+    Keyword arguments:
+        ages -- age of the oldest rider of every routine
+        categories -- category of every routine
+        compiled_age_groups -- age groups compiled with compile_age_groups
+    return age group of every routine, None if it cannot be assigned
+    """
+    age_groups_assigned = pd.Series(None, index=ages.index, dtype=object)
+    for category, (edges, list_age_group) in compiled_age_groups.items():
+        is_category = ((categories == category) & ages.notna()).to_numpy()
+        bins = np.searchsorted(
+            edges, ages.to_numpy(dtype=float)[is_category], side="right"
+        )
+        age_groups_assigned[is_category] = list_age_group[bins]
+    return age_groups_assigned
 
 
 def set_age_group(age: int, age_groups: list) -> str:
@@ -354,7 +930,7 @@ def create_starting_order(
                 max_row = max_row + len(df1) + 1
 
 
-def calculate_age(date_of_birth: datetime, date: datetime = None) -> int:
+def calculate_age(date_of_birth: datetime.date, date: datetime.date = None) -> int:
     """
     Calculate the age at a given date or today if not specified.
     Keyword arguments:
@@ -363,7 +939,7 @@ def calculate_age(date_of_birth: datetime, date: datetime = None) -> int:
     return -- The age in years.
     """
     if date is None:
-        date = datetime.today()
+        date = datetime.date.today()
     age = date.year - date_of_birth.year
     if date_of_birth.month > date.month or (
         date_of_birth.month == date.month and date_of_birth.day > date.day
@@ -372,6 +948,25 @@ def calculate_age(date_of_birth: datetime, date: datetime = None) -> int:
     return int(age)
 
 
+def calculate_ages(dates_of_birth: pd.Series, date: datetime.date = None) -> pd.Series:
+    """
+    Calculate the ages of many riders at a given date or today if not specified.
+    Same result as calculate_age, computed on the whole column at once.
+    Keyword arguments:
+        dates_of_birth -- The dates of birth as dates or datetime64 values.
+        date -- The date on which to calculate the ages. Defaults to today if not provided.
+    return -- The ages in years, missing for missing dates of birth.
+    """
+    if date is None:
+        date = datetime.date.today()
+    dates_of_birth = pd.to_datetime(dates_of_birth)
+    month = dates_of_birth.dt.month
+    had_no_birthday = (month > date.month) | (
+        (month == date.month) & (dates_of_birth.dt.day > date.day)
+    )  # had not yet had their birthday that year
+    return (date.year - dates_of_birth.dt.year - had_no_birthday).astype("Int64")
+
+
 def replace_single_element(s):
     """
     Replaces a set with a single element with that element.
@@ -410,33 +1005,113 @@ def main():
     Creates Databases for riders, routines, the combination of riders and routines, and points from the registrationfiles.
     Creates starting order.
     """
-    registration_files = Path(get_path_project_root(), "data/registration_files").glob(
-        "*.xlsx"
+    parser = argparse.ArgumentParser(description="Create the competition database.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes parsing the registration files",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only import new or changed registration files and keep the points "
+        "of unchanged routines",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="parse every registration file instead of using the cache",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=list(REGISTRATION_PARSERS),
+        default=PARSER_PANDAS,
+        help="parser of the registration files; streaming reads the workbook "
+        "row by row and needs less memory",
+    )
+    args = parser.parse_args()
+
+    # sorted, so that ids do not depend on the file system or the number of jobs
+    registration_files = sorted(
+        Path(get_path_project_root(), "data/registration_files").glob("*.xlsx")
     )
     riders_db_handler = RidersDbHandler()
     routines_db_handler = RoutinesDbHandler()
     riders_routines_db_handler = RidersRoutinesDbHandler()
     points_db_handler = PointsDbHandler()
+    score_events_db_handler = ScoreEventsDbHandler()
+    registration_files_db_handler = RegistrationFilesDbHandler()
 
-    riders_db_handler.create_table()
-    routines_db_handler.create_table()
-    riders_routines_db_handler.create_table()
-    points_db_handler.create_table()
+    file_hashes = {
+        file.name: hash_registration_file(file) for file in registration_files
+    }
+    deleted_files = []
+    if args.incremental:
+        registration_files_db_handler.create_table()
+        imported_hashes = registration_files_db_handler.get_hashes()
+        registration_files = [
+            file
+            for file in registration_files
+            if imported_hashes.get(file.name) != file_hashes[file.name]
+        ]
+        deleted_files = sorted(set(imported_hashes) - set(file_hashes))
+        if not registration_files and not deleted_files:
+            print("✅ No new or changed registration files.")
+            return
 
-    for file in registration_files:
-        registration = read_registration_file(path=Path(get_path_project_root(), file))
-        fill_database_riders(registration)
-        fill_database_routines(registration)
-    create_database_points(routines_db_handler, points_db_handler)
-    split_individual_male_female()
+    cache_directory = None
+    if not args.no_cache:
+        cache_directory = Path(get_path_project_root(), DIRECTORY_REGISTRATION_CACHE)
+        if not is_registration_cache_available():
+            print("INFO: install pyarrow to cache parsed registration files")
+    registrations = read_registration_files(
+        registration_files, args.jobs, cache_directory, args.parser
+    )
+
+    # all tables share the connection of the competition database, so the whole
+    # import is committed at once or not at all
+    with riders_db_handler.transaction():
+        riders_db_handler.create_table()
+        routines_db_handler.create_table()
+        riders_routines_db_handler.create_table()
+        points_db_handler.create_table()
+        score_events_db_handler.create_table()
+        registration_files_db_handler.create_table()
+        if (
+            args.incremental
+            and not riders_db_handler.get_data(SQL_SELECT_RIDER_WITHOUT_FILE).empty
+        ):
+            print(
+                "❌ Riders were imported without their registration file, delete "
+                "data/competition.db and import all registration files again."
+            )
+            return
+
+        for file_name in deleted_files:
+            remove_registration_file(file_name)
+        registration_files_db_handler.delete_hashes(deleted_files)
+        for file, registration in zip(registration_files, registrations):
+            if args.incremental:
+                import_registration_incrementally(registration, file.name)
+            else:
+                fill_database_riders(registration)
+                fill_database_routines(registration)
+        create_database_points(routines_db_handler, points_db_handler)
+        split_individual_male_female()
 
-    check_age_groups(AGE_GROUPS)
+        check_age_groups(AGE_GROUPS)
+        registration_files_db_handler.save_hashes(
+            {file.name: file_hashes[file.name] for file in registration_files}
+        )
     create_starting_order(AGE_GROUPS)
 
     riders_routines_db_handler.disconnect()
     riders_db_handler.disconnect()
     routines_db_handler.disconnect()
     points_db_handler.disconnect()
+    score_events_db_handler.disconnect()
+    registration_files_db_handler.disconnect()
 
 
 if __name__ == "__main__":
@@ -1,22 +1,69 @@
 """Dash callback registration for the dashboard."""
 
+import json
+
 import bcrypt
 import dash
 import numpy as np
 import pandas as pd
 from dash import Input, Output, State
 
+from src.unicycle.dashboard.change_feed import CHANGE_FEED_ROUTE
 from src.unicycle.dashboard.components import build_dashboard_table
-from src.unicycle.constants import CATEGORY_COL, DARK_THEME, LIGHT_THEME, SCORE_COLS
-from src.unicycle.dashboard.scoring import clamp_cell, recalculate_all_results
+from src.unicycle.constants import (
+    CATEGORY_COL,
+    PARTICIPANT_PAGE_SIZE,
+    SCORE_COLS,
+    TOTAL_COL,
+)
+from src.unicycle.dashboard.scoring import (
+    clamp_score_columns,
+    recalculate_dirty_results,
+)
+
+
+def build_table_patch(rows: list[dict], df: pd.DataFrame):
+    """Build a partial table update containing only the cells that changed.
+
+    Falls back to the full table data when the number of rows changed.
+
+    list[dict] rows: Table rows as currently shown in the browser.
+    pd.DataFrame df: Validated and rescored table data in the same row order.
+    """
+    if len(rows) != len(df):
+        return df.replace({np.nan: None}).to_dict("records")
+
+    df_rows = pd.DataFrame(rows).reindex(columns=df.columns)
+    new_values = df.to_numpy(dtype=object)
+    shown_values = df_rows.to_numpy(dtype=object)
+    is_equal = (new_values == shown_values) | (
+        pd.isna(new_values) & pd.isna(shown_values)
+    )
 
+    changed_rows, changed_cols = np.nonzero(~is_equal)
+    if not len(changed_rows):
+        return dash.no_update
 
-def register_callbacks(app, data_service, stored_hash: bytes):
+    patch = dash.Patch()
+    for row, col in zip(changed_rows, changed_cols):
+        value = new_values[row, col]
+        patch[int(row)][df.columns[col]] = None if pd.isna(value) else value
+    return patch
+
+
+def register_callbacks(
+    app,
+    data_service,
+    stored_hash: bytes,
+    server_side_table: bool = False,
+):
     """Register all dashboard callbacks on the Dash application.
 
     dash.Dash app: Dash application instance that receives the callbacks.
     Any data_service: Service used to load and persist dashboard data.
     bytes stored_hash: Bcrypt password hash used to validate jury access.
+    bool server_side_table: Whether the participant table is filtered, sorted
+        and paged in the database instead of the browser.
     """
 
     @app.callback(
@@ -100,107 +147,200 @@ def register_callbacks(app, data_service, stored_hash: bytes):
         current_style["display"] = new_display
         return current_style, button_text
 
+    app.clientside_callback(
+        """
+        function(isDark, themes) {
+            const theme = isDark ? themes.dark : themes.light;
+            const style = document.documentElement.style;
+            Object.entries(theme).forEach(([key, value]) => {
+                style.setProperty(`--theme-${key}`, value);
+            });
+            return isDark ? "🌙" : "🌞";
+        }
+        """,
+        Output("theme-icon", "children"),
+        Input("theme-toggle", "value"),
+        State("themes", "data"),
+    )
+
+    # The live result feed is only open while the participant view is shown.
+    # If the server has no stream left it answers 204, which closes the
+    # EventSource, and the results are polled instead.
+    feed_url = json.dumps(app.get_relative_path(CHANGE_FEED_ROUTE))
+    app.clientside_callback(
+        """
+        function(juryAccess) {
+            if (juryAccess) {
+                if (window.resultFeed) {
+                    window.resultFeed.close();
+                    window.resultFeed = null;
+                }
+                return true;
+            }
+            if (!window.resultFeed && window.EventSource) {
+                const resultFeed = new EventSource(FEED_URL);
+                resultFeed.onmessage = (event) => {
+                    dash_clientside.set_props("result-updates", {
+                        data: JSON.parse(event.data),
+                    });
+                };
+                resultFeed.onerror = () => {
+                    if (resultFeed.readyState === EventSource.CLOSED) {
+                        if (window.resultFeed === resultFeed) {
+                            window.resultFeed = null;
+                        }
+                        dash_clientside.set_props("result-poll", {disabled: false});
+                    }
+                };
+                window.resultFeed = resultFeed;
+            }
+            return Boolean(window.resultFeed);
+        }
+        """.replace("FEED_URL", feed_url),
+        Output("result-poll", "disabled"),
+        Input("jury-access", "data"),
+    )
+
+    @app.callback(
+        Output("result-updates", "data"),
+        Input("result-poll", "n_intervals"),
+        State("jury-access", "data"),
+        prevent_initial_call=True,
+    )
+    def poll_results(n_intervals, jury_access):
+        """Load the current results for participant pages without a live feed.
+
+        int n_intervals: Number of elapsed poll intervals.
+        bool jury_access: Whether the jury view is shown.
+        """
+        del n_intervals
+        if jury_access:
+            raise dash.exceptions.PreventUpdate
+
+        df = data_service.load_participant_view_data()[["id_routine", TOTAL_COL]]
+        return df.astype(object).where(df.notna(), None).to_dict("records")
+
+    app.clientside_callback(
+        """
+        function(updates, rows) {
+            if (!updates || !rows) {
+                return dash_clientside.no_update;
+            }
+            const results = new Map(
+                updates.map((update) => [update.id_routine, update.Ergebnis])
+            );
+            let changed = false;
+            const patched = rows.map((row) => {
+                if (
+                    !results.has(row.id_routine) ||
+                    results.get(row.id_routine) === row.Ergebnis
+                ) {
+                    return row;
+                }
+                changed = true;
+                return {...row, Ergebnis: results.get(row.id_routine)};
+            });
+            return changed ? patched : dash_clientside.no_update;
+        }
+        """,
+        Output("data-table", "data", allow_duplicate=True),
+        Input("result-updates", "data"),
+        State("data-table", "data"),
+        prevent_initial_call=True,
+    )
+
     @app.callback(
-        Output("page-container", "style"),
         Output("table-container", "children"),
         Output("page-title", "children"),
         Output("view-switch-btn", "children"),
-        Output("view-switch-btn", "style"),
-        Output("theme-icon", "children"),
-        Output("password-modal-header", "style"),
-        Output("password-modal-body", "style"),
-        Output("password-modal-footer", "style"),
-        Output("password-input", "style"),
-        Input("theme-toggle", "value"),
         Input("jury-access", "data"),
         prevent_initial_call=False,
     )
-    def update_dashboard(is_dark, jury_access):
-        """Refresh themed page content for participant or jury mode.
+    def update_dashboard(jury_access):
+        """Refresh the page content for participant or jury mode.
+
+        The theme is applied in the browser through CSS variables, so
+        toggling it does not trigger this callback.
 
-        bool is_dark: Whether the dark theme toggle is enabled.
         bool jury_access: Whether the current session may view jury mode.
         """
-        theme = DARK_THEME if is_dark else LIGHT_THEME
-        password_input_style = {
-            "width": "100%",
-            "padding": "8px",
-            "color": theme["textColor"],
-            "backgroundColor": theme["cellBg"],
-            "border": f"1px solid {theme['border']}",
-        }
-        view_switch_style = {
-            "position": "absolute",
-            "top": "20px",
-            "right": "25px",
-            "backgroundColor": theme["headerBg"],
-            "color": theme["textColor"],
-            "border": f"1px solid {theme['border']}",
-            "borderRadius": "8px",
-            "padding": "10px 15px",
-            "cursor": "pointer",
-            "fontSize": "14px",
-        }
-        modal_header_style = {
-            "backgroundColor": theme["headerBg"],
-            "color": theme["textColor"],
-            "borderBottom": f"1px solid {theme['border']}",
-        }
-        modal_body_style = {
-            "backgroundColor": theme["cellBg"],
-            "color": theme["textColor"],
-        }
-        modal_footer_style = {
-            "backgroundColor": theme["cellBg"],
-            "borderTop": f"1px solid {theme['border']}",
-        }
-        icon = "🌙" if is_dark else "🌞"
         jury_mode = jury_access
 
-        page_style = {
-            "backgroundColor": theme["backgroundColor"],
-            "color": theme["textColor"],
-            "minHeight": "100vh",
-            "padding": "30px",
-            "fontFamily": "Arial, sans-serif",
-            "transition": "background-color 0.5s, color 0.5s",
-        }
-
+        page_count = None
         if jury_mode:
             df_view = data_service.load_jury_view_data()
             title = "⚖️ Jury Übersicht"
             button_text = "👥 Wechsel zu Teilnehmer Ansicht"
         else:
-            df_view = data_service.load_participant_view_data()
+            if server_side_table:
+                df_view, _, page_count = data_service.load_participant_view_page(
+                    None, None, 0, PARTICIPANT_PAGE_SIZE
+                )
+            else:
+                df_view = data_service.load_participant_view_data()
             title = "🏁 Teilnehmer Übersicht"
             button_text = "⚖️ Wechsel zu Jury Ansicht"
 
-        table = build_dashboard_table(df_view, theme, jury_mode=jury_mode)
-
-        return (
-            page_style,
-            table,
-            title,
-            button_text,
-            view_switch_style,
-            icon,
-            modal_header_style,
-            modal_body_style,
-            modal_footer_style,
-            password_input_style,
+        table = build_dashboard_table(
+            df_view, jury_mode=jury_mode, page_count=page_count
         )
 
+        return table, title, button_text
+
+    @app.callback(
+        Output("data-table", "data", allow_duplicate=True),
+        Output("data-table", "page_current"),
+        Output("data-table", "page_count"),
+        Input("data-table", "page_current"),
+        Input("data-table", "page_size"),
+        Input("data-table", "sort_by"),
+        Input("data-table", "filter_query"),
+        State("data-table", "page_action"),
+        prevent_initial_call=True,
+    )
+    def update_participant_page(
+        page_current, page_size, sort_by, filter_query, page_action
+    ):
+        """Load the requested page of a server-side filtered and sorted table.
+
+        The jury table keeps filtering, sorting and paging in the browser,
+        since scoring needs all routines of a group.
+
+        int page_current: Zero-based number of the requested page.
+        int page_size: Number of rows per page.
+        list[dict] sort_by: Sort state of the DataTable.
+        str filter_query: Filter query of the DataTable.
+        str page_action: Paging mode of the table, 'custom' for server-side tables.
+        """
+        if page_action != "custom":
+            raise dash.exceptions.PreventUpdate
+
+        df_page, page_current, page_count = data_service.load_participant_view_page(
+            filter_query,
+            sort_by,
+            page_current,
+            page_size or PARTICIPANT_PAGE_SIZE,
+        )
+        return df_page.to_dict("records"), page_current, page_count
+
     @app.callback(
         Output("data-table", "data", allow_duplicate=True),
         Input("data-table", "data_timestamp"),
         State("data-table", "data"),
+        State("data-table", "data_previous"),
+        State("session-id", "data"),
         prevent_initial_call=True,
     )
-    def update_points(timestamp, rows):
+    def update_points(timestamp, rows, rows_previous, session_id):
         """Validate edited score cells, recompute results, and persist them.
 
+        Only the (category, age_group) groups touched by the edit are rescored,
+        and only the changed cells are sent back to the browser.
+
         Any timestamp: Timestamp emitted when the table data changes.
         list[dict] rows: Current table rows from the editable dashboard table.
+        list[dict] rows_previous: Table rows before the latest edit.
+        str session_id: Id of the browser session, recorded with the score events.
         """
         if timestamp is None or not rows:
             raise dash.exceptions.PreventUpdate
@@ -214,17 +354,13 @@ def register_callbacks(app, data_service, stored_hash: bytes):
         if CATEGORY_COL not in df.columns:
             df[CATEGORY_COL] = None
 
-        for col in SCORE_COLS:
-            df[col] = df.apply(
-                lambda row: clamp_cell(row.get(col), row.get(CATEGORY_COL), col),
-                axis=1,
-            )
-
-        df = recalculate_all_results(df)
+        df = clamp_score_columns(df)
+        df_previous = pd.DataFrame(rows_previous) if rows_previous else None
+        df = recalculate_dirty_results(df, df_previous)
 
         try:
-            data_service.save_points(df)
+            data_service.save_points(df, previous=df_previous, session=session_id)
         except Exception as exc:
             print("Error saving points:", exc)
 
-        return df.to_dict("records")
+        return build_table_patch(rows, df)
@@ -0,0 +1,195 @@
+"""Server-Sent Events feed pushing new results to connected dashboards."""
+
+import json
+import queue
+import threading
+
+from flask import Response, stream_with_context
+
+from src.unicycle.constants import TOTAL_COL
+
+CHANGE_FEED_ROUTE = "/results/stream"
+SUBSCRIBER_QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+WATCH_INTERVAL_SECONDS = 2.0
+
+
+class ChangeFeed:
+    """
+    Broadcasts result deltas to all subscribed streams.
+    Every subscriber has its own bounded queue; a subscriber that does not keep
+    up loses its oldest pending messages instead of blocking the writer.
+    Every stream occupies a server thread, so the number of subscribers can be
+    limited to keep threads free for the dashboard callbacks.
+    """
+
+    def __init__(self, max_subscribers: int = None):
+        """
+        Keyword arguments:
+            max_subscribers -- maximum number of concurrent streams, None for no limit
+        """
+        self.max_subscribers = max_subscribers
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.watcher = None
+
+    def subscribe(self) -> queue.Queue | None:
+        """Register a new subscriber and return its message queue, None if full."""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self.lock:
+            if (
+                self.max_subscribers is not None
+                and len(self.subscribers) >= self.max_subscribers
+            ):
+                return None
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        """
+        Remove a subscriber, e.g. after its connection was closed.
+        Keyword arguments:
+            subscriber -- message queue returned by subscribe
+        """
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def publish(self, deltas: list[dict]):
+        """
+        Send one message with the given deltas to every subscriber.
+        Keyword arguments:
+            deltas -- changed results, e.g. {"id_routine": 3, "Ergebnis": 45.2}
+        """
+        if not deltas:
+            return
+        message = json.dumps(deltas, separators=(",", ":"))
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            while True:
+                try:
+                    subscriber.put_nowait(message)
+                    break
+                except queue.Full:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def watch(
+        self,
+        load_version,
+        load_results,
+        interval_seconds: float = WATCH_INTERVAL_SECONDS,
+    ):
+        """
+        Publish results written by other processes, e.g. other server workers.
+        A background thread checks the version of the results every interval
+        and, when it changed, publishes the results that differ from the ones
+        it loaded before. Results of this process may be published twice,
+        which the dashboard ignores since their values did not change.
+        Keyword arguments:
+            load_version -- callable returning a value that changes on every write
+            load_results -- callable returning {id_routine: result}
+            interval_seconds -- seconds between two checks of the version
+        """
+        if self.watcher is not None:
+            return
+        self.stopping.clear()
+        self.watcher = threading.Thread(
+            target=self.run_watcher,
+            args=(load_version, load_results, interval_seconds),
+            name="change-feed-watcher",
+            daemon=True,
+        )
+        self.watcher.start()
+
+    def run_watcher(self, load_version, load_results, interval_seconds: float):
+        """
+        Loop of the watcher thread, see watch.
+        Keyword arguments:
+            load_version -- callable returning a value that changes on every write
+            load_results -- callable returning {id_routine: result}
+            interval_seconds -- seconds between two checks of the version
+        """
+        version, results = None, None
+        while not self.stopping.wait(interval_seconds):
+            try:
+                new_version = load_version()
+                if results is not None and new_version == version:
+                    continue
+                new_results = load_results()
+            except Exception as e:
+                print(f"❌ Error watching results: {e}")
+                continue
+            if results is not None:
+                self.publish(
+                    [
+                        {"id_routine": id_routine, TOTAL_COL: result}
+                        for id_routine, result in new_results.items()
+                        if id_routine not in results or results[id_routine] != result
+                    ]
+                )
+            version, results = new_version, new_results
+
+    def stop_watching(self, timeout: float = None):
+        """
+        Stop the watcher thread.
+        Keyword arguments:
+            timeout -- maximum time to wait for the thread in seconds
+        """
+        if self.watcher is None:
+            return
+        self.stopping.set()
+        self.watcher.join(timeout)
+        self.watcher = None
+
+    def stream(
+        self, subscriber: queue.Queue, heartbeat_seconds: float = HEARTBEAT_SECONDS
+    ):
+        """
+        Yield Server-Sent Events for a subscriber until the client disconnects.
+        A comment is sent when nothing happened for a while, which keeps proxies
+        from closing the connection and lets the server notice closed clients.
+        Keyword arguments:
+            subscriber -- message queue returned by subscribe
+            heartbeat_seconds -- seconds without message before a heartbeat is sent
+        """
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    message = subscriber.get(timeout=heartbeat_seconds)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+
+def register_change_feed(server, change_feed: ChangeFeed):
+    """
+    Add the Server-Sent Events endpoint of the change feed to the Flask server.
+    When all streams are taken the endpoint answers 204 No Content, which stops
+    the EventSource of the browser; the dashboard then polls the results instead.
+    Keyword arguments:
+        server -- Flask server of the Dash application
+        change_feed -- ChangeFeed whose messages are streamed
+    """
+
+    @server.route(CHANGE_FEED_ROUTE)
+    def stream_results():
+        """Stream result deltas as Server-Sent Events."""
+        subscriber = change_feed.subscribe()
+        if subscriber is None:
+            return Response(status=204)
+        response = Response(
+            stream_with_context(change_feed.stream(subscriber)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        # Also frees the stream if the client is gone before streaming started
+        response.call_on_close(lambda: change_feed.unsubscribe(subscriber))
+        return response
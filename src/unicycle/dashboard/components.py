@@ -1,5 +1,7 @@
 """UI components and layout builders for the dashboard."""
 
+import uuid
+
 import dash_bootstrap_components as dbc
 import dash_daq as daq
 import pandas as pd
@@ -12,22 +14,33 @@ from src.unicycle.constants import (
     CATEGORY_ORDER,
     COLUMN_LABELS,
     D_COLS,
+    DARK_THEME,
     JUDGE_LEGEND,
+    LIGHT_THEME,
     P_COLS,
+    PARTICIPANT_PAGE_SIZE,
+    RESULT_POLL_INTERVAL_MS,
     SCORE_COLS,
     T_COLS,
+    THEME_VARS,
 )
 
 
 def build_layout():
-    """Construct and return the root Dash layout container."""
+    """Construct and return the root Dash layout container.
+
+    Called on every page load, so every browser session gets its own session id.
+    """
     return html.Div(
         id="page-container",
         style={
+            "backgroundColor": THEME_VARS["backgroundColor"],
+            "color": THEME_VARS["textColor"],
             "minHeight": "100vh",
             "padding": "30px",
             "fontFamily": "Arial, sans-serif",
             "position": "relative",
+            "transition": "background-color 0.5s, color 0.5s",
         },
         children=[
             html.Div(
@@ -61,9 +74,9 @@ def build_layout():
                     "position": "absolute",
                     "top": "20px",
                     "right": "25px",
-                    "backgroundColor": "#444",
-                    "color": "white",
-                    "border": "none",
+                    "backgroundColor": THEME_VARS["headerBg"],
+                    "color": THEME_VARS["textColor"],
+                    "border": f"1px solid {THEME_VARS['border']}",
                     "borderRadius": "8px",
                     "padding": "10px 15px",
                     "cursor": "pointer",
@@ -71,9 +84,22 @@ def build_layout():
                 },
             ),
             dcc.Store(id="jury-access", data=False),
+            dcc.Store(id="session-id", data=str(uuid.uuid4())),
+            dcc.Interval(
+                id="result-poll", interval=RESULT_POLL_INTERVAL_MS, disabled=True
+            ),
+            dcc.Store(id="themes", data={"dark": DARK_THEME, "light": LIGHT_THEME}),
             dbc.Modal(
                 [
-                    dbc.ModalHeader("🔒 Jury-Zugang", id="password-modal-header"),
+                    dbc.ModalHeader(
+                        "🔒 Jury-Zugang",
+                        id="password-modal-header",
+                        style={
+                            "backgroundColor": THEME_VARS["headerBg"],
+                            "color": THEME_VARS["textColor"],
+                            "borderBottom": f"1px solid {THEME_VARS['border']}",
+                        },
+                    ),
                     dbc.ModalBody(
                         [
                             html.Div(
@@ -88,8 +114,9 @@ def build_layout():
                                 style={
                                     "width": "100%",
                                     "padding": "8px",
-                                    "color": "black",
-                                    "backgroundColor": "white",
+                                    "color": THEME_VARS["textColor"],
+                                    "backgroundColor": THEME_VARS["cellBg"],
+                                    "border": f"1px solid {THEME_VARS['border']}",
                                 },
                             ),
                             html.Div(
@@ -98,6 +125,10 @@ def build_layout():
                             ),
                         ],
                         id="password-modal-body",
+                        style={
+                            "backgroundColor": THEME_VARS["cellBg"],
+                            "color": THEME_VARS["textColor"],
+                        },
                     ),
                     dbc.ModalFooter(
                         [
@@ -115,6 +146,10 @@ def build_layout():
                             ),
                         ],
                         id="password-modal-footer",
+                        style={
+                            "backgroundColor": THEME_VARS["cellBg"],
+                            "borderTop": f"1px solid {THEME_VARS['border']}",
+                        },
                     ),
                 ],
                 id="password-modal",
@@ -146,15 +181,12 @@ def build_judge_column(col: str, jury_mode: bool) -> dict:
     }
 
 
-def build_judge_legend_collapsible(theme: dict):
-    """Build the collapsible judge legend container for jury mode.
-
-    dict theme: Theme colors and styling values used to render the legend.
-    """
+def build_judge_legend_collapsible():
+    """Build the collapsible judge legend container for jury mode."""
     button_style = {
-        "backgroundColor": theme["headerBg"],
-        "color": theme["textColor"],
-        "border": f"1px solid {theme['border']}",
+        "backgroundColor": THEME_VARS["headerBg"],
+        "color": THEME_VARS["textColor"],
+        "border": f"1px solid {THEME_VARS['border']}",
         "borderRadius": "8px",
         "padding": "10px 15px",
         "cursor": "pointer",
@@ -163,8 +195,8 @@ def build_judge_legend_collapsible(theme: dict):
     }
 
     container_style = {
-        "backgroundColor": theme["cellBg"],
-        "border": f"1px solid {theme['border']}",
+        "backgroundColor": THEME_VARS["cellBg"],
+        "border": f"1px solid {THEME_VARS['border']}",
         "borderRadius": "8px",
         "padding": "15px",
         "marginBottom": "20px",
@@ -234,18 +266,22 @@ def build_judge_legend_collapsible(theme: dict):
 
 def build_datatable(
     df: pd.DataFrame,
-    theme: dict,
     editable: bool = False,
     jury_mode: bool = False,
+    page_count: int | None = None,
 ):
     """Create the dashboard DataTable or an empty-state placeholder.
 
+    Colors refer to the theme CSS variables, so the table does not depend on the theme.
+
     pd.DataFrame df: Source dataframe rendered into the table.
-    dict theme: Theme colors and styling values used for the table.
     bool editable: Whether the rendered table cells should be editable.
     bool jury_mode: Whether the table should use jury-specific headers and options.
+    int page_count: Number of pages if df is the first page of a table that is
+        filtered, sorted and paged on the server; None to do this in the browser.
     """
-    if df.empty:
+    server_side = page_count is not None
+    if df.empty and not server_side:
         return html.Div(
             "❌ Keine Daten geladen.",
             style={
@@ -259,7 +295,7 @@ def build_datatable(
     base_cols = BASE_COLS_JURY if jury_mode else BASE_COLS_PARTICIPANT
     ordered_cols = base_cols + T_COLS + P_COLS + D_COLS + ["Ergebnis"]
 
-    if "category" in df.columns:
+    if "category" in df.columns and not server_side:
         df = df.copy()
         df["category_label"] = (
             df["category"].map(CATEGORY_LABELS).fillna(df["category"])
@@ -298,6 +334,19 @@ def build_datatable(
                 }
             )
 
+    if server_side:
+        paging = {
+            "filter_action": "custom",
+            "sort_action": "custom",
+            "sort_mode": "multi",
+            "page_action": "custom",
+            "page_current": 0,
+            "page_size": PARTICIPANT_PAGE_SIZE,
+            "page_count": page_count,
+        }
+    else:
+        paging = {"filter_action": "native", "sort_action": "native"}
+
     table = dash_table.DataTable(
         id="data-table",
         data=df.to_dict("records"),
@@ -305,22 +354,21 @@ def build_datatable(
         merge_duplicate_headers=jury_mode,
         dropdown=dropdown,
         editable=editable,
-        filter_action="native",
-        sort_action="native",
+        **paging,
         style_table={"overflowX": "auto"},
         style_header={
-            "backgroundColor": theme["headerBg"],
-            "color": theme["headerColor"],
+            "backgroundColor": THEME_VARS["headerBg"],
+            "color": THEME_VARS["headerColor"],
             "fontWeight": "bold",
             "textAlign": "center",
-            "border": f"1px solid {theme['border']}",
+            "border": f"1px solid {THEME_VARS['border']}",
         },
         style_cell={
-            "backgroundColor": theme["cellBg"],
-            "color": theme["textColor"],
+            "backgroundColor": THEME_VARS["cellBg"],
+            "color": THEME_VARS["textColor"],
             "textAlign": "left",
             "padding": "8px",
-            "border": f"1px solid {theme['border']}",
+            "border": f"1px solid {THEME_VARS['border']}",
         },
         style_cell_conditional=[
             {"if": {"column_id": "age_group"}, "textAlign": "center"},
@@ -333,7 +381,7 @@ def build_datatable(
             },
         ],
         style_data_conditional=[
-            {"if": {"row_index": "odd"}, "backgroundColor": theme["oddRowBg"]},
+            {"if": {"row_index": "odd"}, "backgroundColor": THEME_VARS["oddRowBg"]},
             *[
                 {
                     "if": {
@@ -375,20 +423,31 @@ def build_datatable(
     return table
 
 
-def build_dashboard_table(df: pd.DataFrame, theme: dict, jury_mode: bool):
+def build_dashboard_table(
+    df: pd.DataFrame,
+    jury_mode: bool,
+    page_count: int | None = None,
+):
     """Build the full dashboard table area for the active view mode.
 
     pd.DataFrame df: Source dataframe rendered in the dashboard table.
-    dict theme: Theme colors and styling values used for rendering.
     bool jury_mode: Whether to render the jury view instead of participant view.
+    int page_count: Number of pages of a server-side paged participant table.
+
+    The participant table comes with a store receiving live result updates.
     """
     if jury_mode:
-        legend = build_judge_legend_collapsible(theme)
+        legend = build_judge_legend_collapsible()
         return html.Div(
             [
                 legend,
-                build_datatable(df, theme, editable=True, jury_mode=True),
+                build_datatable(df, editable=True, jury_mode=True),
             ]
         )
 
-    return build_datatable(df, theme, editable=False, jury_mode=False)
+    return html.Div(
+        [
+            dcc.Store(id="result-updates"),
+            build_datatable(df, editable=False, jury_mode=False, page_count=page_count),
+        ]
+    )
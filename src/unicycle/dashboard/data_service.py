@@ -1,35 +1,244 @@
 """Data loading and persistence helpers for the dashboard."""
 
+import datetime
+import math
+import threading
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
-from src.unicycle.constants import COLS_TO_SAVE, SCORE_COLS
+from src.unicycle.constants import (
+    CATEGORY_LABELS,
+    CATEGORY_ORDER,
+    COLS_TO_SAVE,
+    SCORE_COLS,
+    TOTAL_COL,
+)
 from src.unicycle.dashboard.scoring import (
+    GROUP_CATEGORIES,
     apply_locked_d_judges,
     recalculate_all_results,
 )
+from src.unicycle.dashboard.change_feed import WATCH_INTERVAL_SECONDS, ChangeFeed
+from src.unicycle.dashboard.score_storage import (
+    STORAGE_LONG,
+    STORAGE_WIDE,
+    pivot_scores,
+    switch_score_storage,
+    unpivot_score_cells,
+)
+from src.unicycle.dashboard.table_query import filter_query_to_sql, sort_by_to_sql
+from src.unicycle.dashboard.write_behind import WriteBehindQueue, coalesce_changes
+from src.unicycle.db_handler.meta_db_handler import MetaDbHandler
 from src.unicycle.db_handler.points_db_handler import PointsDbHandler
 from src.unicycle.db_handler.riders_db_handler import RidersDbHandler
 from src.unicycle.db_handler.routines_db_handler import RoutinesDbHandler
 from src.unicycle.db_handler.riders_routines_db_handler import RidersRoutinesDbHandler
+from src.unicycle.db_handler.score_events_db_handler import ScoreEventsDbHandler
+from src.unicycle.db_handler.scores_db_handler import ScoresDbHandler
+from src.unicycle.db_handler.table_versions_db_handler import TableVersionsDbHandler
+from src.unicycle.migrate_database import migrate_legacy_databases
+from src.unicycle.replay_score_events import seed_score_events
 
+META_DB_HANDLER = MetaDbHandler()
 POINTS_DB_HANDLER = PointsDbHandler()
 RIDERS_DB_HANDLER = RidersDbHandler()
 ROUTINES_DB_HANDLER = RoutinesDbHandler()
 RIDERSROUTINES_DB_HANDLER = RidersRoutinesDbHandler()
+SCORE_EVENTS_DB_HANDLER = ScoreEventsDbHandler()
+SCORES_DB_HANDLER = ScoresDbHandler()
+TABLE_VERSIONS_DB_HANDLER = TableVersionsDbHandler()
+
+JURY_VIEW_TABLES = ["routines", "points"]
+JURY_VIEW_TABLES_LONG = ["routines", "points", "scores"]
+PARTICIPANT_VIEW_TABLES = ["riders", "routines", "riders_routines", "points"]
+VIEW_FLUSH_TIMEOUT = 1.0
+
+SQL_JURY_VIEW = f"""
+    SELECT routines.*, {", ".join(f"points.{col}" for col in COLS_TO_SAVE[1:])}
+    FROM routines
+    LEFT JOIN points ON points.id_routine = routines.id_routine
+    """
+
+SQL_JURY_VIEW_LONG = f"""
+    SELECT routines.*, points.{TOTAL_COL}
+    FROM routines
+    LEFT JOIN points ON points.id_routine = routines.id_routine
+    """
+
+GROUP_CATEGORY_PLACEHOLDERS = ", ".join(["?"] * len(GROUP_CATEGORIES))
+
+# GROUP_CONCAT has no ORDER BY before SQLite 3.44, so the names are
+# aggregated from a subquery ordered by rider id
+SQL_PARTICIPANT_VIEW = f"""
+    SELECT
+        routine_riders.id_routine,
+        routines.routine_name,
+        routines.category,
+        routines.age_group,
+        CASE
+            WHEN routines.category IN ({GROUP_CATEGORY_PLACEHOLDERS})
+                THEN routine_riders.rider_count || ' Personen'
+            ELSE COALESCE(routine_riders.rider_names, '')
+        END AS names,
+        points.{TOTAL_COL}
+    FROM (
+        SELECT
+            id_routine,
+            COUNT(name) AS rider_count,
+            GROUP_CONCAT(name, ', ') AS rider_names
+        FROM (
+            SELECT riders_routines.id_routine, riders.name
+            FROM riders_routines
+            LEFT JOIN riders ON riders.id_rider = riders_routines.id_rider
+            ORDER BY riders_routines.id_routine, riders_routines.id_rider
+        )
+        GROUP BY id_routine
+    ) AS routine_riders
+    LEFT JOIN routines ON routines.id_routine = routine_riders.id_routine
+    LEFT JOIN points ON points.id_routine = routine_riders.id_routine
+    """
+
+CATEGORY_LABEL_CASE = "CASE category {} ELSE category END".format(
+    " ".join(["WHEN ? THEN ?"] * len(CATEGORY_LABELS))
+)
+CATEGORY_RANK_CASE = "CASE category {} ELSE ? END".format(
+    " ".join(["WHEN ? THEN ?"] * len(CATEGORY_LABELS))
+)
+CATEGORY_LABEL_PARAMS = [
+    param for category, label in CATEGORY_LABELS.items() for param in (category, label)
+]
+CATEGORY_RANK_PARAMS = [
+    param
+    for category, label in CATEGORY_LABELS.items()
+    for param in (category, CATEGORY_ORDER.index(label))
+] + [len(CATEGORY_ORDER)]
+
+SQL_PARTICIPANT_PAGE = f"""
+    WITH participant_view AS ({SQL_PARTICIPANT_VIEW}),
+    labelled_participant_view AS (
+        SELECT
+            participant_view.*,
+            {CATEGORY_LABEL_CASE} AS category_label,
+            {CATEGORY_RANK_CASE} AS category_rank
+        FROM participant_view
+    )
+    """
+
+PARTICIPANT_FILTER_COLUMNS = {
+    "routine_name": "routine_name",
+    "names": "names",
+    "age_group": "age_group",
+    "category_label": "category_label",
+    TOTAL_COL: TOTAL_COL,
+}
+PARTICIPANT_SORT_COLUMNS = {
+    **PARTICIPANT_FILTER_COLUMNS,
+    "category_label": "category_rank",
+}
+PARTICIPANT_DEFAULT_ORDER = [
+    "category_rank",
+    "age_group IS NULL",
+    "age_group",
+    "id_routine",
+]
 
 
 class DataService:
     """Encapsulates all database access used by the dashboard."""
 
-    def __init__(self, project_root: Path):
+    def __init__(
+        self,
+        project_root: Path,
+        write_behind: bool = False,
+        score_storage: str = STORAGE_WIDE,
+    ):
         """Initialize the service with the project root directory.
 
         Path project_root: Root directory that contains the dashboard data folder.
+        bool write_behind: Whether score changes are written by a background
+            writer thread instead of inside the edit callback.
+        str score_storage: 'wide' to keep scores in the columns of points,
+            'long' to keep one row per routine, judge and criterion in scores.
         """
         self.project_root = Path(project_root)
+        self.data_version = 0
+        self.view_cache = {}
+        self.cache_lock = threading.Lock()
+        self.change_feed = ChangeFeed()
+        migrate_legacy_databases()
+        POINTS_DB_HANDLER.repair_table()
+        seed_score_events(POINTS_DB_HANDLER, SCORE_EVENTS_DB_HANDLER)
+        self.score_storage = score_storage
+        switch_score_storage(
+            score_storage, POINTS_DB_HANDLER, SCORES_DB_HANDLER, META_DB_HANDLER
+        )
+        TABLE_VERSIONS_DB_HANDLER.create_table()
+        self.score_writer = (
+            WriteBehindQueue(self.write_queued_point_changes) if write_behind else None
+        )
+
+    def flush_points(self, timeout: float | None = None) -> bool:
+        """Wait until all queued score changes are written.
+
+        float timeout: Maximum time to wait in seconds, None waits forever.
+        """
+        if self.score_writer is None:
+            return True
+        return self.score_writer.flush(timeout)
+
+    def points_write_status(self) -> dict:
+        """Return the number of pending, durable, failed and rejected score changes."""
+        if self.score_writer is None:
+            return {
+                "pending": 0,
+                "durable": 0,
+                "failed": 0,
+                "rejected": 0,
+                "last_error": None,
+            }
+        return self.score_writer.status()
+
+    def invalidate_views(self) -> None:
+        """Bump the data version so that cached views are loaded again."""
+        with self.cache_lock:
+            self.data_version += 1
+            self.view_cache.clear()
+
+    def load_cached_view(self, name: str, loader, tables: list[str]) -> pd.DataFrame:
+        """Return a view from the cache if the data did not change since it was loaded.
+
+        Besides the writes of this process, writes of other processes are
+        detected by the versions of the tables the view is built from, so a
+        cache hit costs one query of the small table_versions table.
+        A view loaded while a write happened is returned but not cached.
+        Callers get a copy, so they cannot modify the cached frame.
+
+        str name: Name of the view used as cache key.
+        Callable loader: Function loading the view from the database.
+        list[str] tables: Tables the view is built from.
+        """
+        with self.cache_lock:
+            data_version = self.data_version
+            cached = self.view_cache.get(name)
+        table_versions = TABLE_VERSIONS_DB_HANDLER.get_versions(tables)
+        if (
+            cached is not None
+            and cached[0] == (data_version, table_versions)
+            and None not in table_versions
+        ):
+            return cached[1].copy()
+
+        # Waits only briefly, so a writer retrying a failed batch does not block
+        # the views; they show what the database has until the write succeeds
+        self.flush_points(VIEW_FLUSH_TIMEOUT)
+        cache_key = (data_version, TABLE_VERSIONS_DB_HANDLER.get_versions(tables))
+        df = loader()
+        with self.cache_lock:
+            if self.data_version == data_version:
+                self.view_cache[name] = (cache_key, df)
+        return df.copy()
 
     def db_path(self, name: str) -> Path:
         """Build the path to a database file inside the project data directory.
@@ -46,7 +255,7 @@ class DataService:
         """Load only the routine columns needed for participant view."""
         return ROUTINES_DB_HANDLER.get_data(
             sql_query=(
-                "SELECT id_routine, routine_name, category, age_group " "FROM routines"
+                "SELECT id_routine, routine_name, category, age_group FROM routines"
             )
         )
 
@@ -64,25 +273,52 @@ class DataService:
         """Load all persisted scoring data."""
         return POINTS_DB_HANDLER.get_data()
 
-    def load_jury_view_data(self) -> pd.DataFrame:
-        """Load and prepare the dataframe used in jury mode."""
-        df_routines = self.load_routines()
-        df_points = self.load_points()
+    def load_results(self) -> dict:
+        """Load the result of every routine, None for routines without result."""
+        df = POINTS_DB_HANDLER.get_data(f"SELECT id_routine, {TOTAL_COL} FROM points")
+        if df.empty:
+            return {}
+        results = df[TOTAL_COL].astype(object).where(df[TOTAL_COL].notna(), None)
+        return dict(zip(df["id_routine"].tolist(), results.tolist()))
+
+    def watch_results(self, interval_seconds: float = WATCH_INTERVAL_SECONDS) -> None:
+        """Publish results written by other processes to the change feed.
 
-        if df_points.empty:
-            df_points = pd.DataFrame(columns=COLS_TO_SAVE)
+        The version of points in table_versions tells when to load the results.
 
-        df = df_routines.merge(
-            df_points,
-            on="id_routine",
-            how="left",
-            suffixes=("", "_points"),
+        float interval_seconds: Seconds between two checks of the version.
+        """
+        self.change_feed.watch(
+            lambda: TABLE_VERSIONS_DB_HANDLER.get_versions(["points"]),
+            self.load_results,
+            interval_seconds,
+        )
+
+    def load_jury_view_data(self) -> pd.DataFrame:
+        """Load the dataframe used in jury mode, cached until the next write."""
+        tables = (
+            JURY_VIEW_TABLES_LONG
+            if self.score_storage == STORAGE_LONG
+            else JURY_VIEW_TABLES
+        )
+        return self.load_cached_view("jury", self.query_jury_view_data, tables)
+
+    def load_participant_view_data(self) -> pd.DataFrame:
+        """Load the dataframe used in participant mode, cached until the next write."""
+        return self.load_cached_view(
+            "participant", self.query_participant_view_data, PARTICIPANT_VIEW_TABLES
         )
 
-        for col in ["routine_name", "age_group", "category"]:
-            points_col = f"{col}_points"
-            if points_col in df.columns:
-                df = df.drop(columns=points_col)
+    def query_jury_view_data(self) -> pd.DataFrame:
+        """Load and prepare the dataframe used in jury mode."""
+        if self.score_storage == STORAGE_LONG:
+            df = ROUTINES_DB_HANDLER.get_data(sql_query=SQL_JURY_VIEW_LONG).merge(
+                pivot_scores(SCORES_DB_HANDLER.get_data()),
+                on="id_routine",
+                how="left",
+            )
+        else:
+            df = ROUTINES_DB_HANDLER.get_data(sql_query=SQL_JURY_VIEW)
 
         df = apply_locked_d_judges(df)
 
@@ -92,59 +328,247 @@ class DataService:
 
         return recalculate_all_results(df)
 
-    def load_participant_view_data(self) -> pd.DataFrame:
+    def query_participant_view_data(self) -> pd.DataFrame:
         """Load and prepare the dataframe used in participant mode."""
-        df_riders = self.load_riders()
-        df_routines = self.load_routines_for_participant_view()
-        df_riders2routines = self.load_riders_routines()
-
-        df_display = df_riders2routines.merge(
-            df_riders,
-            on="id_rider",
-            how="left",
-        ).merge(
-            df_routines,
-            on="id_routine",
-            how="left",
+        return ROUTINES_DB_HANDLER.get_data(
+            sql_query=SQL_PARTICIPANT_VIEW,
+            par=sorted(GROUP_CATEGORIES),
+        )
+
+    def load_participant_view_page(
+        self,
+        filter_query: str | None,
+        sort_by: list[dict] | None,
+        page_current: int,
+        page_size: int,
+    ) -> tuple[pd.DataFrame, int, int]:
+        """Load one filtered and sorted page of the participant view.
+
+        Filtering, sorting and paging run in SQL, so only the rows of the
+        requested page are loaded. Returns the page, the page number actually
+        loaded and the number of pages.
+
+        str filter_query: Filter query of the DataTable.
+        list[dict] sort_by: Sort state of the DataTable.
+        int page_current: Zero-based number of the requested page.
+        int page_size: Number of rows per page.
+        """
+        where, where_params = filter_query_to_sql(
+            filter_query, PARTICIPANT_FILTER_COLUMNS
+        )
+        order = sort_by_to_sql(
+            sort_by, PARTICIPANT_SORT_COLUMNS, PARTICIPANT_DEFAULT_ORDER
+        )
+        params = (
+            sorted(GROUP_CATEGORIES)
+            + CATEGORY_LABEL_PARAMS
+            + CATEGORY_RANK_PARAMS
+            + where_params
         )
 
-        df_display = df_display.groupby("id_routine", as_index=False).agg(
-            routine_name=("routine_name", "first"),
-            category=("category", "first"),
-            age_group=("age_group", "first"),
-            names=("name", lambda x: ", ".join(x.dropna().astype(str))),
+        df_count = ROUTINES_DB_HANDLER.get_data(
+            sql_query=f"""{SQL_PARTICIPANT_PAGE}
+                SELECT COUNT(*) AS row_count FROM labelled_participant_view {where}
+                """,
+            par=params,
         )
+        row_count = 0 if df_count.empty else int(df_count["row_count"].iloc[0])
+        page_count = max(1, math.ceil(row_count / page_size))
+        page_current = min(max(page_current or 0, 0), page_count - 1)
 
-        df_display = df_display.drop(columns="id_routine")
-        df_display["names"] = df_display.apply(self._format_names, axis=1)
-        return df_display
+        df = ROUTINES_DB_HANDLER.get_data(
+            sql_query=f"""{SQL_PARTICIPANT_PAGE}
+                SELECT * FROM labelled_participant_view {where} {order}
+                LIMIT ? OFFSET ?
+                """,
+            par=params + [page_size, page_current * page_size],
+        )
+        df = df.drop(columns="category_rank", errors="ignore")
+        return df, page_current, page_count
 
     def save_points(
         self,
         df: pd.DataFrame,
         columns: list[str] | None = None,
+        previous: pd.DataFrame | None = None,
+        session: str | None = None,
     ) -> None:
-        """Persist scoring data to the configured points table.
+        """Persist changed scoring data to the configured points table.
+
+        Rows are upserted by id_routine. If the previous state is given, only the
+        cells that differ from it are written. Changed score cells are also
+        appended to the score event log. With write-behind enabled, the
+        changes are queued and written by the background writer.
 
         pd.DataFrame df: Score dataframe to write into the points database.
         list[str] columns: Optional list of allowed columns to persist.
             If provided, only these columns are written.
+        pd.DataFrame previous: Optional score dataframe before the latest edit.
+        str session: Optional id of the browser session the edit came from.
         """
-        POINTS_DB_HANDLER.update_data(
-            df,
-            columns=columns or COLS_TO_SAVE,
-        )
+        columns = [
+            col
+            for col in (columns or COLS_TO_SAVE)
+            if col in df.columns and col != "id_routine"
+        ]
+        cells = collect_changed_cells(df, find_changed_cells(df, previous, columns))
+        if not cells:
+            return
+
+        change_set = {
+            "cells": cells,
+            "timestamp": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "session": session,
+        }
+        if self.score_writer is None:
+            self.write_point_changes([change_set])
+        else:
+            self.score_writer.enqueue(change_set)
+            self.invalidate_views()
 
-    @staticmethod
-    def _format_names(row: pd.Series) -> str:
-        """Format participant names for participant view display.
+    def write_point_changes(self, change_sets: list[dict]) -> bool:
+        """Write the change sets of one or more edits in one transaction.
 
-        pd.Series row: Aggregated participant row containing category and names.
+        Cached views are invalidated after the write, and changed results are
+        published to the change feed once they are committed.
+
+        list[dict] change_sets: Edits with changed cells, timestamp and session.
         """
-        if row["category"] in ["small_group", "large_group"] and isinstance(
-            row["names"],
-            str,
-        ):
-            count = len([name for name in row["names"].split(",") if name.strip()])
-            return f"{count} Personen"
-        return row["names"]
+        statements, result_deltas = self.build_point_change_statements(change_sets)
+        is_written = POINTS_DB_HANDLER.execute_statements(statements)
+        self.invalidate_views()
+        if is_written:
+            self.change_feed.publish(result_deltas)
+        return is_written
+
+    def write_queued_point_changes(self, change_sets: list[dict]) -> bool:
+        """Write change sets of the background writer in one transaction.
+
+        Unlike write_point_changes, errors are raised, so the writer can tell a
+        busy database from a write that can never succeed.
+
+        list[dict] change_sets: Edits with changed cells, timestamp and session.
+        """
+        statements, result_deltas = self.build_point_change_statements(change_sets)
+        with POINTS_DB_HANDLER.transaction():
+            POINTS_DB_HANDLER.execute_statements(statements)
+        self.invalidate_views()
+        self.change_feed.publish(result_deltas)
+        return True
+
+    def build_point_change_statements(self, change_sets: list[dict]) -> tuple:
+        """Build the statements writing the change sets of one or more edits.
+
+        Every changed score cell is appended to the event log. The points table
+        gets the latest value of each cell; rows with the same set of changed
+        columns share one batched statement. With long-format storage, score
+        cells go to the scores table instead and points only keeps the results.
+        Returns the statements and the changed results for the change feed.
+
+        list[dict] change_sets: Edits with changed cells, timestamp and session.
+        """
+        events = [
+            (id_routine, col, value, change_set["timestamp"], change_set["session"])
+            for change_set in change_sets
+            for id_routine, row_cells in change_set["cells"].items()
+            for col, value in row_cells.items()
+            if col in SCORE_COLS
+        ]
+
+        cells = coalesce_changes([change_set["cells"] for change_set in change_sets])
+        result_deltas = [
+            {"id_routine": id_routine, TOTAL_COL: row_cells[TOTAL_COL]}
+            for id_routine, row_cells in cells.items()
+            if TOTAL_COL in row_cells
+        ]
+        statements = []
+        if self.score_storage == STORAGE_LONG:
+            statements += SCORES_DB_HANDLER.build_write_statements(
+                *unpivot_score_cells(cells)
+            )
+            cells = {
+                id_routine: {
+                    col: value
+                    for col, value in row_cells.items()
+                    if col not in SCORE_COLS
+                }
+                for id_routine, row_cells in cells.items()
+            }
+
+        rows_by_columns = {}
+        for id_routine, row_cells in cells.items():
+            if row_cells:
+                rows_by_columns.setdefault(tuple(row_cells), []).append(
+                    {"id_routine": id_routine, **row_cells}
+                )
+
+        statements += [
+            POINTS_DB_HANDLER.build_upsert_statement(
+                pd.DataFrame(rows), ["id_routine"], list(update_columns)
+            )
+            for update_columns, rows in rows_by_columns.items()
+        ]
+        if events:
+            statements.insert(0, SCORE_EVENTS_DB_HANDLER.build_append_statement(events))
+        return statements, result_deltas
+
+
+def find_changed_cells(
+    df: pd.DataFrame,
+    df_previous: pd.DataFrame | None,
+    columns: list[str],
+) -> pd.DataFrame:
+    """Mark the cells of df that differ from the previous state of the same routine.
+
+    Routines missing from the previous state are marked as changed in every column.
+
+    pd.DataFrame df: Current score dataframe containing id_routine.
+    pd.DataFrame df_previous: Score dataframe before the latest edit, or None.
+    list[str] columns: Columns which should be compared.
+    """
+    if df_previous is None or "id_routine" not in df_previous.columns:
+        return pd.DataFrame(True, index=df.index, columns=columns)
+
+    previous = (
+        df_previous.drop_duplicates("id_routine")
+        .set_index("id_routine")
+        .reindex(index=df["id_routine"], columns=columns)
+    )
+    current_values = df[columns].to_numpy(dtype=object)
+    previous_values = previous.to_numpy(dtype=object)
+
+    is_equal = (current_values == previous_values) | (
+        pd.isna(current_values) & pd.isna(previous_values)
+    )
+    is_new = ~df["id_routine"].isin(df_previous["id_routine"]).to_numpy()
+    return pd.DataFrame(
+        ~is_equal | is_new[:, None],
+        index=df.index,
+        columns=columns,
+    )
+
+
+def collect_changed_cells(df: pd.DataFrame, changed: pd.DataFrame) -> dict:
+    """Collect the values of changed cells per routine.
+
+    Missing values are returned as None.
+
+    pd.DataFrame df: Current score dataframe containing id_routine.
+    pd.DataFrame changed: Boolean frame from find_changed_cells.
+    """
+    changed = changed[changed.any(axis=1)]
+    values = df.loc[changed.index, list(changed.columns)].astype(object)
+    values = values.where(values.notna(), None)
+
+    return {
+        id_routine: {
+            col: value
+            for col, value, is_changed in zip(changed.columns, row_values, row_changed)
+            if is_changed
+        }
+        for id_routine, row_values, row_changed in zip(
+            df.loc[changed.index, "id_routine"].tolist(),
+            values.to_numpy(),
+            changed.to_numpy(),
+        )
+    }
@@ -0,0 +1,149 @@
+"""Adapters between the wide score columns and the long-format table scores."""
+
+import numpy as np
+import pandas as pd
+
+from src.unicycle.constants import EMPTY_SCORE, SCORE_COLS
+
+STORAGE_WIDE = "wide"
+STORAGE_LONG = "long"
+LONG_COLS = ["id_routine", "judge", "criterion", "value"]
+META_KEY_SCORE_STORAGE = "score_storage"
+
+
+def split_score_column(col: str) -> tuple[str, str]:
+    """Split a score column name into judge and criterion.
+
+    str col: Score column name in the form '<judge>_<criterion>'.
+    """
+    judge, criterion = col.split("_", 1)
+    return judge, criterion
+
+
+def is_empty_score(value) -> bool:
+    """Check whether a score cell is empty and therefore has no row in scores.
+
+    Any value: Score cell value, the locked-judge marker counts as empty.
+    """
+    return value is None or value == EMPTY_SCORE or pd.isna(value)
+
+
+def unpivot_score_cells(cells: dict) -> tuple[list, list]:
+    """Turn changed score cells into row writes and row deletions of scores.
+
+    Columns which are not score columns are ignored.
+
+    dict cells: Mapping of id_routine to the changed {column: value} cells.
+    """
+    upserts, deletes = [], []
+    for id_routine, row_cells in cells.items():
+        for col, value in row_cells.items():
+            if col not in SCORE_COLS:
+                continue
+            key = (id_routine, *split_score_column(col))
+            if is_empty_score(value):
+                deletes.append(key)
+            else:
+                upserts.append((*key, float(value)))
+    return upserts, deletes
+
+
+def unpivot_scores(df_wide: pd.DataFrame) -> pd.DataFrame:
+    """Convert wide score rows into the rows of scores, skipping empty cells.
+
+    pd.DataFrame df_wide: Dataframe with id_routine and score columns.
+    """
+    score_cols = [col for col in SCORE_COLS if col in df_wide.columns]
+    df_long = df_wide.melt(
+        id_vars="id_routine",
+        value_vars=score_cols,
+        var_name="score_column",
+        value_name="value",
+    )
+    df_long["value"] = pd.to_numeric(
+        df_long["value"].replace(EMPTY_SCORE, np.nan), errors="coerce"
+    )
+    df_long = df_long.dropna(subset="value")
+    if df_long.empty:
+        return pd.DataFrame(columns=LONG_COLS)
+    df_long[["judge", "criterion"]] = df_long["score_column"].str.split(
+        "_", n=1, expand=True
+    )
+    return df_long[LONG_COLS].reset_index(drop=True)
+
+
+def pivot_scores(df_long: pd.DataFrame) -> pd.DataFrame:
+    """Convert rows of scores into one row per routine with all score columns.
+
+    pd.DataFrame df_long: Rows of scores with id_routine, judge, criterion and value.
+    """
+    df_long = df_long.assign(score_column=df_long["judge"] + "_" + df_long["criterion"])
+    df_wide = df_long.pivot(index="id_routine", columns="score_column", values="value")
+    return df_wide.reindex(columns=SCORE_COLS).astype(float).reset_index()
+
+
+def find_score_storage(meta_db_handler, scores_db_handler) -> str:
+    """Return the storage the scores of the database are currently kept in.
+
+    Databases from before the storage was recorded are in long-format storage
+    if scores has rows, otherwise in wide storage.
+
+    DbHandler meta_db_handler: Handler of the meta table.
+    DbHandler scores_db_handler: Handler of the long-format scores table.
+    """
+    score_storage = meta_db_handler.get_value(META_KEY_SCORE_STORAGE)
+    if score_storage is not None:
+        return score_storage
+    if scores_db_handler.get_data("SELECT 1 FROM scores LIMIT 1").empty:
+        return STORAGE_WIDE
+    return STORAGE_LONG
+
+
+def switch_score_storage(
+    score_storage: str, points_db_handler, scores_db_handler, meta_db_handler
+) -> bool:
+    """Move the scores into the given storage if they are kept in the other one.
+
+    The scores are copied in one transaction together with recording the new
+    storage, so every score entered in one storage is found after switching
+    back and forth. The copy kept in the previous storage is replaced on the
+    next switch, so stale scores are never moved across.
+
+    str score_storage: 'wide' or 'long', the storage the scores should be in.
+    DbHandler points_db_handler: Handler of the wide points table.
+    DbHandler scores_db_handler: Handler of the long-format scores table.
+    DbHandler meta_db_handler: Handler of the meta table recording the storage.
+    """
+    scores_db_handler.create_table()
+    meta_db_handler.create_table()
+    current_storage = find_score_storage(meta_db_handler, scores_db_handler)
+    statements = []
+    if current_storage == STORAGE_WIDE and score_storage == STORAGE_LONG:
+        df_points = points_db_handler.get_data()
+        statements.append(("DELETE FROM scores", [()]))
+        if not df_points.empty:
+            rows = list(
+                unpivot_scores(df_points)
+                .astype(object)
+                .itertuples(index=False, name=None)
+            )
+            statements += scores_db_handler.build_write_statements(rows, [])
+    elif current_storage == STORAGE_LONG and score_storage == STORAGE_WIDE:
+        statements.append(
+            (
+                f"UPDATE {points_db_handler.table_name} "
+                f"SET {', '.join(f'{col} = NULL' for col in SCORE_COLS)}",
+                [()],
+            )
+        )
+        df_scores = scores_db_handler.get_data()
+        if not df_scores.empty:
+            statements.append(
+                points_db_handler.build_upsert_statement(
+                    pivot_scores(df_scores), ["id_routine"], SCORE_COLS
+                )
+            )
+    statements.append(
+        meta_db_handler.build_set_statement(META_KEY_SCORE_STORAGE, score_storage)
+    )
+    return scores_db_handler.execute_statements(statements)
@@ -0,0 +1,170 @@
+"""Array-backed scoring engine for the dashboard.
+
+The 36 score columns are held as one routines x judges x sub-criteria tensor.
+Judges are ordered T1-T4, P1-P4, D1-D4 and sub-criteria follow the order of
+T_SUBS, P_SUBS and D_SUBS, which is the column order of SCORE_COLS.
+"""
+
+import numpy as np
+
+from src.unicycle.constants import (
+    CATEGORY_JUDGES,
+    D_SUBS,
+    ROUTINE_RESULT_WEIGHTS,
+    SCORE_COLS,
+)
+
+JUDGES = [col.split("_", 1)[0] for col in SCORE_COLS[:: len(D_SUBS)]]
+JUDGE_DOMAINS = ["T", "P", "D"]
+CATEGORIES = list(CATEGORY_JUDGES)
+DOMAIN_WEIGHTS = np.array([ROUTINE_RESULT_WEIGHTS[domain] for domain in JUDGE_DOMAINS])
+
+
+def domain_slice(judge_domain: str) -> slice:
+    """Return the slice of the judge axis that belongs to one judge domain.
+
+    str judge_domain: Judge prefix such as 'T', 'P', or 'D'.
+    """
+    indices = [i for i, judge in enumerate(JUDGES) if judge[0] == judge_domain]
+    return slice(indices[0], indices[-1] + 1)
+
+
+DOMAIN_SLICES = {
+    judge_domain: domain_slice(judge_domain) for judge_domain in JUDGE_DOMAINS
+}
+
+S_INDEX = D_SUBS.index("S")
+B_INDEX = D_SUBS.index("B")
+N_INDEX = D_SUBS.index("N")
+
+
+def build_judge_mask_table() -> np.ndarray:
+    """Build the judge availability table from CATEGORY_JUDGES.
+
+    Row i belongs to CATEGORIES[i]; the additional last row is used for
+    unknown categories and has no judges.
+    """
+    mask_table = np.zeros((len(CATEGORIES) + 1, len(JUDGES)), dtype=bool)
+    for row, category in enumerate(CATEGORIES):
+        for judges in CATEGORY_JUDGES[category].values():
+            for judge in judges:
+                mask_table[row, JUDGES.index(judge)] = True
+    return mask_table
+
+
+JUDGE_MASK_TABLE = build_judge_mask_table()
+
+
+def build_judge_mask(category_codes: np.ndarray) -> np.ndarray:
+    """Look up which judges score each routine.
+
+    np.ndarray category_codes: Index into CATEGORIES per routine, -1 if unknown.
+    """
+    return JUDGE_MASK_TABLE[category_codes]
+
+
+def group_sum(values: np.ndarray, group_codes: np.ndarray, n_groups: int):
+    """Sum the rows of values per group, treating NaN as zero.
+
+    np.ndarray values: Array of shape routines x columns.
+    np.ndarray group_codes: Group number of every routine.
+    int n_groups: Number of distinct groups.
+    """
+    totals = np.zeros((n_groups, values.shape[1]))
+    np.add.at(totals, group_codes, np.where(np.isnan(values), 0.0, values))
+    return totals
+
+
+def normalize_within_groups(
+    values: np.ndarray, group_codes: np.ndarray, n_groups: int
+) -> np.ndarray:
+    """Divide every value by its column total within the routine's group.
+
+    If the valid values of a group add up to zero, they share the group equally.
+
+    np.ndarray values: Array of shape routines x columns.
+    np.ndarray group_codes: Group number of every routine.
+    int n_groups: Number of distinct groups.
+    """
+    valid = ~np.isnan(values)
+    totals = group_sum(values, group_codes, n_groups)[group_codes]
+    counts = group_sum(valid.astype(float), group_codes, n_groups)[group_codes]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        equal_shares = np.where(valid, 1.0 / counts, np.nan)
+        return np.where(totals != 0, values / totals, equal_shares)
+
+
+def nanmean_rows(values: np.ndarray) -> np.ndarray:
+    """Average every row over its valid values, NaN if there are none.
+
+    np.ndarray values: Array of shape routines x columns.
+    """
+    valid = ~np.isnan(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(valid, values, 0.0).sum(axis=1) / valid.sum(axis=1)
+
+
+def score_tensor(
+    scores: np.ndarray,
+    judge_mask: np.ndarray,
+    group_codes: np.ndarray,
+    is_group_category: np.ndarray,
+) -> np.ndarray:
+    """Calculate T, P, D and total results for all routines.
+
+    Returns an array of shape routines x 4 with the columns T, P, D, Ergebnis.
+
+    np.ndarray scores: Score tensor of shape routines x judges x sub-criteria.
+    np.ndarray judge_mask: Judge availability of shape routines x judges.
+    np.ndarray group_codes: Number of the (category, age_group) group per routine.
+    np.ndarray is_group_category: Whether a routine is a small or large group.
+    """
+    n_groups = int(group_codes.max()) + 1 if len(group_codes) else 0
+    d_slice = DOMAIN_SLICES["D"]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        per_judge = np.nansum(scores, axis=2)
+        per_judge[np.isnan(scores).all(axis=2)] = np.nan
+
+        d_scores = scores[:, d_slice, :]
+        n_values = d_scores[:, :, N_INDEX]
+        divisor = np.where(
+            is_group_category[:, None],
+            np.sqrt(np.where(n_values > 0, n_values, np.nan)),
+            1.0,
+        )
+        per_judge[:, d_slice] = 10 - (
+            (d_scores[:, :, S_INDEX] * 0.5 + d_scores[:, :, B_INDEX]) / divisor
+        )
+
+    per_judge[~judge_mask] = np.nan
+
+    group_min = np.full((n_groups, d_slice.stop - d_slice.start), np.inf)
+    np.fmin.at(group_min, group_codes, per_judge[:, d_slice])
+    shift = np.where(np.isfinite(group_min), np.minimum(group_min, 0), 0.0)
+    per_judge[:, d_slice] -= shift[group_codes]
+
+    percentage_per_routine_per_judge = normalize_within_groups(
+        per_judge, group_codes, n_groups
+    )
+
+    domain_scores = np.column_stack(
+        [
+            nanmean_rows(percentage_per_routine_per_judge[:, DOMAIN_SLICES[domain]])
+            for domain in JUDGE_DOMAINS
+        ]
+    )
+    domain_results = normalize_within_groups(domain_scores, group_codes, n_groups)
+
+    has_result = ~np.isnan(domain_results)
+    available_weight = (has_result * DOMAIN_WEIGHTS).sum(axis=1)
+    weighted_sum = (np.where(has_result, domain_results, 0.0) * DOMAIN_WEIGHTS).sum(
+        axis=1
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = np.where(
+            available_weight > 0, (weighted_sum / available_weight) * 100, np.nan
+        )
+
+    return np.column_stack([domain_results, total])
@@ -14,11 +14,17 @@ from src.unicycle.constants import (
     MAX_D_SCORE,
     MAX_TP_SCORE,
     MIN_SCORE,
-    ROUTINE_RESULT_WEIGHTS,
     SCORE_COLS,
 )
+from src.unicycle.dashboard.score_tensor import (
+    CATEGORIES,
+    JUDGES,
+    build_judge_mask,
+    score_tensor,
+)
 
 RESULT_COLS = ["T", "P", "D", "Ergebnis"]
+GROUP_COLS = [CATEGORY_COL, "age_group"]
 GROUP_CATEGORIES = {
     "small_group",
     "large_group",
@@ -35,11 +41,13 @@ def apply_locked_d_judges(df: pd.DataFrame) -> pd.DataFrame:
     if CATEGORY_COL not in df.columns:
         return df
 
-    for category in LOCKED_D_CATEGORIES:
-        mask = df[CATEGORY_COL] == category
+    is_locked = df[CATEGORY_COL].isin(LOCKED_D_CATEGORIES)
+    for judge in LOCKED_D_JUDGE_COLS:
         for sub in D_SUBS:
-            df.loc[mask, f"D3_{sub}"] = EMPTY_SCORE
-            df.loc[mask, f"D4_{sub}"] = EMPTY_SCORE
+            col = f"{judge}_{sub}"
+            if col not in df.columns:
+                df[col] = np.nan
+            df[col] = df[col].astype(object).mask(is_locked, EMPTY_SCORE)
 
     return df
 
@@ -54,6 +62,8 @@ def coerce_score_columns(df: pd.DataFrame) -> pd.DataFrame:
     for col in SCORE_COLS:
         if col not in df.columns:
             df[col] = np.nan
+        if pd.api.types.is_float_dtype(df[col]):
+            continue
         df[col] = pd.to_numeric(
             df[col].replace(EMPTY_SCORE, np.nan),
             errors="coerce",
@@ -62,6 +72,40 @@ def coerce_score_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def build_score_tensor(df_scores: pd.DataFrame) -> np.ndarray:
+    """Convert the coerced score columns into a routines x judges x sub-criteria array.
+
+    pd.DataFrame df_scores: Coerced score dataframe containing all SCORE_COLS.
+    """
+    return (
+        df_scores[SCORE_COLS]
+        .to_numpy(dtype=float, na_value=np.nan)
+        .reshape(len(df_scores), len(JUDGES), -1)
+    )
+
+
+def score_results(df_scores: pd.DataFrame) -> pd.DataFrame:
+    """Calculate unrounded T, P, D and total results for all routines at once.
+
+    pd.DataFrame df_scores: Coerced score dataframe containing category and age group.
+    """
+    categories = df_scores[CATEGORY_COL].where(df_scores["age_group"].notna())
+    category_codes = pd.Categorical(categories, categories=CATEGORIES).codes
+    age_group_codes, _ = pd.factorize(df_scores["age_group"], use_na_sentinel=False)
+    _, group_codes = np.unique(
+        category_codes.astype(np.int64) * (len(df_scores) + 1) + age_group_codes,
+        return_inverse=True,
+    )
+
+    results = score_tensor(
+        build_score_tensor(df_scores),
+        build_judge_mask(category_codes),
+        group_codes.reshape(-1),
+        categories.isin(GROUP_CATEGORIES).to_numpy(),
+    )
+    return pd.DataFrame(results, index=df_scores.index, columns=RESULT_COLS)
+
+
 def calculate_result(
     df_points: pd.DataFrame,
     category: str,
@@ -73,173 +117,123 @@ def calculate_result(
     str category: Routine category whose results should be calculated.
     str age_group: Age group whose results should be calculated.
     """
-    category_judges = CATEGORY_JUDGES.get(category)
-    if not category_judges:
+    if not CATEGORY_JUDGES.get(category):
         return pd.DataFrame(columns=RESULT_COLS)
 
     group_df = df_points[
         (df_points[CATEGORY_COL] == category) & (df_points["age_group"] == age_group)
-    ].copy()
+    ]
 
     if group_df.empty:
         return pd.DataFrame(columns=RESULT_COLS)
 
-    group_df = apply_locked_d_judges(group_df)
     group_df = coerce_score_columns(group_df)
-    group_df = group_df.set_index("id_routine", drop=True)
-
-    per_judge = pd.DataFrame(index=group_df.index)
-
-    for judge_domain in ["T", "P"]:
-        for judge in category_judges[judge_domain]:
-            judge_columns = [
-                col for col in group_df.columns if col.startswith(f"{judge}_")
-            ]
-            if judge_columns:
-                per_judge[judge] = group_df[judge_columns].sum(
-                    axis=1,
-                    min_count=1,
-                )
-
-    for judge in category_judges["D"]:
-        s_col = f"{judge}_S"
-        b_col = f"{judge}_B"
-        n_col = f"{judge}_N"
-
-        if s_col not in group_df.columns or b_col not in group_df.columns:
-            continue
-
-        s_values = group_df[s_col]
-        b_values = group_df[b_col]
-        has_d_input = s_values.notna() | b_values.notna()
-
-        divisor = 1.0
-        if category in GROUP_CATEGORIES:
-            if n_col in group_df.columns:
-                n_values = group_df[n_col]
-                divisor = np.sqrt(n_values.where(n_values > 0))
-            else:
-                divisor = np.nan
-
-        raw_d_score = 10 - ((s_values * 0.5 + b_values) / divisor)
-        raw_d_score = raw_d_score.where(has_d_input, np.nan)
+    return score_results(group_df).set_index(group_df["id_routine"])
 
-        valid_raw = raw_d_score.dropna()
-        if not valid_raw.empty:
-            shift = min(valid_raw.min(), 0)
-            adjusted_d_score = raw_d_score - shift
-        else:
-            adjusted_d_score = raw_d_score
 
-        per_judge[judge] = adjusted_d_score
+def recalculate_all_results(df: pd.DataFrame) -> pd.DataFrame:
+    """Recompute result columns for all category and age-group combinations.
 
-    percentage_per_routine_per_judge = per_judge.copy()
+    The scores are coerced once and every group is normalized in the same pass.
+    Locked D judges need no masking here, since their categories never use them.
 
-    for judge in percentage_per_routine_per_judge.columns:
-        judge_scores = percentage_per_routine_per_judge[judge]
-        valid_mask = judge_scores.notna()
+    pd.DataFrame df: Score dataframe whose result columns should be refreshed.
+    """
+    df_scores = coerce_score_columns(df)
+    results = score_results(df_scores).astype(float).round(2)
 
-        if not valid_mask.any():
-            percentage_per_routine_per_judge[judge] = np.nan
-            continue
+    df = df.drop(columns=RESULT_COLS, errors="ignore")
+    for col in RESULT_COLS:
+        df[col] = results[col]
 
-        judge_total = judge_scores[valid_mask].sum()
+    return df
 
-        if judge_total == 0:
-            percentage_per_routine_per_judge[judge] = np.nan
-            percentage_per_routine_per_judge.loc[valid_mask, judge] = (
-                1.0 / valid_mask.sum()
-            )
-        else:
-            percentage_per_routine_per_judge[judge] = judge_scores / judge_total
 
-    result = pd.DataFrame(index=group_df.index, columns=RESULT_COLS)
+def group_keys(df: pd.DataFrame) -> pd.Series:
+    """Build hashable (category, age_group) keys for every routine row.
 
-    for judge_domain in ["T", "P", "D"]:
-        relevant_judges = [
-            judge
-            for judge in category_judges[judge_domain]
-            if judge in percentage_per_routine_per_judge.columns
-        ]
+    pd.DataFrame df: Score dataframe containing the category and age-group columns.
+    """
+    groups = df[GROUP_COLS].astype(object)
+    groups = groups.where(groups.notna(), None)
+    return pd.Series(
+        list(zip(groups[CATEGORY_COL], groups["age_group"])),
+        index=df.index,
+        dtype=object,
+    )
 
-        if not relevant_judges:
-            result[judge_domain] = np.nan
-            continue
 
-        domain_scores = percentage_per_routine_per_judge[relevant_judges].mean(
-            axis=1,
-            skipna=True,
-        )
-        valid_mask = domain_scores.notna()
+def find_dirty_groups(df: pd.DataFrame, df_previous: pd.DataFrame | None):
+    """Find the (category, age_group) groups affected by changes since the previous state.
 
-        if not valid_mask.any():
-            result[judge_domain] = np.nan
-            continue
+    Returns None if the previous state cannot be matched row by row, in which
+    case every group has to be treated as dirty.
 
-        domain_total = domain_scores[valid_mask].sum()
+    pd.DataFrame df: Current score dataframe.
+    pd.DataFrame df_previous: Score dataframe before the latest edit.
+    """
+    if df_previous is None or df_previous.empty:
+        return None
 
-        if domain_total == 0:
-            result[judge_domain] = np.nan
-            result.loc[valid_mask, judge_domain] = 1.0 / valid_mask.sum()
-        else:
-            result[judge_domain] = domain_scores / domain_total
+    required_cols = ["id_routine"] + GROUP_COLS
+    if any(
+        col not in frame.columns for frame in (df, df_previous) for col in required_cols
+    ):
+        return None
+
+    current = df.set_index("id_routine")
+    previous = df_previous.set_index("id_routine")
+    if (
+        not current.index.is_unique
+        or not previous.index.is_unique
+        or set(current.index) != set(previous.index)
+    ):
+        return None
+    previous = previous.reindex(current.index)
 
-    available_weight = (
-        result["T"].notna().astype(float) * ROUTINE_RESULT_WEIGHTS["T"]
-        + result["P"].notna().astype(float) * ROUTINE_RESULT_WEIGHTS["P"]
-        + result["D"].notna().astype(float) * ROUTINE_RESULT_WEIGHTS["D"]
-    )
+    current_scores = coerce_score_columns(current)[SCORE_COLS]
+    previous_scores = coerce_score_columns(previous)[SCORE_COLS]
+    scores_changed = ~(
+        (current_scores == previous_scores)
+        | (current_scores.isna() & previous_scores.isna())
+    ).all(axis=1)
 
-    weighted_sum = (
-        result["T"].fillna(0) * ROUTINE_RESULT_WEIGHTS["T"]
-        + result["P"].fillna(0) * ROUTINE_RESULT_WEIGHTS["P"]
-        + result["D"].fillna(0) * ROUTINE_RESULT_WEIGHTS["D"]
-    )
+    current_groups = group_keys(current)
+    previous_groups = group_keys(previous)
+    changed = scores_changed | (current_groups != previous_groups)
 
-    result["Ergebnis"] = np.where(
-        available_weight > 0,
-        (weighted_sum / available_weight) * 100,
-        np.nan,
-    )
+    return set(current_groups[changed]) | set(previous_groups[changed])
 
-    has_any_result = result[["T", "P", "D"]].notna().any(axis=1)
-    result["Ergebnis"] = result["Ergebnis"].where(has_any_result, np.nan)
 
-    return result
+def recalculate_dirty_results(
+    df: pd.DataFrame,
+    df_previous: pd.DataFrame | None,
+) -> pd.DataFrame:
+    """Recompute result columns only for groups changed since the previous state.
 
-
-def recalculate_all_results(df: pd.DataFrame) -> pd.DataFrame:
-    """Recompute result columns for all category and age-group combinations.
+    Results are normalized within one category and age group, so rows of
+    untouched groups keep their current result values.
 
     pd.DataFrame df: Score dataframe whose result columns should be refreshed.
+    pd.DataFrame df_previous: Score dataframe before the latest edit.
     """
-    df = df.copy()
+    dirty_groups = find_dirty_groups(df, df_previous)
+    if dirty_groups is None:
+        return recalculate_all_results(df)
 
+    df = df.copy()
     for col in RESULT_COLS:
         if col not in df.columns:
             df[col] = np.nan
         df[col] = pd.to_numeric(df[col], errors="coerce").astype(float)
 
-    result_frames = []
-
-    for (category, age_group), _ in df.groupby(
-        [CATEGORY_COL, "age_group"],
-        dropna=False,
-    ):
-        result_df = calculate_result(df, category, age_group)
-        if result_df.empty:
-            continue
-
-        result_df = result_df.astype(float).round(2).reset_index()
-        result_frames.append(result_df)
+    if not dirty_groups:
+        return df
 
-    if result_frames:
-        all_results = pd.concat(result_frames, ignore_index=True)
-        df = df.drop(columns=RESULT_COLS, errors="ignore").merge(
-            all_results,
-            on="id_routine",
-            how="left",
-        )
+    dirty_mask = group_keys(df).isin(dirty_groups)
+    dirty_results = recalculate_all_results(df[dirty_mask])
+    for col in RESULT_COLS:
+        df.loc[dirty_mask, col] = dirty_results[col].to_numpy()
 
     return df
 
@@ -308,3 +302,65 @@ def clamp_cell(value, category: str, colname: str):
         return validate_d_score(parsed_value)
 
     return validate_tp_score(parsed_value)
+
+
+def parse_score_block(values: np.ndarray) -> np.ndarray:
+    """Parse a 2D block of raw score cells into floats, NaN where parsing fails.
+
+    The object-to-float cast uses the same conversion as float(); only blocks
+    containing unparsable text fall back to parsing those columns cell by cell.
+
+    np.ndarray values: Object array of raw score cells with EMPTY_SCORE removed.
+    """
+    try:
+        return values.astype(float)
+    except (TypeError, ValueError):
+        parsed = np.empty(values.shape, dtype=float)
+        for col in range(values.shape[1]):
+            try:
+                parsed[:, col] = values[:, col].astype(float)
+            except (TypeError, ValueError):
+                parsed[:, col] = [parse_score_value(value) for value in values[:, col]]
+        return parsed
+
+
+def clamp_score_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize and validate all score cells of the table at once.
+
+    Produces the same cell values as applying clamp_cell to every score cell.
+
+    pd.DataFrame df: Score dataframe containing all SCORE_COLS and the category.
+    """
+    df = df.copy()
+
+    values = df[SCORE_COLS].to_numpy(dtype=object)
+    is_empty = values == EMPTY_SCORE
+    parsed = parse_score_block(np.where(is_empty, np.nan, values))
+
+    is_d_col = np.isin(SCORE_COLS, D_COLS)
+    is_locked_col = np.isin(
+        [col.split("_", 1)[0] for col in SCORE_COLS], LOCKED_D_JUDGE_COLS
+    )
+    is_locked_row = df[CATEGORY_COL].isin(LOCKED_D_CATEGORIES).to_numpy()
+
+    with np.errstate(invalid="ignore"):
+        valid_d = (
+            np.isfinite(parsed) & (parsed == np.floor(parsed)) & (parsed <= MAX_D_SCORE)
+        )
+        valid_tp = (parsed >= MIN_SCORE) & (parsed <= MAX_TP_SCORE)
+
+    # D scores have no lower bound, so convert to Python int cell by cell
+    # instead of casting to int64, which overflows for large negative values
+    d_scores = np.full(parsed.shape, np.nan, dtype=object)
+    d_scores[valid_d] = [int(value) for value in parsed[valid_d]]
+    clamped = np.where(
+        is_d_col,
+        np.where(valid_d, d_scores, np.nan),
+        np.where(valid_tp, parsed.astype(object), np.nan),
+    )
+    clamped[is_empty | (is_locked_row[:, None] & is_locked_col)] = EMPTY_SCORE
+
+    for position, col in enumerate(SCORE_COLS):
+        df[col] = pd.Series(clamped[:, position].tolist(), index=df.index)
+
+    return df
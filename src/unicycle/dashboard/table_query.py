@@ -0,0 +1,157 @@
+"""Translation of DataTable filter and sort state into parameterized SQL."""
+
+import re
+
+FILTER_PART_PATTERN = re.compile(
+    r"^\s*\{(?P<column>[^}]+)\}\s+(?P<operator>is\s+\w+|\S+)\s*(?P<value>.*?)\s*$"
+)
+
+COMPARISON_OPERATORS = {
+    "=": "=",
+    "eq": "=",
+    "!=": "!=",
+    "ne": "!=",
+    "<": "<",
+    "lt": "<",
+    "<=": "<=",
+    "le": "<=",
+    ">": ">",
+    "gt": ">",
+    ">=": ">=",
+    "ge": ">=",
+}
+
+CASE_OPERATORS = set(COMPARISON_OPERATORS) | {"contains"}
+
+VALUE_QUOTES = "\"'`"
+
+
+def parse_filter_value(value: str) -> str:
+    """Remove the quotes DataTable puts around filter values containing spaces.
+
+    str value: Raw value part of one filter expression.
+    """
+    if len(value) >= 2 and value[0] in VALUE_QUOTES and value[-1] == value[0]:
+        return value[1:-1].replace(f"\\{value[0]}", value[0])
+    return value
+
+
+def split_filter_query(filter_query: str) -> list[str]:
+    """Split a DataTable filter_query into its expressions joined by '&&'.
+
+    '&&' inside a quoted value does not separate expressions.
+
+    str filter_query: Filter query of the DataTable.
+    """
+    filter_parts, current = [], []
+    quote, escaped = None, False
+    position = 0
+    while position < len(filter_query):
+        char = filter_query[position]
+        if quote is not None:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in VALUE_QUOTES:
+            quote = char
+        elif filter_query.startswith("&&", position):
+            filter_parts.append("".join(current))
+            current = []
+            position += 2
+            continue
+        current.append(char)
+        position += 1
+    filter_parts.append("".join(current))
+    return filter_parts
+
+
+def split_filter_part(filter_part: str):
+    """Split one filter expression into column, operator and value.
+
+    Returns None if the expression does not have the form '{column} operator value'.
+
+    str filter_part: One expression of a DataTable filter_query.
+    """
+    match = FILTER_PART_PATTERN.match(filter_part)
+    if match is None:
+        return None
+    operator = " ".join(match["operator"].split())
+    return match["column"], operator, parse_filter_value(match["value"])
+
+
+def build_filter_condition(expression: str, operator: str, value: str):
+    """Build the SQL condition and parameters for one filter expression.
+
+    Returns None for operators which are not supported.
+
+    str expression: Whitelisted SQL expression of the filtered column.
+    str operator: DataTable filter operator, optionally prefixed with i or s.
+    str value: Unquoted filter value.
+    """
+    if operator == "is blank":
+        return f"({expression} IS NULL OR {expression} = '')", []
+    if operator == "is nil":
+        return f"{expression} IS NULL", []
+    if operator == "datestartswith":
+        return f"substr({expression}, 1, length(?)) = ?", [value, value]
+
+    case_insensitive = False
+    if operator[0] in "is" and operator[1:] in CASE_OPERATORS:
+        case_insensitive = operator[0] == "i"
+        operator = operator[1:]
+    if case_insensitive:
+        expression, placeholder = f"lower({expression})", "lower(?)"
+    else:
+        placeholder = "?"
+
+    if operator == "contains":
+        return f"instr({expression}, {placeholder}) > 0", [value]
+    if operator in COMPARISON_OPERATORS:
+        return f"{expression} {COMPARISON_OPERATORS[operator]} {placeholder}", [value]
+    return None
+
+
+def filter_query_to_sql(filter_query: str | None, columns: dict):
+    """Translate a DataTable filter_query into a SQL WHERE clause.
+
+    Expressions on columns outside the whitelist or with unsupported operators
+    are ignored. Returns the clause (empty if nothing is filtered) and its parameters.
+
+    str filter_query: Filter query of the DataTable, expressions joined by '&&'.
+    dict columns: Mapping of filterable column ids to their SQL expressions.
+    """
+    conditions, params = [], []
+    for filter_part in split_filter_query(filter_query or ""):
+        parts = split_filter_part(filter_part)
+        if parts is None or parts[0] not in columns:
+            continue
+        column, operator, value = parts
+        condition = build_filter_condition(columns[column], operator, value)
+        if condition is None:
+            continue
+        conditions.append(condition[0])
+        params.extend(condition[1])
+
+    if not conditions:
+        return "", []
+    return "WHERE " + " AND ".join(conditions), params
+
+
+def sort_by_to_sql(sort_by: list[dict] | None, columns: dict, default_order: list[str]):
+    """Translate the DataTable sort_by state into a SQL ORDER BY clause.
+
+    The default order is appended so rows with equal sort keys keep a stable order.
+
+    list[dict] sort_by: Sort state of the DataTable with column_id and direction.
+    dict columns: Mapping of sortable column ids to their SQL expressions.
+    list[str] default_order: SQL expressions used after the requested sort keys.
+    """
+    order = [
+        f"{columns[sort['column_id']]} {'DESC' if sort['direction'] == 'desc' else 'ASC'}"
+        for sort in (sort_by or [])
+        if sort.get("column_id") in columns
+    ]
+    return "ORDER BY " + ", ".join(order + default_order)
@@ -0,0 +1,226 @@
+"""Background writer that persists score changes after the callback returned."""
+
+import atexit
+import queue
+import threading
+
+from src.unicycle.db_handler.connection_pool import is_busy_error
+
+WRITE_QUEUE_SIZE = 1000
+WRITE_RETRY_DELAY = 0.5
+WRITE_MAX_RETRY_DELAY = 30.0
+WRITE_MAX_ATTEMPTS = 3
+STOP_WRITER = object()
+
+
+def coalesce_changes(batch: list[dict]) -> dict:
+    """Merge the changed cells of several edits, later changes of a cell win.
+
+    list[dict] batch: Changed cells mapping id_routine to {column: value}.
+    """
+    merged = {}
+    for changes in batch:
+        for id_routine, cells in changes.items():
+            merged.setdefault(id_routine, {}).update(cells)
+    return merged
+
+
+class WriteBehindQueue:
+    """
+    Persists score changes on a single writer thread.
+    The writer drains everything queued since its last write and hands the
+    whole batch to write_changes, which writes it as one transaction. The queue
+    is bounded, so producers wait instead of piling up unlimited pending writes.
+    A batch that could not be written is kept and retried with exponential
+    backoff together with the change sets queued in the meantime. A busy
+    database is retried until it is free; other errors are retried
+    max_attempts times, then the change sets are written one by one and those
+    that still fail are rejected, so they do not block the following writes.
+    """
+
+    def __init__(
+        self,
+        write_changes,
+        max_pending: int = WRITE_QUEUE_SIZE,
+        retry_delay: float = WRITE_RETRY_DELAY,
+        max_retry_delay: float = WRITE_MAX_RETRY_DELAY,
+        max_attempts: int = WRITE_MAX_ATTEMPTS,
+    ):
+        """
+        Keyword arguments:
+            write_changes -- callable writing a list of change sets in one
+                transaction, returns whether the write was committed
+            max_pending -- maximum number of queued change sets
+            retry_delay -- delay before the first retry of a failed batch in seconds
+            max_retry_delay -- upper bound of the delay between retries in seconds
+            max_attempts -- attempts of a batch failing with other than busy errors
+        """
+        self.write_changes = write_changes
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.max_attempts = max_attempts
+        self.condition = threading.Condition()
+        self.stopping = threading.Event()
+        self.enqueued = 0
+        self.durable = 0
+        self.failed = 0
+        self.rejected = []
+        self.last_error = None
+        self.is_closed = False
+        self.is_stopped = False
+        self.thread = threading.Thread(
+            target=self.run, name="score-writer", daemon=True
+        )
+        self.thread.start()
+        atexit.register(self.close)
+
+    def enqueue(self, change_set: dict):
+        """
+        Queue a change set for writing, waiting while the queue is full.
+        Keyword arguments:
+            change_set -- changes of one edit
+        """
+        if self.is_closed:
+            raise RuntimeError("Score writer is closed")
+        with self.condition:
+            self.enqueued += 1
+        self.queue.put(change_set)
+
+    def take_queued(self, block: bool) -> list:
+        """
+        Take everything queued since the last write.
+        Keyword arguments:
+            block -- wait for at least one item if the queue is empty
+        """
+        batch = [self.queue.get()] if block else []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def run(self):
+        """Write queued change sets until the queue is closed."""
+        retry_batch, attempts = [], 0
+        while True:
+            if retry_batch:
+                self.stopping.wait(
+                    min(self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay)
+                )
+            batch = self.take_queued(block=not retry_batch)
+
+            # Failed change sets go first, so newer changes of a cell win
+            change_sets = retry_batch + [
+                item for item in batch if item is not STOP_WRITER
+            ]
+            error = self.write_batch(change_sets) if change_sets else None
+            if error is None:
+                retry_batch, attempts = [], 0
+            elif is_busy_error(error) or attempts + 1 < self.max_attempts:
+                retry_batch, attempts = change_sets, attempts + 1
+            else:
+                self.reject_failing(change_sets)
+                retry_batch, attempts = [], 0
+            for _ in batch:
+                self.queue.task_done()
+            if STOP_WRITER in batch:
+                break
+
+        if retry_batch:
+            print(f"❌ {len(retry_batch)} queued score changes could not be written")
+        with self.condition:
+            self.is_stopped = True
+            self.condition.notify_all()
+
+    def write_batch(self, batch: list[dict]):
+        """
+        Write a batch of change sets in one transaction.
+        Returns None if the batch was written, otherwise the error; a failed
+        batch is retried by run.
+        Keyword arguments:
+            batch -- change sets taken from the queue and failed earlier
+        """
+        error = None
+        try:
+            if not self.write_changes(batch):
+                error = RuntimeError("write was not committed")
+        except Exception as e:
+            error = e
+            print(f"❌ Error writing queued score changes: {e}")
+
+        with self.condition:
+            if error is None:
+                self.durable += len(batch)
+                self.failed = 0
+                self.last_error = None
+            else:
+                self.failed = len(batch)
+                self.last_error = error
+            self.condition.notify_all()
+        return error
+
+    def reject_failing(self, batch: list[dict]):
+        """
+        Write the change sets of a batch that failed max_attempts times one by
+        one and reject those that fail again.
+        Keyword arguments:
+            batch -- change sets of the failed batch
+        """
+        rejected, last_error = [], None
+        for change_set in batch:
+            error = self.write_batch([change_set])
+            if error is not None:
+                rejected.append(change_set)
+                last_error = error
+        if rejected:
+            print(f"❌ {len(rejected)} queued score changes rejected: {last_error}")
+        with self.condition:
+            self.rejected += rejected
+            self.failed = 0
+            self.last_error = last_error
+            self.condition.notify_all()
+
+    def status(self) -> dict:
+        """
+        Return how many change sets are pending, durable and rejected.
+        Failed counts the pending change sets whose last write failed and which
+        wait for a retry, last_error is the error of the last failed write.
+        """
+        with self.condition:
+            return {
+                "pending": self.enqueued - self.durable - len(self.rejected),
+                "durable": self.durable,
+                "failed": self.failed,
+                "rejected": len(self.rejected),
+                "last_error": None if self.last_error is None else str(self.last_error),
+            }
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until every queued change set was written or rejected.
+        Returns False if the timeout expired first or the writer stopped
+        with change sets that could not be written.
+        Keyword arguments:
+            timeout -- maximum time to wait in seconds, None waits forever
+        """
+
+        def is_done():
+            return self.durable + len(self.rejected) >= self.enqueued
+
+        with self.condition:
+            self.condition.wait_for(lambda: is_done() or self.is_stopped, timeout)
+            return is_done()
+
+    def close(self, timeout: float = None):
+        """
+        Write all queued change sets and stop the writer thread.
+        Keyword arguments:
+            timeout -- maximum time to wait for the writer in seconds
+        """
+        if self.is_closed:
+            return
+        self.is_closed = True
+        self.stopping.set()
+        self.queue.put(STOP_WRITER)
+        self.thread.join(timeout)
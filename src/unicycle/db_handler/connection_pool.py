@@ -0,0 +1,182 @@
+"""Per-thread SQLite connections shared by all DbHandlers of the same database file."""
+
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from pathlib import Path
+
+SQLITE_BUSY_TIMEOUT_MS = 5000
+SQLITE_BUSY_RETRIES = 5
+SQLITE_BUSY_RETRY_DELAY = 0.05
+
+
+class ThreadConnections:
+    """
+    Connections of one thread keyed by database path.
+    Only the thread-local storage of the pool references an instance, so it is
+    released when its thread ends and the finalizer closes the connections.
+    """
+
+    def __init__(self, pool: "ConnectionPool"):
+        """
+        Keyword arguments:
+            pool -- pool that tracks the open connections
+        """
+        self.connections = {}
+        weakref.finalize(
+            self, pool._close_thread_connections, self.connections, os.getpid()
+        )
+
+
+class ConnectionPool:
+    """
+    Hands out one SQLite connection (and cursor) per thread and database file.
+    Threads never share a connection or cursor, so concurrent requests cannot
+    interleave cursor state. Handlers of the same file in the same thread share
+    their connection and can therefore write to several tables in one transaction.
+    The connections of a thread are closed when the thread ends, so servers
+    starting a thread per request do not leak connections.
+    A forked worker process never uses connections opened by its parent.
+    """
+
+    def __init__(self, busy_timeout_ms: int = SQLITE_BUSY_TIMEOUT_MS):
+        """
+        Keyword arguments:
+            busy_timeout_ms -- time SQLite waits for a lock before reporting SQLITE_BUSY
+        """
+        self.busy_timeout_ms = busy_timeout_ms
+        self._reset()
+
+    def _reset(self):
+        """Forget all connections without closing them, e.g. those inherited by a fork."""
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._open_connections = set()
+
+    def _thread_connections(self) -> dict:
+        """Return the connections of the calling thread keyed by database path."""
+        if self._pid != os.getpid():
+            self._reset()
+        if not hasattr(self._local, "thread_connections"):
+            self._local.thread_connections = ThreadConnections(self)
+        return self._local.thread_connections.connections
+
+    def _close_thread_connections(self, connections: dict, pid: int):
+        """
+        Close the connections of a thread that ended.
+        Connections inherited by a forked process stay open for the parent.
+        Keyword arguments:
+            connections -- connections of the thread keyed by database path
+            pid -- id of the process that opened the connections
+        """
+        if pid != os.getpid():
+            return
+        for db_connection, _ in connections.values():
+            with self._lock:
+                self._open_connections.discard(db_connection)
+            db_connection.close()
+        connections.clear()
+
+    def _connect(self, db_path: Path, journal_mode: str = None) -> sqlite3.Connection:
+        """
+        Open and configure a new connection.
+        Keyword arguments:
+            db_path -- path to database
+            journal_mode -- journal mode to set, e.g. WAL; None keeps the mode of the file
+        """
+        db_connection = sqlite3.connect(
+            db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+        db_connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if journal_mode is not None:
+            db_connection.execute(f"PRAGMA journal_mode = {journal_mode}")
+            if journal_mode.upper() == "WAL":
+                db_connection.execute("PRAGMA synchronous = NORMAL")
+        return db_connection
+
+    def get(self, db_path: Path, journal_mode: str = None):
+        """
+        Return the connection and cursor of the calling thread, opening them if needed.
+        Keyword arguments:
+            db_path -- path to database
+            journal_mode -- journal mode used when a new connection is opened
+        """
+        connections = self._thread_connections()
+        key = str(db_path)
+        if key not in connections:
+            db_connection = self._connect(db_path, journal_mode)
+            connections[key] = (db_connection, db_connection.cursor())
+            with self._lock:
+                self._open_connections.add(db_connection)
+        return connections[key]
+
+    def close(self, db_path: Path):
+        """
+        Close the connection of the calling thread to the database, if any.
+        Keyword arguments:
+            db_path -- path to database
+        """
+        db_connection, _ = self._thread_connections().pop(str(db_path), (None, None))
+        if db_connection is not None:
+            with self._lock:
+                self._open_connections.discard(db_connection)
+            db_connection.close()
+
+    def close_all(self):
+        """Close the connections of all threads, e.g. on shutdown."""
+        if self._pid != os.getpid():
+            self._reset()
+            return
+        with self._lock:
+            open_connections = list(self._open_connections)
+            self._open_connections.clear()
+        for db_connection in open_connections:
+            db_connection.close()
+        self._reset()
+
+
+def is_busy_error(error: Exception) -> bool:
+    """
+    Check whether an error (or the error it was raised from) means the database is busy.
+    Keyword arguments:
+        error -- exception raised by sqlite3 or pandas
+    """
+    while error is not None:
+        if isinstance(error, sqlite3.OperationalError):
+            error_code = getattr(error, "sqlite_errorcode", None)
+            if error_code is not None:
+                return error_code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+            return "locked" in str(error) or "busy" in str(error)
+        error = error.__cause__
+    return False
+
+
+def retry_on_busy(
+    operation,
+    retries: int = SQLITE_BUSY_RETRIES,
+    delay: float = SQLITE_BUSY_RETRY_DELAY,
+):
+    """
+    Run a database operation and retry it with exponential backoff while the
+    database reports SQLITE_BUSY after the busy timeout expired.
+    Keyword arguments:
+        operation -- callable without arguments performing the database access
+        retries -- number of retries before the error is raised
+        delay -- delay before the first retry in seconds
+    """
+    for attempt in range(retries + 1):
+        try:
+            return operation()
+        except Exception as e:
+            if attempt == retries or not is_busy_error(e):
+                raise
+            time.sleep(delay * 2**attempt)
+
+
+CONNECTION_POOL = ConnectionPool()
@@ -2,64 +2,133 @@
 
 import datetime
 import sqlite3
+import threading
 import pandas as pd
 
 from abc import ABC
+from contextlib import contextmanager
 from pathlib import Path
 
+from src.unicycle.db_handler.connection_pool import CONNECTION_POOL, retry_on_busy
+
+FILE_NAME_COMPETITION_DB = Path("competition.db")
+
+_TRANSACTIONS = threading.local()
+
 
 class DbHandler(ABC):
-    """Handles reading and writing data from SQLite databases."""
+    """
+    Handles reading and writing data from SQLite databases.
+    Every thread gets its own connection from the connection pool.
+    """
 
-    def __init__(self, db_path: Path, table_name: str):
+    def __init__(self, db_path: Path, table_name: str, journal_mode: str = None):
         """
-        Create database and connect to it.
+        Create database handler; connections are opened per thread on first use.
 
         db_path -- path to database
         table_name --  name of table
+        journal_mode -- journal mode of the database, e.g. WAL; None keeps the mode of the file
         """
 
         self.db_path = db_path
         self.table_name = table_name
-        try:
-            self.db_connection = sqlite3.connect(
-                self.db_path,
-                check_same_thread=False,
-                detect_types=sqlite3.PARSE_DECLTYPES,
-            )
-            self.cursor = self.db_connection.cursor()
-        except Exception as e:
-            print(f"❌ Failed to connect database {self.table_name}: {e}")
-            self.is_connected = False
+        self.journal_mode = journal_mode
         self.is_connected = True
         sqlite3.register_converter("DATE", convert_date)
         sqlite3.register_adapter(datetime.date, adapt_date_iso)
 
+    @property
+    def db_connection(self) -> sqlite3.Connection:
+        """Connection of the calling thread to the database."""
+        return CONNECTION_POOL.get(self.db_path, self.journal_mode)[0]
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """Cursor of the calling thread on the database."""
+        return CONNECTION_POOL.get(self.db_path, self.journal_mode)[1]
+
     def create_table(self):
         pass
 
     def disconnect(self):
-        """Disconnect DbHandler from database."""
-        if not self.is_connected:
-            pass
-        self.db_connection.close()
+        """Disconnect DbHandler of the calling thread from database."""
+        CONNECTION_POOL.close(self.db_path)
         self.is_connected = False
 
     def connect(self):
-        """Connect DbHandler with database."""
-        if self.is_connected:
-            pass
+        """Connect DbHandler of the calling thread with database."""
         try:
-            self.db_connection = sqlite3.connect(
-                self.db_path,
-                check_same_thread=False,
-                detect_types=sqlite3.PARSE_DECLTYPES,
-            )
-            self.cursor = self.db_connection.cursor()
+            CONNECTION_POOL.get(self.db_path, self.journal_mode)
+            self.is_connected = True
         except Exception as e:
             print(f"❌ Failed to connect database {self.table_name}: {e}")
             self.is_connected = False
-        self.is_connected = True
+
+    def _transaction_depths(self) -> dict:
+        """Nesting depth of the open transaction blocks of the calling thread by database path."""
+        if not hasattr(_TRANSACTIONS, "depths"):
+            _TRANSACTIONS.depths = {}
+        return _TRANSACTIONS.depths
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether the calling thread is inside a transaction block on this database."""
+        return self._transaction_depths().get(str(self.db_path), 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run all writes of the with block in one transaction.
+        execute, executemany and execute_statements do not commit inside the block;
+        the block commits at its end and rolls everything back if it raises.
+        Nested blocks and handlers of other tables in the same database file join
+        the outermost block, since they share the connection of the calling thread.
+        The write lock is taken when the outermost block starts.
+        """
+        depths = self._transaction_depths()
+        key = str(self.db_path)
+        is_outermost = not self.in_transaction
+        if is_outermost:
+            retry_on_busy(lambda: self.db_connection.execute("BEGIN IMMEDIATE"))
+        depths[key] = depths.get(key, 0) + 1
+        try:
+            yield self
+            if is_outermost:
+                self.db_connection.commit()
+        except BaseException:
+            if is_outermost and self.db_connection.in_transaction:
+                self.db_connection.rollback()
+            raise
+        finally:
+            depths[key] -= 1
+
+    def commit(self):
+        """Commit, unless a transaction block is open, which commits at its end."""
+        if not self.in_transaction:
+            self.db_connection.commit()
+
+    def run_with_retry(self, operation):
+        """
+        Run a database operation, retrying it while the database is busy.
+        An implicitly opened transaction of a failed attempt is rolled back first.
+        Inside a transaction block the operation runs once and errors are raised,
+        so the block is rolled back as a whole.
+
+        operation -- callable without arguments performing the database access
+        """
+        if self.in_transaction:
+            return operation()
+
+        def attempt():
+            try:
+                return operation()
+            except Exception:
+                if self.db_connection.in_transaction:
+                    self.db_connection.rollback()
+                raise
+
+        return retry_on_busy(attempt)
 
     def get_data(self, sql_query: str = None, par=None) -> pd.DataFrame:
         """
@@ -86,7 +155,9 @@ class DbHandler(ABC):
         if sql_query is None:
             sql_query = f"SELECT * FROM {self.table_name}"
         try:
-            df = pd.read_sql_query(sql_query, con=self.db_connection, params=par)
+            df = self.run_with_retry(
+                lambda: pd.read_sql_query(sql_query, con=self.db_connection, params=par)
+            )
             return df
         except Exception as e:
             print(f"❌ Failed to load data from {self.table_name}: {e}")
@@ -94,20 +165,40 @@ class DbHandler(ABC):
 
     def execute(self, sql_query: str, params=None):
         """
-        Execute sql query
+        Execute sql query, once for every parameter set
 
         sql_query: sql query which will be executed
-        params: optional, parameter for sql query
+        params: optional, list of parameter sets for sql query
         """
-        try:
+        if params is not None:
+            params = list(params)
+
+        def run():
             if params is None:
                 self.cursor.execute(sql_query)
+            elif len(params) == 1:
+                # also allows statements like ATTACH which executemany rejects
+                self.cursor.execute(sql_query, params[0])
             else:
-                for param in params:
-                    self.cursor.execute(sql_query, param)
-            self.db_connection.commit()
+                self.cursor.executemany(sql_query, params)
+            self.commit()
+
+        try:
+            self.run_with_retry(run)
         except Exception as e:
             print(f"❌ Error executing sql query {sql_query} on {self.table_name}: {e}")
+            if self.in_transaction:
+                raise
+
+    def executemany(self, sql_query: str, data: list):
+        """
+        Execute sql query once for every parameter set and commit
+
+        sql_query: sql query which will be executed
+        data: list of parameter sets
+        """
+        self.cursor.executemany(sql_query, data)
+        self.commit()
 
     def update_data(self, df: pd.DataFrame, columns: list[str] = None):
         """Write dataframe contents to the configured SQLite table.
@@ -120,14 +211,107 @@ class DbHandler(ABC):
             if columns is not None:
                 df = df[[col for col in columns if col in df.columns]].copy()
 
-            df.to_sql(
-                self.table_name, self.db_connection, if_exists="replace", index=False
+            self.run_with_retry(
+                lambda: df.to_sql(
+                    self.table_name,
+                    self.db_connection,
+                    if_exists="replace",
+                    index=False,
+                )
             )
             print(f"✅ {self.table_name} updated successfully.")
 
         except Exception as e:
             print(f"❌ Error writing to {self.table_name}: {e}")
 
+    def upsert_rows(
+        self, df: pd.DataFrame, key_columns: list, update_columns: list
+    ) -> bool:
+        """
+        Insert rows or update the given columns of rows whose key already exists.
+        Only the listed columns are written, all other columns keep their values.
+        Keyword arguments:
+            df -- Dataframe with the rows which will be written
+            key_columns -- Columns of the primary key or a unique constraint
+            update_columns -- Columns in database which will be inserted or updated
+        """
+
+        return self.upsert_row_groups([(df, update_columns)], key_columns)
+
+    def upsert_row_groups(self, row_groups: list, key_columns: list) -> bool:
+        """
+        Upsert several groups of rows, each with its own update columns, in one
+        transaction. Returns whether the transaction was committed.
+        Keyword arguments:
+            row_groups -- List of (dataframe, update columns) pairs
+            key_columns -- Columns of the primary key or a unique constraint
+        """
+
+        try:
+            statements = [
+                self.build_upsert_statement(df, key_columns, update_columns)
+                for df, update_columns in row_groups
+            ]
+        except Exception as e:
+            print(f"❌ Error upserting rows in {self.table_name}: {e}")
+            return False
+        return self.execute_statements(statements)
+
+    def build_upsert_statement(
+        self, df: pd.DataFrame, key_columns: list, update_columns: list
+    ) -> tuple:
+        """
+        Build the statement and parameter sets upserting the rows of df.
+        Keyword arguments:
+            df -- Dataframe with the rows which will be written
+            key_columns -- Columns of the primary key or a unique constraint
+            update_columns -- Columns in database which will be inserted or updated
+        return -- (sql query, list of parameter sets)
+        """
+
+        columns = key_columns + update_columns
+        sql = f"""
+            INSERT INTO {self.table_name} ({", ".join(columns)})
+            VALUES ({", ".join(["?"] * len(columns))})
+            ON CONFLICT({", ".join(key_columns)}) DO UPDATE SET
+            {", ".join([f"{col} = excluded.{col}" for col in update_columns])}
+            """
+        values = df[columns].astype(object)
+        data = list(
+            values.where(values.notna(), None).itertuples(index=False, name=None)
+        )
+        return sql, data
+
+    def execute_statements(self, statements: list) -> bool:
+        """
+        Execute several statements, each with its list of parameter sets, in one
+        transaction. Statements of other handlers on the same database file may be
+        included, since they share the connection of the calling thread.
+        Inside a transaction block the statements join the block.
+        Returns whether the transaction was committed.
+        Keyword arguments:
+            statements -- List of (sql query, list of parameter sets) pairs
+        """
+
+        def run():
+            for sql, data in statements:
+                # executemany refuses statements that write nothing, e.g. CREATE ... IF NOT EXISTS
+                # of an existing trigger, so statements without parameters run with execute
+                if data == [()]:
+                    self.cursor.execute(sql)
+                else:
+                    self.cursor.executemany(sql, data)
+            self.commit()
+
+        try:
+            self.run_with_retry(run)
+            return True
+        except Exception as e:
+            print(f"❌ Error writing to {self.table_name}: {e}")
+            if self.in_transaction:
+                raise
+            return False
+
     def update_multiple_rows(
         self, df: pd.DataFrame, key_columns: list, update_columns: list
     ):
@@ -142,18 +326,19 @@ class DbHandler(ABC):
         try:
             sql = f"""
             UPDATE {self.table_name}
-            SET {', '.join([f"{col} = ?" for col in update_columns])}
+            SET {", ".join([f"{col} = ?" for col in update_columns])}
             WHERE {" AND ".join([f"{col} = ?" for col in key_columns])}
             """
             data = [
                 [row[col] for col in update_columns] + [row[col] for col in key_columns]
                 for _, row in df.iterrows()
             ]
-            self.cursor.executemany(sql, data)
-            self.db_connection.commit()
+            self.run_with_retry(lambda: self.executemany(sql, data))
             print(f"✅ {update_columns} in {self.table_name} updated successfully.")
         except Exception as e:
             print(f"❌ Error updating {update_columns} in {self.table_name}: {e}")
+            if self.in_transaction:
+                raise
 
 
 def adapt_date_iso(val):
@@ -0,0 +1,79 @@
+"""Database handler for the table meta"""
+
+from pathlib import Path
+
+from src.unicycle.db_handler.db_handler import DbHandler, FILE_NAME_COMPETITION_DB
+from src.unicycle.constants import get_path_project_root
+
+PROJECT_ROOT = get_path_project_root()
+DIRECTORY_DB = Path("data")
+FILE_NAME_DB = FILE_NAME_COMPETITION_DB
+TABLE_NAME = "meta"
+
+SQL_CREATE_TABLE = """
+       CREATE TABLE IF NOT EXISTS meta (
+       key TEXT PRIMARY KEY,
+       value TEXT) WITHOUT ROWID;"""
+
+SQL_SET_VALUE = """
+       INSERT INTO meta (key, value) VALUES (?, ?)
+       ON CONFLICT(key) DO UPDATE SET value = excluded.value"""
+
+
+class MetaDbHandler(DbHandler):
+    """
+    Singleton class for handling meta database operations.
+    Ensures only one instance manages database connection and operations.
+    Table contains settings of the competition database as key and value,
+    e.g. the storage the scores are kept in.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Creates a new instance if one does not exist otherwise returning existing one.
+        """
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initializes the database handler with the database path and table name.
+        Ensures initialization occurs only once.
+        """
+        if not hasattr(self, "initialised"):
+            self.initialised = True
+            super().__init__(
+                Path(PROJECT_ROOT, DIRECTORY_DB, FILE_NAME_DB),
+                TABLE_NAME,
+                journal_mode="WAL",
+            )
+
+    def create_table(self):
+        """
+        Creates empty table for settings.
+        """
+        self.execute(sql_query=SQL_CREATE_TABLE)
+
+    def get_value(self, key: str) -> str | None:
+        """
+        Load the value of a setting.
+        Keyword arguments:
+            key -- name of the setting
+        return -- value of the setting, None if it was never set
+        """
+        df = self.get_data(f"SELECT value FROM {TABLE_NAME} WHERE key = ?", [key])
+        return None if df.empty else df["value"].iloc[0]
+
+    def build_set_statement(self, key: str, value: str) -> tuple:
+        """
+        Build the statement setting a value, to be executed together with other
+        statements in one transaction.
+        Keyword arguments:
+            key -- name of the setting
+            value -- new value of the setting
+        return -- (sql query, list of parameter sets)
+        """
+        return SQL_SET_VALUE, [(key, value)]
@@ -2,13 +2,14 @@
 
 from pathlib import Path
 
-from src.unicycle.constants import TP_SUBCOLS, D_COLS
-from src.unicycle.db_handler.db_handler import DbHandler
+from src.unicycle.constants import TP_SUBCOLS, D_COLS, TOTAL_COL
+from src.unicycle.db_handler.db_handler import DbHandler, FILE_NAME_COMPETITION_DB
 from src.unicycle.constants import get_path_project_root
 
 PROJECT_ROOT = get_path_project_root()
 PATH_DATABASE = Path("data")
-FILE_NAME_DB = Path("points.db")
+FILE_NAME_DB = FILE_NAME_COMPETITION_DB
+FILE_NAME_LEGACY_DB = Path("points.db")
 TABLE_NAME = "points"
 
 
@@ -39,6 +40,7 @@ class PointsDbHandler(DbHandler):
             super().__init__(
                 Path(PROJECT_ROOT, PATH_DATABASE, FILE_NAME_DB),
                 TABLE_NAME,
+                journal_mode="WAL",
             )
 
     def create_table(self):
@@ -51,6 +53,38 @@ class PointsDbHandler(DbHandler):
                 CREATE TABLE IF NOT EXISTS points (
                 id_routine INTEGER PRIMARY KEY,
                 {tp_columns},
-                {d_columns});
+                {d_columns},
+                {TOTAL_COL} REAL);
                 """
         self.execute(sql_query=sql_create_table)
+
+    def repair_table(self):
+        """
+        Restores the declared schema of the points table.
+        Older versions replaced the table with pandas.to_sql, which drops the primary key
+        needed for upserts. Such a table is recreated and its points are copied over.
+        """
+        table_info = self.get_data(f"PRAGMA table_info({TABLE_NAME})")
+        if table_info.empty:
+            self.create_table()
+            return
+
+        primary_key = table_info.loc[table_info["pk"] > 0, "name"].tolist()
+        if primary_key == ["id_routine"]:
+            if TOTAL_COL not in table_info["name"].values:
+                self.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN {TOTAL_COL} REAL")
+            return
+
+        columns = [
+            col
+            for col in ["id_routine"] + TP_SUBCOLS + D_COLS + [TOTAL_COL]
+            if col in table_info["name"].values
+        ]
+        self.execute(f"ALTER TABLE {TABLE_NAME} RENAME TO {TABLE_NAME}_old")
+        self.create_table()
+        self.execute(
+            f"""INSERT OR REPLACE INTO {TABLE_NAME} ({", ".join(columns)})
+            SELECT {", ".join(columns)} FROM {TABLE_NAME}_old"""
+        )
+        self.execute(f"DROP TABLE {TABLE_NAME}_old")
+        print(f"✅ Schema of {TABLE_NAME} restored.")
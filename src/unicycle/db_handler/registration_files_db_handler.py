@@ -0,0 +1,100 @@
+"""Database handler for the manifest table registration_files"""
+
+import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.unicycle.db_handler.db_handler import DbHandler, FILE_NAME_COMPETITION_DB
+from src.unicycle.constants import get_path_project_root
+
+PROJECT_ROOT = get_path_project_root()
+DIRECTORY_DB = Path("data")
+FILE_NAME_DB = FILE_NAME_COMPETITION_DB
+TABLE_NAME = "registration_files"
+
+SQL_CREATE_TABLE = """
+       CREATE TABLE IF NOT EXISTS registration_files (
+       file_name TEXT PRIMARY KEY,
+       file_hash TEXT NOT NULL,
+       imported_at TEXT NOT NULL);"""
+
+
+class RegistrationFilesDbHandler(DbHandler):
+    """
+    Singleton class for handling registration_files database operations.
+    Ensures only one instance manages database connection and operations.
+    Table contains the content hash of every imported registration file, so an
+    incremental import only parses new or changed files.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Creates a new instance if one does not exist otherwise returning existing one.
+        """
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initializes the database handler with the database path and table name.
+        Ensures initialization occurs only once.
+        """
+        if not hasattr(self, "initialised"):
+            self.initialised = True
+            super().__init__(
+                Path(PROJECT_ROOT, DIRECTORY_DB, FILE_NAME_DB),
+                TABLE_NAME,
+                journal_mode="WAL",
+            )
+
+    def create_table(self):
+        """
+        Creates empty table for the hashes of imported registration files.
+        """
+        self.execute(sql_query=SQL_CREATE_TABLE)
+
+    def get_hashes(self) -> dict:
+        """
+        Load the hashes of the imported registration files.
+        return -- dictionary with the hash for each file name
+        """
+        df = self.get_data(f"SELECT file_name, file_hash FROM {TABLE_NAME}")
+        if df.empty:
+            return {}
+        return dict(zip(df["file_name"], df["file_hash"]))
+
+    def save_hashes(self, file_hashes: dict) -> bool:
+        """
+        Record registration files as imported.
+        Keyword arguments:
+            file_hashes -- dictionary with the hash for each file name
+        """
+        if not file_hashes:
+            return True
+        df = pd.DataFrame(
+            {
+                "file_name": list(file_hashes),
+                "file_hash": list(file_hashes.values()),
+                "imported_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            }
+        )
+        return self.upsert_rows(df, ["file_name"], ["file_hash", "imported_at"])
+
+    def delete_hashes(self, file_names: list) -> bool:
+        """
+        Forget registration files which were deleted.
+        Keyword arguments:
+            file_names -- names of the deleted files
+        """
+        return self.execute_statements(
+            [
+                (
+                    f"DELETE FROM {TABLE_NAME} WHERE file_name = ?",
+                    [(file_name,) for file_name in file_names],
+                )
+            ]
+        )
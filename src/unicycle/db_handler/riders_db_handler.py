@@ -3,11 +3,12 @@
 from pathlib import Path
 
 from src.unicycle.constants import get_path_project_root
-from src.unicycle.db_handler.db_handler import DbHandler
+from src.unicycle.db_handler.db_handler import DbHandler, FILE_NAME_COMPETITION_DB
 
 PROJECT_ROOT = get_path_project_root()
 PATH_DATABASE = Path("data")
-FILE_NAME_DB = Path("riders.db")
+FILE_NAME_DB = FILE_NAME_COMPETITION_DB
+FILE_NAME_LEGACY_DB = Path("riders.db")
 TABLE_NAME = "riders"
 
 SQL_CREATE_TABLE = """
@@ -17,14 +18,18 @@ SQL_CREATE_TABLE = """
         gender CHAR(1),
         date_of_birth DATE,
         age_competition_day INTEGER,
-        club VARCHAR(50));"""
+        club VARCHAR(50),
+        registration_file VARCHAR(100));"""
+
+SQL_ADD_REGISTRATION_FILE = """
+        ALTER TABLE riders ADD COLUMN registration_file VARCHAR(100)"""
 
 
 class RidersDbHandler(DbHandler):
     """
     Singleton class for handling rider database operations.
     Ensures only one instance manages database connection and operations.
-    Database contains rider data (id of the rider, name, gender, date of birth, the age at day of the competition and the club)
+    Database contains rider data (id of the rider, name, gender, date of birth, the age at day of the competition, the club and the registration file)
     """
 
     _instance = None
@@ -48,11 +53,18 @@ class RidersDbHandler(DbHandler):
             super().__init__(
                 Path(PROJECT_ROOT, PATH_DATABASE, FILE_NAME_DB),
                 TABLE_NAME,
+                journal_mode="WAL",
             )
 
     def create_table(self):
         """
         Creates empty database for rider data.
+        Adds the column registration_file to tables created before it existed.
         """
 
         self.execute(sql_query=SQL_CREATE_TABLE)
+        df_columns = self.get_data(
+            f"SELECT name FROM pragma_table_info('{TABLE_NAME}')"
+        )
+        if "registration_file" not in set(df_columns["name"]):
+            self.execute(sql_query=SQL_ADD_REGISTRATION_FILE)
@@ -2,12 +2,13 @@
 
 from pathlib import Path
 
-from src.unicycle.db_handler.db_handler import DbHandler
+from src.unicycle.db_handler.db_handler import DbHandler, FILE_NAME_COMPETITION_DB
 from src.unicycle.constants import get_path_project_root
 
 PROJECT_ROOT = get_path_project_root()
 DIRECTORY_DB = Path("data")
-FILE_NAME_DB = Path("routines.db")
+FILE_NAME_DB = FILE_NAME_COMPETITION_DB
+FILE_NAME_LEGACY_DB = Path("routines.db")
 TABLE_NAME = "routines"
 
 SQL_CREATE_TABLE = """CREATE TABLE IF NOT EXISTS routines (
@@ -41,7 +42,11 @@ class RoutinesDbHandler(DbHandler):
         """
         if not hasattr(self, "initialised"):
             self.initialised = True
-            super().__init__(Path(PROJECT_ROOT, DIRECTORY_DB, FILE_NAME_DB), TABLE_NAME)
+            super().__init__(
+                Path(PROJECT_ROOT, DIRECTORY_DB, FILE_NAME_DB),
+                TABLE_NAME,
+                journal_mode="WAL",
+            )
 
     def create_table(self):
         """
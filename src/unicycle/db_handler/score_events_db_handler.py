@@ -0,0 +1,99 @@
+"""Database handler for the append-only table score_events"""
+
+from pathlib import Path
+
+from src.unicycle.db_handler.db_handler import DbHandler, FILE_NAME_COMPETITION_DB
+from src.unicycle.constants import get_path_project_root
+
+PROJECT_ROOT = get_path_project_root()
+DIRECTORY_DB = Path("data")
+FILE_NAME_DB = FILE_NAME_COMPETITION_DB
+TABLE_NAME = "score_events"
+
+SQL_CREATE_TABLE = """
+       CREATE TABLE IF NOT EXISTS score_events (
+       id_event INTEGER PRIMARY KEY AUTOINCREMENT,
+       id_routine INTEGER NOT NULL,
+       score_column TEXT NOT NULL,
+       value,
+       timestamp TEXT NOT NULL,
+       session TEXT);"""
+
+SQL_INSERT_EVENT = """
+       INSERT INTO score_events (id_routine, score_column, value, timestamp, session)
+       VALUES (?, ?, ?, ?, ?)"""
+
+
+class ScoreEventsDbHandler(DbHandler):
+    """
+    Singleton class for handling score_events database operations.
+    Ensures only one instance manages database connection and operations.
+    Table contains every score cell entered by the judges in the order of entry.
+    Events are only appended; the table points is a projection of this log.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Creates a new instance if one does not exist otherwise returning existing one.
+        """
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initializes the database handler with the database path and table name.
+        Ensures initialization occurs only once.
+        """
+        if not hasattr(self, "initialised"):
+            self.initialised = True
+            super().__init__(
+                Path(PROJECT_ROOT, DIRECTORY_DB, FILE_NAME_DB),
+                TABLE_NAME,
+                journal_mode="WAL",
+            )
+
+    def create_table(self):
+        """
+        Creates empty table for score events.
+        """
+        self.execute(sql_query=SQL_CREATE_TABLE)
+
+    def build_append_statement(self, events: list) -> tuple:
+        """
+        Build the statement appending events, to be executed together with other
+        statements in one transaction.
+        Keyword arguments:
+            events -- list of (id_routine, score_column, value, timestamp, session)
+        return -- (sql query, list of parameter sets)
+        """
+        return SQL_INSERT_EVENT, events
+
+    def append_events(self, events: list) -> bool:
+        """
+        Append events in one transaction.
+        Keyword arguments:
+            events -- list of (id_routine, score_column, value, timestamp, session)
+        """
+        return self.execute_statements([self.build_append_statement(events)])
+
+    def get_events(self, until_event: int = None, until_timestamp: str = None):
+        """
+        Load events in the order they were appended.
+        Keyword arguments:
+            until_event -- only load events up to and including this id
+            until_timestamp -- only load events up to and including this ISO timestamp
+        """
+        conditions, params = [], []
+        if until_event is not None:
+            conditions.append("id_event <= ?")
+            params.append(int(until_event))
+        if until_timestamp is not None:
+            conditions.append("timestamp <= ?")
+            params.append(until_timestamp)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.get_data(
+            f"SELECT * FROM {TABLE_NAME} {where} ORDER BY id_event", params
+        )
@@ -0,0 +1,80 @@
+"""Database handler for the long-format table scores"""
+
+from pathlib import Path
+
+from src.unicycle.db_handler.db_handler import DbHandler, FILE_NAME_COMPETITION_DB
+from src.unicycle.constants import get_path_project_root
+
+PROJECT_ROOT = get_path_project_root()
+DIRECTORY_DB = Path("data")
+FILE_NAME_DB = FILE_NAME_COMPETITION_DB
+TABLE_NAME = "scores"
+
+SQL_CREATE_TABLE = """
+       CREATE TABLE IF NOT EXISTS scores (
+       id_routine INTEGER NOT NULL,
+       judge TEXT NOT NULL,
+       criterion TEXT NOT NULL,
+       value REAL NOT NULL,
+       PRIMARY KEY (id_routine, judge, criterion)) WITHOUT ROWID;"""
+
+SQL_UPSERT_SCORE = """
+       INSERT INTO scores (id_routine, judge, criterion, value) VALUES (?, ?, ?, ?)
+       ON CONFLICT(id_routine, judge, criterion) DO UPDATE SET value = excluded.value"""
+
+SQL_DELETE_SCORE = """
+       DELETE FROM scores WHERE id_routine = ? AND judge = ? AND criterion = ?"""
+
+
+class ScoresDbHandler(DbHandler):
+    """
+    Singleton class for handling scores database operations.
+    Ensures only one instance manages database connection and operations.
+    Table contains one row per entered score cell of a routine, judge and criterion.
+    Empty cells have no row.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Creates a new instance if one does not exist otherwise returning existing one.
+        """
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initializes the database handler with the database path and table name.
+        Ensures initialization occurs only once.
+        """
+        if not hasattr(self, "initialised"):
+            self.initialised = True
+            super().__init__(
+                Path(PROJECT_ROOT, DIRECTORY_DB, FILE_NAME_DB),
+                TABLE_NAME,
+                journal_mode="WAL",
+            )
+
+    def create_table(self):
+        """
+        Creates empty table for scores.
+        """
+        self.execute(sql_query=SQL_CREATE_TABLE)
+
+    def build_write_statements(self, upserts: list, deletes: list) -> list:
+        """
+        Build the statements writing entered cells and removing emptied cells,
+        to be executed together with other statements in one transaction.
+        Keyword arguments:
+            upserts -- list of (id_routine, judge, criterion, value)
+            deletes -- list of (id_routine, judge, criterion)
+        return -- list of (sql query, list of parameter sets)
+        """
+        statements = []
+        if upserts:
+            statements.append((SQL_UPSERT_SCORE, upserts))
+        if deletes:
+            statements.append((SQL_DELETE_SCORE, deletes))
+        return statements
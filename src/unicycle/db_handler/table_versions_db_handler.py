@@ -0,0 +1,107 @@
+"""Database handler for the table table_versions"""
+
+from pathlib import Path
+
+from src.unicycle.db_handler.db_handler import DbHandler, FILE_NAME_COMPETITION_DB
+from src.unicycle.constants import get_path_project_root
+
+PROJECT_ROOT = get_path_project_root()
+DIRECTORY_DB = Path("data")
+FILE_NAME_DB = FILE_NAME_COMPETITION_DB
+TABLE_NAME = "table_versions"
+VERSIONED_TABLES = ["riders", "routines", "riders_routines", "points", "scores"]
+
+SQL_CREATE_TABLE = """
+       CREATE TABLE IF NOT EXISTS table_versions (
+       table_name TEXT PRIMARY KEY,
+       version INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID;"""
+
+SQL_INSERT_TABLE = """
+       INSERT OR IGNORE INTO table_versions (table_name) VALUES (?)"""
+
+SQL_CREATE_TRIGGER = """
+       CREATE TRIGGER IF NOT EXISTS table_versions_{table}_{operation}
+       AFTER {operation} ON {table}
+       BEGIN
+           UPDATE table_versions SET version = version + 1
+           WHERE table_name = '{table}';
+       END"""
+
+TRIGGER_OPERATIONS = ["INSERT", "UPDATE", "DELETE"]
+
+
+class TableVersionsDbHandler(DbHandler):
+    """
+    Singleton class for handling table_versions database operations.
+    Ensures only one instance manages database connection and operations.
+    Table contains a version per data table which triggers increase on every
+    written row, so every process can detect writes of other processes by
+    reading this small table instead of the data tables.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Creates a new instance if one does not exist otherwise returning existing one.
+        """
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initializes the database handler with the database path and table name.
+        Ensures initialization occurs only once.
+        """
+        if not hasattr(self, "initialised"):
+            self.initialised = True
+            super().__init__(
+                Path(PROJECT_ROOT, DIRECTORY_DB, FILE_NAME_DB),
+                TABLE_NAME,
+                journal_mode="WAL",
+            )
+
+    def create_table(self, tables: list = None):
+        """
+        Creates the table for versions and the triggers increasing them.
+        Triggers are only created for existing tables; the call is repeated
+        after a table was created or recreated.
+        Keyword arguments:
+            tables -- tables whose writes are counted, defaults to VERSIONED_TABLES
+        """
+        tables = VERSIONED_TABLES if tables is None else tables
+        df_existing = self.get_data(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+        existing = set(df_existing["name"]) if not df_existing.empty else set()
+        statements = [(SQL_CREATE_TABLE, [()])]
+        for table in tables:
+            if table not in existing:
+                continue
+            statements.append((SQL_INSERT_TABLE, [(table,)]))
+            statements += [
+                (SQL_CREATE_TRIGGER.format(table=table, operation=operation), [()])
+                for operation in TRIGGER_OPERATIONS
+            ]
+        return self.execute_statements(statements)
+
+    def get_versions(self, tables: list) -> tuple:
+        """
+        Load the current versions of the given tables.
+        Keyword arguments:
+            tables -- names of the versioned tables
+        return -- versions in the order of tables, None for a table without version
+        """
+        placeholders = ", ".join(["?"] * len(tables))
+        df = self.get_data(
+            f"SELECT table_name, version FROM {TABLE_NAME} "
+            f"WHERE table_name IN ({placeholders})",
+            list(tables),
+        )
+        versions = (
+            dict(zip(df["table_name"], df["version"].astype(int)))
+            if not df.empty
+            else {}
+        )
+        return tuple(versions.get(table) for table in tables)
@@ -0,0 +1,92 @@
+"""Migrates the former four-file database layout into the single competition database."""
+
+from pathlib import Path
+
+from src.unicycle.db_handler import (
+    points_db_handler,
+    riders_db_handler,
+    riders_routines_db_handler,
+    routines_db_handler,
+)
+from src.unicycle.db_handler.db_handler import DbHandler
+from src.unicycle.db_handler.points_db_handler import PointsDbHandler
+from src.unicycle.db_handler.riders_db_handler import RidersDbHandler
+from src.unicycle.db_handler.riders_routines_db_handler import RidersRoutinesDbHandler
+from src.unicycle.db_handler.routines_db_handler import RoutinesDbHandler
+
+LEGACY_DATABASES = [
+    (RidersDbHandler, riders_db_handler.FILE_NAME_LEGACY_DB),
+    (RoutinesDbHandler, routines_db_handler.FILE_NAME_LEGACY_DB),
+    (RidersRoutinesDbHandler, riders_routines_db_handler.FILE_NAME_LEGACY_DB),
+    (PointsDbHandler, points_db_handler.FILE_NAME_LEGACY_DB),
+]
+
+
+def migrate_table(db_handler: DbHandler, legacy_db_path: Path) -> bool:
+    """
+    Copy one table from its former database file into the competition database.
+    Tables which already contain data are left untouched.
+    Keyword arguments:
+        db_handler -- DbHandler of the table in the competition database
+        legacy_db_path -- path to the former database file of this table
+    return -- True if rows were copied
+    """
+    if not legacy_db_path.exists():
+        return False
+
+    db_handler.create_table()
+    if not db_handler.get_data(f"SELECT 1 FROM {db_handler.table_name} LIMIT 1").empty:
+        return False
+
+    db_handler.execute("ATTACH DATABASE ? AS legacy", [(str(legacy_db_path),)])
+    try:
+        legacy_columns = db_handler.get_data(
+            f"SELECT name FROM pragma_table_info('{db_handler.table_name}', 'legacy')"
+        )
+        columns = db_handler.get_data(
+            f"SELECT name FROM pragma_table_info('{db_handler.table_name}', 'main')"
+        )
+        common_columns = [
+            col for col in columns["name"] if col in set(legacy_columns.get("name", []))
+        ]
+        if not common_columns:
+            return False
+
+        column_list = ", ".join(common_columns)
+        db_handler.execute(
+            f"""INSERT OR REPLACE INTO main.{db_handler.table_name} ({column_list})
+            SELECT {column_list} FROM legacy.{db_handler.table_name}"""
+        )
+        print(f"✅ {db_handler.table_name} migrated from {legacy_db_path.name}.")
+        return True
+    finally:
+        db_handler.execute("DETACH DATABASE legacy")
+
+
+def migrate_legacy_databases(directory: Path = None) -> bool:
+    """
+    Copy the tables of riders.db, routines.db, riders_routines.db and points.db
+    into the competition database. The former files are kept as they are.
+    Keyword arguments:
+        directory -- directory containing the former database files
+    return -- True if any table was migrated
+    """
+    migrated = False
+    for db_handler_class, file_name in LEGACY_DATABASES:
+        db_handler = db_handler_class()
+        if directory is None:
+            legacy_db_path = db_handler.db_path.parent / file_name
+        else:
+            legacy_db_path = Path(directory, file_name)
+        migrated = migrate_table(db_handler, legacy_db_path) or migrated
+    return migrated
+
+
+def main():
+    """Migrate the former database files in the data directory."""
+    if not migrate_legacy_databases():
+        print("INFO: nothing to migrate.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Rebuilds the table points by replaying the score event log."""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from src.unicycle.constants import (
+    COLS_TO_SAVE,
+    SCORE_COLS,
+    TOTAL_COL,
+    get_path_config_file,
+    load_config,
+)
+from src.unicycle.dashboard.score_storage import (
+    STORAGE_LONG,
+    STORAGE_WIDE,
+    unpivot_scores,
+)
+from src.unicycle.dashboard.scoring import recalculate_all_results
+from src.unicycle.db_handler.points_db_handler import PointsDbHandler
+from src.unicycle.db_handler.routines_db_handler import RoutinesDbHandler
+from src.unicycle.db_handler.score_events_db_handler import ScoreEventsDbHandler
+from src.unicycle.db_handler.scores_db_handler import ScoresDbHandler
+
+SESSION_BASELINE = "baseline"
+TIMESTAMP_BASELINE = "0001-01-01T00:00:00"
+
+
+def seed_score_events(
+    points_db_handler: PointsDbHandler = PointsDbHandler(),
+    score_events_db_handler: ScoreEventsDbHandler = ScoreEventsDbHandler(),
+) -> bool:
+    """
+    Record the scores in points as baseline events if the event log is empty,
+    so that points written before the log existed survive a replay.
+    Keyword arguments:
+        points_db_handler -- DbHandler for the table points
+        score_events_db_handler -- DbHandler for the table score_events
+    return -- True if baseline events were recorded
+    """
+    score_events_db_handler.create_table()
+    if not score_events_db_handler.get_data("SELECT 1 FROM score_events LIMIT 1").empty:
+        return False
+
+    df_points = points_db_handler.get_data()
+    score_cols = [col for col in SCORE_COLS if col in df_points.columns]
+    if df_points.empty or not score_cols:
+        return False
+
+    df_events = df_points.melt(
+        id_vars="id_routine",
+        value_vars=score_cols,
+        var_name="score_column",
+        value_name="value",
+    ).dropna(subset="value")
+    if df_events.empty:
+        return False
+
+    events = [
+        (int(id_routine), score_column, value, TIMESTAMP_BASELINE, SESSION_BASELINE)
+        for id_routine, score_column, value in df_events.astype(object).itertuples(
+            index=False, name=None
+        )
+    ]
+    return score_events_db_handler.append_events(events)
+
+
+def project_points(df_events: pd.DataFrame, df_routines: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the table points from score events: the latest event of every cell
+    wins and the results are recalculated.
+    Keyword arguments:
+        df_events -- score events in the order they were appended
+        df_routines -- routines with id_routine, category and age_group
+    return -- dataframe with the columns of the table points
+    """
+    df_latest = df_events.drop_duplicates(["id_routine", "score_column"], keep="last")
+    df_scores = df_latest.pivot(
+        index="id_routine", columns="score_column", values="value"
+    )
+    df = df_routines[["id_routine", "category", "age_group"]].merge(
+        df_scores.reset_index(), on="id_routine", how="left"
+    )
+    for col in SCORE_COLS:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    return recalculate_all_results(df)[COLS_TO_SAVE]
+
+
+def replay_score_events(
+    until_event: int = None,
+    until_timestamp: str = None,
+    score_storage: str = STORAGE_WIDE,
+    points_db_handler: PointsDbHandler = PointsDbHandler(),
+    routines_db_handler: RoutinesDbHandler = RoutinesDbHandler(),
+    score_events_db_handler: ScoreEventsDbHandler = ScoreEventsDbHandler(),
+    scores_db_handler: ScoresDbHandler = ScoresDbHandler(),
+) -> bool:
+    """
+    Replace the content of points, and of scores for long-format storage,
+    by the projection of the event log.
+    Keyword arguments:
+        until_event -- only replay events up to and including this id
+        until_timestamp -- only replay events up to and including this ISO timestamp
+        score_storage -- 'wide' or 'long' storage of the scores
+        points_db_handler -- DbHandler for the table points
+        routines_db_handler -- DbHandler for the table routines
+        score_events_db_handler -- DbHandler for the table score_events
+        scores_db_handler -- DbHandler for the table scores
+    return -- True if points was rebuilt
+    """
+    df_events = score_events_db_handler.get_events(until_event, until_timestamp)
+    df_routines = routines_db_handler.get_data(
+        "SELECT id_routine, category, age_group FROM routines"
+    )
+    if df_routines.empty:
+        print("❌ No routines found, points were not rebuilt.")
+        return False
+    if df_events.empty:
+        df_events = pd.DataFrame(columns=["id_routine", "score_column", "value"])
+
+    df_points = project_points(df_events, df_routines)
+    # With long-format storage the scores live in scores and points only
+    # keeps the results
+    points_cols = [TOTAL_COL] if score_storage == STORAGE_LONG else COLS_TO_SAVE[1:]
+    statements = [
+        ("DELETE FROM points", [()]),
+        points_db_handler.build_upsert_statement(
+            df_points, ["id_routine"], points_cols
+        ),
+    ]
+    if score_storage == STORAGE_LONG:
+        scores_db_handler.create_table()
+        rows = unpivot_scores(df_points).astype(object)
+        statements += [("DELETE FROM scores", [()])]
+        statements += scores_db_handler.build_write_statements(
+            list(rows.itertuples(index=False, name=None)), []
+        )
+    is_rebuilt = points_db_handler.execute_statements(statements)
+    if is_rebuilt:
+        print(f"✅ points rebuilt from {len(df_events)} score events.")
+    return is_rebuilt
+
+
+def main():
+    """Rebuild the table points from the score event log."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--until-event", type=int, help="replay events up to and including this id"
+    )
+    parser.add_argument(
+        "--until-timestamp",
+        help="replay events up to and including this ISO timestamp",
+    )
+    args = parser.parse_args()
+    config = load_config(get_path_config_file())
+    replay_score_events(
+        args.until_event,
+        args.until_timestamp,
+        config.get("score_storage", STORAGE_WIDE),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Serves the dashboard with a production WSGI server (gunicorn or waitress).
+
+Install the servers first: pip install -r requirements_server.txt installs
+gunicorn (Linux, macOS) and waitress (any platform, including Windows).
+
+SQLite and several worker processes:
+- SQLite allows one writer at a time per database file, across all processes.
+  WAL mode lets readers continue while a worker writes, and the busy timeout
+  plus the retries in DbHandler make concurrent writers wait instead of failing.
+- Keep the number of worker processes small and scale with threads instead;
+  each worker opens its own connections, writer thread and view cache.
+- Workers must be started from the app factory and not forked from a process
+  that already opened the database (no preloading).
+- Keep competition.db on a local disk; file locking on network shares is
+  unreliable and can corrupt the database.
+- Every open participant page keeps one thread busy for the live result feed.
+  The feed never takes the last --callback-threads threads of a worker, so the
+  judges' callbacks always get a thread; participant pages beyond that poll
+  the results every few seconds instead. Size the threads for the spectators.
+- View caches notice writes of other workers through the table versions that
+  triggers keep in table_versions, so views stay current with several workers.
+- With several workers each live result feed also watches the version of points
+  in table_versions and pushes results written by the other workers, a few
+  seconds later than the results of its own worker.
+"""
+
+import argparse
+import os
+
+from src.unicycle.app import create_app
+
+SERVER_GUNICORN = "gunicorn"
+SERVER_WAITRESS = "waitress"
+DEFAULT_SERVER = SERVER_WAITRESS if os.name == "nt" else SERVER_GUNICORN
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8050
+DEFAULT_WORKERS = 1
+DEFAULT_THREADS = 32
+DEFAULT_CALLBACK_THREADS = 8
+
+
+def create_server(max_result_streams: int = None, watch_results: bool = False):
+    """
+    Create the Flask server of a new dashboard application, e.g. for gunicorn.
+    Keyword arguments:
+        max_result_streams -- maximum number of live result streams, None for no limit
+        watch_results -- whether the live result feed also pushes results written
+            by other worker processes
+    """
+    return create_app(
+        max_result_streams=max_result_streams, watch_results=watch_results
+    ).server
+
+
+def count_result_streams(threads: int, callback_threads: int) -> int:
+    """
+    Number of threads of a worker the live result feed may occupy.
+    Keyword arguments:
+        threads -- number of threads handling requests
+        callback_threads -- number of threads kept free for the callbacks
+    """
+    return max(threads - callback_threads, 0)
+
+
+def serve_waitress(host: str, port: int, threads: int, callback_threads: int) -> bool:
+    """
+    Serve the dashboard with waitress in this process.
+    Keyword arguments:
+        host -- interface to listen on
+        port -- port to listen on
+        threads -- number of threads handling requests
+        callback_threads -- number of threads kept free for the callbacks
+    """
+    try:
+        from waitress import serve
+    except ImportError:
+        print("❌ waitress is not installed, install it with: pip install waitress")
+        return False
+
+    server = create_server(count_result_streams(threads, callback_threads))
+    serve(server, host=host, port=port, threads=threads)
+    return True
+
+
+def serve_gunicorn(
+    host: str, port: int, workers: int, threads: int, callback_threads: int
+) -> bool:
+    """
+    Serve the dashboard with gunicorn worker processes.
+    Keyword arguments:
+        host -- interface to listen on
+        port -- port to listen on
+        workers -- number of worker processes
+        threads -- number of threads per worker process
+        callback_threads -- number of threads per worker kept free for the callbacks
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("❌ gunicorn is not installed, install it with: pip install gunicorn")
+        return False
+
+    class DashboardApplication(BaseApplication):
+        """Gunicorn application creating one dashboard per worker process."""
+
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return create_server(
+                count_result_streams(threads, callback_threads),
+                watch_results=workers > 1,
+            )
+
+    DashboardApplication(
+        {
+            "bind": f"{host}:{port}",
+            "workers": workers,
+            "threads": threads,
+            "worker_class": "gthread",
+            "preload_app": False,
+        }
+    ).run()
+    return True
+
+
+def main():
+    """Start the dashboard with the production server given on the command line."""
+    parser = argparse.ArgumentParser(description="Serve the unicycle dashboard.")
+    parser.add_argument(
+        "--server",
+        choices=[SERVER_GUNICORN, SERVER_WAITRESS],
+        default=DEFAULT_SERVER,
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="worker processes (gunicorn only)",
+    )
+    parser.add_argument(
+        "--threads", type=int, default=DEFAULT_THREADS, help="threads per worker"
+    )
+    parser.add_argument(
+        "--callback-threads",
+        type=int,
+        default=DEFAULT_CALLBACK_THREADS,
+        help="threads per worker the live result feed leaves free for callbacks",
+    )
+    args = parser.parse_args()
+
+    if args.server == SERVER_WAITRESS:
+        serve_waitress(args.host, args.port, args.threads, args.callback_threads)
+    else:
+        serve_gunicorn(
+            args.host, args.port, args.workers, args.threads, args.callback_threads
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import datetime
+
+import pandas as pd
+
+from src.unicycle.create_database import build_routines
+
+
+def test_build_routines():
+    registration = pd.DataFrame(
+        {
+            "name": ["Anna", "Ben", "Carl"],
+            "date_of_birth": [datetime.date(2012, 1, 1)] * 3,
+            "name_individual": ["Kür A", "Kür B", "Kür C"],
+            "age_group_individual": ["U15", "U13", "U13"],
+            "name_pair": ["Duo", "Duo", None],
+            "age_group_pair": ["U15", "U15", None],
+            "name_small_group": [" ", None, None],
+            "age_group_small_group": ["U15", None, None],
+            "name_large_group": [None] * 3,
+            "age_group_large_group": [None] * 3,
+        }
+    )
+
+    df_routines, df_entries = build_routines(registration, 10)
+
+    assert [10, 11, 12, 13] == df_routines["id_routine"].tolist()
+    assert ["Kür B", "Kür C", "Kür A", "Duo"] == df_routines["routine_name"].tolist()
+    assert ["Anna", "Ben"] == df_entries.loc[
+        df_entries["id_routine"] == 13, "name"
+    ].tolist()
+    assert 5 == len(df_entries)
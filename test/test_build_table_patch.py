@@ -0,0 +1,41 @@
+import dash
+import numpy as np
+import pandas as pd
+
+from src.unicycle.dashboard.callbacks import build_table_patch
+
+
+def test_build_table_patch_only_changed_cells():
+    rows = [
+        {"id_routine": 1, "T1_Q": 1.0, "Ergebnis": None},
+        {"id_routine": 2, "T1_Q": 2.0, "Ergebnis": 5.0},
+    ]
+    df = pd.DataFrame(
+        {"id_routine": [1, 2], "T1_Q": [1.0, 3.0], "Ergebnis": [np.nan, 6.0]}
+    )
+
+    patch = build_table_patch(rows, df)
+
+    assert isinstance(patch, dash.Patch)
+    operations = patch.to_plotly_json()["operations"]
+    assert [
+        ([1, "T1_Q"], 3.0),
+        ([1, "Ergebnis"], 6.0),
+    ] == [(op["location"], op["params"]["value"]) for op in operations]
+
+
+def test_build_table_patch_unchanged_table():
+    rows = [{"id_routine": 1, "T1_Q": 1.0, "Ergebnis": None}]
+    df = pd.DataFrame({"id_routine": [1], "T1_Q": [1.0], "Ergebnis": [np.nan]})
+
+    assert dash.no_update is build_table_patch(rows, df)
+
+
+def test_build_table_patch_row_count_changed():
+    rows = [{"id_routine": 1, "T1_Q": 1.0}]
+    df = pd.DataFrame({"id_routine": [1, 2], "T1_Q": [1.0, np.nan]})
+
+    assert [
+        {"id_routine": 1, "T1_Q": 1.0},
+        {"id_routine": 2, "T1_Q": None},
+    ] == build_table_patch(rows, df)
@@ -1,6 +1,8 @@
-from datetime import datetime
+import datetime
 
-from src.unicycle.create_database import calculate_age
+import pandas as pd
+
+from src.unicycle.create_database import calculate_age, calculate_ages
 
 
 def test_calculate_age_year():
@@ -25,3 +27,24 @@ def test_calculate_age_day():
     assert 21 == calculate_age(
         datetime.datetime(2004, 6, 27), datetime.datetime(2025, 6, 27)
     )
+
+
+def test_calculate_ages():
+    dates_of_birth = pd.Series(
+        [
+            datetime.date(2002, 2, 24),
+            datetime.date(2002, 8, 24),
+            datetime.date(2003, 4, 20),
+            datetime.date(2004, 2, 29),
+            None,
+        ]
+    )
+    date = datetime.date(2025, 4, 20)
+
+    ages = calculate_ages(dates_of_birth, date)
+
+    assert [23, 22, 22, 21] == ages[:4].tolist()
+    assert ages[:4].tolist() == [
+        calculate_age(date_of_birth, date) for date_of_birth in dates_of_birth[:4]
+    ]
+    assert pd.isna(ages[4])
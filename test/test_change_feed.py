@@ -0,0 +1,79 @@
+import json
+import time
+
+from flask import Flask
+
+from src.unicycle.dashboard.change_feed import (
+    CHANGE_FEED_ROUTE,
+    SUBSCRIBER_QUEUE_SIZE,
+    ChangeFeed,
+    register_change_feed,
+)
+
+
+def test_change_feed_stream():
+    change_feed = ChangeFeed()
+    stream = change_feed.stream(change_feed.subscribe(), heartbeat_seconds=0.01)
+
+    assert 1 == len(change_feed.subscribers)
+    assert "retry: 3000\n\n" == next(stream)
+    assert ": heartbeat\n\n" == next(stream)
+
+    change_feed.publish([{"id_routine": 3, "Ergebnis": 45.2}])
+    assert 'data: [{"id_routine":3,"Ergebnis":45.2}]\n\n' == next(stream)
+
+    stream.close()
+    assert not change_feed.subscribers
+
+
+def test_change_feed_drops_oldest_message():
+    change_feed = ChangeFeed()
+    subscriber = change_feed.subscribe()
+
+    for id_routine in range(SUBSCRIBER_QUEUE_SIZE + 1):
+        change_feed.publish([{"id_routine": id_routine}])
+    change_feed.publish([])
+
+    assert SUBSCRIBER_QUEUE_SIZE == subscriber.qsize()
+    assert '[{"id_routine":1}]' == subscriber.get_nowait()
+
+
+def test_change_feed_endpoint_limits_streams():
+    server = Flask(__name__)
+    change_feed = ChangeFeed(max_subscribers=1)
+    register_change_feed(server, change_feed)
+    client = server.test_client()
+
+    response = client.get(CHANGE_FEED_ROUTE, buffered=False)
+    assert 200 == response.status_code
+    assert 1 == len(change_feed.subscribers)
+    assert 204 == client.get(CHANGE_FEED_ROUTE).status_code
+
+    response.close()
+    assert not change_feed.subscribers
+
+
+def test_change_feed_watches_results_of_other_processes():
+    change_feed = ChangeFeed()
+    subscriber = change_feed.subscribe()
+    database = {"version": 1, "results": {1: 40.0, 2: None}}
+
+    change_feed.watch(
+        lambda: database["version"],
+        lambda: dict(database["results"]),
+        interval_seconds=0.01,
+    )
+    time.sleep(0.05)
+    assert subscriber.empty()
+
+    database["results"] = {1: 40.0, 2: 45.5, 3: None}
+    database["version"] = 2
+    message = subscriber.get(timeout=1)
+    change_feed.stop_watching(timeout=1)
+
+    assert [
+        {"id_routine": 2, "Ergebnis": 45.5},
+        {"id_routine": 3, "Ergebnis": None},
+    ] == json.loads(message)
+    assert subscriber.empty()
+    assert change_feed.watcher is None
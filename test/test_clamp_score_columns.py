@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from src.unicycle.constants import CATEGORY_COL, EMPTY_SCORE, SCORE_COLS
+from src.unicycle.dashboard.scoring import clamp_cell, clamp_score_columns
+
+
+def test_clamp_score_columns_matches_clamp_cell():
+    raw_values = [
+        3,
+        4.5,
+        -1,
+        10.5,
+        999,
+        1000,
+        "7",
+        "x",
+        EMPTY_SCORE,
+        None,
+        2.5,
+        -1e30,
+        "-5",
+    ]
+    rows = [
+        {col: raw_values[(i + j) % len(raw_values)] for j, col in enumerate(SCORE_COLS)}
+        for i in range(len(raw_values))
+    ]
+    df = pd.DataFrame(rows)
+    df[CATEGORY_COL] = ["pair", "small_group", "individual male", None] * 3 + [
+        "large_group"
+    ]
+
+    clamped = clamp_score_columns(df)
+
+    for col in SCORE_COLS:
+        expected = df.apply(
+            lambda row: clamp_cell(row.get(col), row.get(CATEGORY_COL), col), axis=1
+        )
+        for value, expected_value in zip(clamped[col], expected):
+            if isinstance(expected_value, float) and np.isnan(expected_value):
+                assert np.isnan(value)
+            else:
+                assert expected_value == value
+                assert type(expected_value) is type(value)
+
+
+def test_clamp_score_columns_locked_d_judges():
+    df = pd.DataFrame([{col: 1 for col in SCORE_COLS}] * 2)
+    df[CATEGORY_COL] = ["pair", "small_group"]
+
+    clamped = clamp_score_columns(df)
+
+    assert EMPTY_SCORE == clamped.loc[0, "D3_S"]
+    assert EMPTY_SCORE == clamped.loc[0, "D4_N"]
+    assert 1 == clamped.loc[1, "D3_S"]
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from src.unicycle.db_handler import connection_pool
+from src.unicycle.db_handler.connection_pool import (
+    ConnectionPool,
+    is_busy_error,
+    retry_on_busy,
+)
+
+
+def test_connection_per_thread(tmp_path):
+    db_path = tmp_path / "pool.db"
+    pool = ConnectionPool()
+    main_connection, main_cursor = pool.get(db_path, "WAL")
+    connections = []
+
+    thread = threading.Thread(target=lambda: connections.append(pool.get(db_path)[0]))
+    thread.start()
+    thread.join()
+
+    assert pool.get(db_path) == (main_connection, main_cursor)
+    assert connections[0] is not main_connection
+    assert "wal" == main_connection.execute("PRAGMA journal_mode").fetchone()[0]
+    pool.close_all()
+
+
+def test_connections_closed_when_thread_ends(tmp_path):
+    db_path = tmp_path / "pool.db"
+    pool = ConnectionPool()
+    connections = []
+
+    threads = [
+        threading.Thread(target=lambda: connections.append(pool.get(db_path)[0]))
+        for _ in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+        thread.join()
+
+    assert 20 == len(connections)
+    assert not pool._open_connections
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+
+
+def test_retry_on_busy():
+    attempts = []
+
+    def operation():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise sqlite3.OperationalError("database is locked")
+        return "done"
+
+    assert "done" == retry_on_busy(operation, delay=0)
+    assert 3 == len(attempts)
+
+    attempts.clear()
+    with pytest.raises(sqlite3.OperationalError):
+        retry_on_busy(operation, retries=0, delay=0)
+    assert not is_busy_error(ValueError("database is locked"))
+
+
+def test_connections_not_shared_after_fork(tmp_path, monkeypatch):
+    db_path = tmp_path / "pool.db"
+    pool = ConnectionPool()
+    parent_connection, _ = pool.get(db_path)
+
+    parent_pid = os.getpid()
+    monkeypatch.setattr(connection_pool.os, "getpid", lambda: parent_pid + 1)
+    child_connection, _ = pool.get(db_path)
+
+    assert child_connection is not parent_connection
+    parent_connection.execute("SELECT 1")
+    pool.close_all()
+    parent_connection.close()
@@ -0,0 +1,137 @@
+import datetime
+
+import pandas as pd
+
+from src.unicycle.create_database import (
+    COL_NAMES_REGISTRATION_FILE,
+    create_database_points,
+    fill_database_riders,
+    fill_database_routines,
+    import_registration_incrementally,
+    remove_registration_file,
+    routine_keys,
+)
+from src.unicycle.db_handler import (
+    riders_db_handler,
+    riders_routines_db_handler,
+    routines_db_handler,
+)
+from src.unicycle.db_handler.db_handler import DbHandler
+
+
+def build_registration(file_name: str, entries: list) -> pd.DataFrame:
+    columns = [col for col in COL_NAMES_REGISTRATION_FILE if col != "entry_fee"]
+    registration = pd.DataFrame(
+        [
+            {
+                "name": name,
+                "date_of_birth": datetime.date(2012, 1, 1),
+                "gender": "w",
+                "name_individual": routine_name,
+                "age_group_individual": "U15",
+            }
+            for name, routine_name in entries
+        ]
+    ).reindex(columns=columns)
+    registration.insert(4, "club", "Verein")
+    return registration.assign(registration_file=file_name)
+
+
+def test_routine_keys():
+    df_existing = pd.DataFrame(
+        {
+            "id_routine": [3, 7, 7],
+            "routine_name": ["Kür", "Duo", "Duo"],
+            "category": ["individual female", "pair", "pair"],
+            "name": ["Anna", "Ben", "Anna"],
+            "date_of_birth": [datetime.date(2012, 1, 1)] * 3,
+        }
+    )
+    df_new = pd.DataFrame(
+        {
+            "id_routine": [10, 10, 11, 12],
+            "routine_name": ["Duo", "Duo", "Kür", "Kür"],
+            "category": ["pair", "pair", "individual", "individual"],
+            "name": ["Anna", "Ben", "Anna", "Carl"],
+            "date_of_birth": [datetime.date(2012, 1, 1)] * 4,
+        }
+    )
+
+    existing_keys = routine_keys(df_existing)
+    new_keys = routine_keys(df_new)
+
+    assert existing_keys[7] == new_keys[10]
+    assert existing_keys[3] == new_keys[11]
+    assert not new_keys.isin(set(existing_keys))[12]
+    assert routine_keys(df_new.iloc[0:0]).empty
+
+
+def test_import_registration_incrementally_keeps_points(tmp_path):
+    db_path = tmp_path / "competition.db"
+    riders = DbHandler(db_path, "riders")
+    routines = DbHandler(db_path, "routines")
+    riders_routines = DbHandler(db_path, "riders_routines")
+    points = DbHandler(db_path, "points")
+    riders.execute(riders_db_handler.SQL_CREATE_TABLE)
+    routines.execute(routines_db_handler.SQL_CREATE_TABLE)
+    riders_routines.execute(riders_routines_db_handler.SQL_CREATE_TABLE)
+    points.execute("CREATE TABLE points (id_routine INTEGER PRIMARY KEY, T1_Q REAL)")
+
+    # two registration files of the same club
+    registration_a = build_registration("a.xlsx", [("Anna", "Kür A"), ("Ben", "Kür B")])
+    registration_b = build_registration("b.xlsx", [("Carl", "Kür C")])
+    for registration in [registration_a, registration_b]:
+        fill_database_riders(registration, riders)
+        fill_database_routines(registration, riders, routines, riders_routines)
+    create_database_points(routines, points)
+    points.execute("UPDATE points SET T1_Q = 1.0")
+
+    registration_a.loc[1, "name_individual"] = "Kür B2"
+    import_registration_incrementally(registration_a, "a.xlsx", riders, routines)
+    create_database_points(routines, points)
+
+    df = routines.get_data(
+        """SELECT routines.routine_name, points.T1_Q FROM routines
+        JOIN points ON points.id_routine = routines.id_routine"""
+    ).set_index("routine_name")
+    assert ["Kür A", "Kür B2", "Kür C"] == sorted(df.index)
+    assert 1.0 == df.loc["Kür A", "T1_Q"]
+    assert 1.0 == df.loc["Kür C", "T1_Q"]
+    assert pd.isna(df.loc["Kür B2", "T1_Q"])
+    assert 3 == len(riders.get_data())
+    riders.disconnect()
+
+
+def test_import_registration_incrementally_removes_emptied_files(tmp_path):
+    db_path = tmp_path / "competition.db"
+    riders = DbHandler(db_path, "riders")
+    routines = DbHandler(db_path, "routines")
+    riders_routines = DbHandler(db_path, "riders_routines")
+    points = DbHandler(db_path, "points")
+    riders.execute(riders_db_handler.SQL_CREATE_TABLE)
+    routines.execute(routines_db_handler.SQL_CREATE_TABLE)
+    riders_routines.execute(riders_routines_db_handler.SQL_CREATE_TABLE)
+    points.execute("CREATE TABLE points (id_routine INTEGER PRIMARY KEY, T1_Q REAL)")
+
+    registrations = [
+        build_registration("a.xlsx", [("Anna", "Kür A")]),
+        build_registration("b.xlsx", [("Ben", "Kür B")]),
+        build_registration("c.xlsx", [("Carl", "Kür C")]),
+    ]
+    for registration in registrations:
+        fill_database_riders(registration, riders)
+        fill_database_routines(registration, riders, routines, riders_routines)
+    create_database_points(routines, points)
+
+    # a.xlsx has no riders left, c.xlsx was deleted
+    import_registration_incrementally(
+        registrations[0].iloc[0:0], "a.xlsx", riders, routines
+    )
+    remove_registration_file("c.xlsx", riders, routines)
+
+    assert ["Ben"] == riders.get_data()["name"].tolist()
+    assert ["Kür B"] == routines.get_data()["routine_name"].tolist()
+    id_routines = routines.get_data()["id_routine"].tolist()
+    assert id_routines == points.get_data()["id_routine"].tolist()
+    assert 1 == len(riders_routines.get_data())
+    riders.disconnect()
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.unicycle.dashboard.scoring import (
+    find_dirty_groups,
+    recalculate_all_results,
+    recalculate_dirty_results,
+)
+from src.unicycle.db_handler.db_handler import DbHandler
+from src.unicycle.db_handler.points_db_handler import PROJECT_ROOT
+
+
+def get_test_points() -> pd.DataFrame:
+    db_handler_points = DbHandler(Path(PROJECT_ROOT, "test/points_test.db"), "points")
+    df_points = db_handler_points.get_data()
+    df_points = df_points.set_index("id_routine").loc[[8, 9, 10, 19, 39, 40], :]
+    df_points["category"] = ["individual female"] * 3 + ["pair"] * 3
+    df_points["age_group"] = ["U15"] * 3 + ["U11"] * 3
+    return recalculate_all_results(df_points.reset_index())
+
+
+def test_find_dirty_groups():
+    df_previous = get_test_points()
+    df = df_previous.copy()
+    df.loc[df["id_routine"] == 19, "T1_Q"] = 1.5
+
+    assert {("pair", "U11")} == find_dirty_groups(df, df_previous)
+    assert set() == find_dirty_groups(df_previous.copy(), df_previous)
+    assert find_dirty_groups(df, None) is None
+    assert find_dirty_groups(df.iloc[1:], df_previous) is None
+
+
+def test_find_dirty_groups_moved_routine():
+    df_previous = get_test_points()
+    df = df_previous.copy()
+    df.loc[df["id_routine"] == 8, "age_group"] = "U11"
+
+    assert {("individual female", "U15"), ("individual female", "U11")} == (
+        find_dirty_groups(df, df_previous)
+    )
+
+
+def test_recalculate_dirty_results():
+    df_previous = get_test_points()
+    df = df_previous.copy()
+    df.loc[df["id_routine"] == 19, "T1_Q"] = 1.5
+    untouched = df["category"] == "individual female"
+    df.loc[untouched, "Ergebnis"] = -1.0
+
+    results = recalculate_dirty_results(df, df_previous)
+    expected = recalculate_all_results(df)
+
+    assert (results.loc[untouched, "Ergebnis"] == -1.0).all()
+    np.testing.assert_array_equal(
+        results.loc[~untouched, "Ergebnis"], expected.loc[~untouched, "Ergebnis"]
+    )
@@ -0,0 +1,35 @@
+import sqlite3
+
+import pandas as pd
+
+from src.unicycle.constants import TOTAL_COL
+from src.unicycle.dashboard.data_service import (
+    GROUP_CATEGORIES,
+    SQL_PARTICIPANT_VIEW,
+)
+
+
+def test_participant_view_names_ordered_by_rider():
+    con = sqlite3.connect(":memory:")
+    con.executescript(
+        f"""
+        CREATE TABLE riders (id_rider INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE routines (
+            id_routine INTEGER PRIMARY KEY,
+            routine_name TEXT,
+            category TEXT,
+            age_group TEXT);
+        CREATE TABLE riders_routines (
+            id_rider INTEGER,
+            id_routine INTEGER,
+            PRIMARY KEY (id_rider, id_routine));
+        CREATE TABLE points (id_routine INTEGER PRIMARY KEY, {TOTAL_COL} REAL);
+        INSERT INTO riders VALUES (1, 'Zoe'), (2, 'Anna'), (3, 'Mia');
+        INSERT INTO routines VALUES (1, 'Duo', 'pair', 'U15');
+        INSERT INTO riders_routines VALUES (3, 1), (1, 1), (2, 1);
+        """
+    )
+
+    df = pd.read_sql_query(SQL_PARTICIPANT_VIEW, con, params=sorted(GROUP_CATEGORIES))
+
+    assert ["Zoe, Anna, Mia"] == df["names"].tolist()
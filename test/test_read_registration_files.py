@@ -0,0 +1,64 @@
+import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.unicycle import create_database
+from src.unicycle.constants import get_path_project_root
+from src.unicycle.create_database import (
+    read_registration_file,
+    read_registration_file_streaming,
+    read_registration_files,
+)
+
+
+def test_read_registration_files_in_parallel():
+    files = sorted(
+        Path(get_path_project_root(), "data/registration_files").glob("*.xlsx")
+    )
+
+    sequential = read_registration_files(files, jobs=1)
+    parallel = read_registration_files(files, jobs=2)
+
+    assert len(files) == len(parallel)
+    for df_sequential, df_parallel in zip(sequential, parallel):
+        assert df_sequential.equals(df_parallel)
+
+
+def test_read_registration_files_from_cache(monkeypatch, tmp_path):
+    pytest.importorskip("pyarrow")
+    files = sorted(
+        Path(get_path_project_root(), "data/registration_files").glob("*.xlsx")
+    )
+
+    parsed = read_registration_files(files, cache_directory=tmp_path)
+
+    def parse_registration_file(path):
+        raise AssertionError(f"{path} was parsed instead of read from the cache")
+
+    monkeypatch.setitem(
+        create_database.REGISTRATION_PARSERS,
+        create_database.PARSER_PANDAS,
+        parse_registration_file,
+    )
+    cached = read_registration_files(files, cache_directory=tmp_path)
+
+    assert len(files) == len(list(tmp_path.glob("*.parquet")))
+    for df_parsed, df_cached in zip(parsed, cached):
+        pd.testing.assert_frame_equal(df_parsed, df_cached)
+        assert df_parsed.dtypes.equals(df_cached.dtypes)
+        dates_of_birth = df_cached["date_of_birth"].dropna()
+        assert not dates_of_birth.empty
+        assert dates_of_birth.map(type).eq(datetime.date).all()
+
+
+def test_read_registration_file_streaming():
+    files = sorted(
+        Path(get_path_project_root(), "data/registration_files").glob("*.xlsx")
+    )
+
+    for file in files:
+        pd.testing.assert_frame_equal(
+            read_registration_file(file), read_registration_file_streaming(file)
+        )
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from src.unicycle.dashboard.score_storage import STORAGE_LONG
+from src.unicycle.db_handler.db_handler import DbHandler
+from src.unicycle.db_handler.score_events_db_handler import ScoreEventsDbHandler
+from src.unicycle.db_handler.scores_db_handler import ScoresDbHandler
+from src.unicycle.replay_score_events import project_points, replay_score_events
+
+
+class TmpScoreEventsDbHandler(DbHandler):
+    create_table = ScoreEventsDbHandler.create_table
+    build_append_statement = ScoreEventsDbHandler.build_append_statement
+    append_events = ScoreEventsDbHandler.append_events
+    get_events = ScoreEventsDbHandler.get_events
+
+
+class TmpScoresDbHandler(DbHandler):
+    create_table = ScoresDbHandler.create_table
+    build_write_statements = ScoresDbHandler.build_write_statements
+
+
+def test_project_points():
+    df_routines = pd.DataFrame(
+        {
+            "id_routine": [1, 2, 3],
+            "category": ["pair"] * 3,
+            "age_group": ["U11"] * 3,
+        }
+    )
+    df_events = pd.DataFrame(
+        {
+            "id_routine": [1, 2, 1, 2],
+            "score_column": ["T1_Q", "T1_Q", "T1_Q", "D3_S"],
+            "value": [1.0, 2.0, 3.0, "–"],
+        }
+    )
+
+    df_points = project_points(df_events, df_routines).set_index("id_routine")
+
+    assert 3.0 == df_points.loc[1, "T1_Q"]
+    assert "–" == df_points.loc[2, "D3_S"]
+    assert np.isnan(df_points.loc[3, "T1_Q"])
+    assert 60.0 == df_points.loc[1, "Ergebnis"]
+
+
+def test_replay_score_events_long_storage(tmp_path):
+    db_path = tmp_path / "competition.db"
+    routines = DbHandler(db_path, "routines")
+    points = DbHandler(db_path, "points")
+    score_events = TmpScoreEventsDbHandler(db_path, "score_events")
+    scores = TmpScoresDbHandler(db_path, "scores")
+    routines.execute(
+        "CREATE TABLE routines (id_routine INTEGER PRIMARY KEY, category, age_group)"
+    )
+    routines.execute("INSERT INTO routines VALUES (1, 'pair', 'U11')")
+    points.execute(
+        "CREATE TABLE points (id_routine INTEGER PRIMARY KEY, T1_Q REAL, Ergebnis REAL)"
+    )
+    points.execute("INSERT INTO points VALUES (1, 9.0, 0.0)")
+    score_events.create_table()
+    score_events.append_events([(1, "T1_Q", 3.0, "2026-10-18T10:00:00", "session")])
+
+    assert replay_score_events(
+        score_storage=STORAGE_LONG,
+        points_db_handler=points,
+        routines_db_handler=routines,
+        score_events_db_handler=score_events,
+        scores_db_handler=scores,
+    )
+
+    df_points = points.get_data()
+    assert df_points["T1_Q"].isna().all()
+    assert [100.0] == df_points["Ergebnis"].tolist()
+    assert [(1, "T1", "Q", 3.0)] == list(
+        scores.get_data().itertuples(index=False, name=None)
+    )
+    points.disconnect()
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from src.unicycle.constants import SCORE_COLS
+from src.unicycle.dashboard.score_storage import (
+    LONG_COLS,
+    META_KEY_SCORE_STORAGE,
+    STORAGE_LONG,
+    STORAGE_WIDE,
+    pivot_scores,
+    switch_score_storage,
+    unpivot_score_cells,
+    unpivot_scores,
+)
+from src.unicycle.db_handler.db_handler import DbHandler
+from src.unicycle.db_handler.meta_db_handler import MetaDbHandler
+from src.unicycle.db_handler.scores_db_handler import ScoresDbHandler
+
+
+class TmpScoresDbHandler(DbHandler):
+    create_table = ScoresDbHandler.create_table
+    build_write_statements = ScoresDbHandler.build_write_statements
+
+
+class TmpMetaDbHandler(DbHandler):
+    create_table = MetaDbHandler.create_table
+    get_value = MetaDbHandler.get_value
+    build_set_statement = MetaDbHandler.build_set_statement
+
+
+def test_unpivot_score_cells():
+    cells = {1: {"T1_Q": 2.5, "D3_S": "–", "Ergebnis": 50.0}, 2: {"D1_N": None}}
+    upserts, deletes = unpivot_score_cells(cells)
+
+    assert [(1, "T1", "Q", 2.5)] == upserts
+    assert [(1, "D3", "S"), (2, "D1", "N")] == deletes
+
+
+def test_pivot_unpivot_scores():
+    df_wide = pd.DataFrame({"id_routine": [1, 2], "T1_Q": [1.5, np.nan]})
+    df_wide["D3_S"] = ["–", 4]
+
+    df_long = unpivot_scores(df_wide)
+    assert [(1, "T1", "Q", 1.5), (2, "D3", "S", 4.0)] == list(
+        df_long.itertuples(index=False, name=None)
+    )
+
+    df_pivot = pivot_scores(df_long).set_index("id_routine")
+    assert SCORE_COLS == df_pivot.columns.tolist()
+    assert 1.5 == df_pivot.loc[1, "T1_Q"]
+    assert 4.0 == df_pivot.loc[2, "D3_S"]
+    assert df_pivot.drop(columns=["T1_Q", "D3_S"]).isna().all().all()
+
+
+def test_switch_score_storage_keeps_scores(tmp_path):
+    db_path = tmp_path / "competition.db"
+    points = DbHandler(db_path, "points")
+    scores = TmpScoresDbHandler(db_path, "scores")
+    meta = TmpMetaDbHandler(db_path, "meta")
+    points.execute(
+        f"CREATE TABLE points (id_routine INTEGER PRIMARY KEY, "
+        f"{', '.join(f'{col} REAL' for col in SCORE_COLS)}, Ergebnis REAL)"
+    )
+    points.execute(
+        "INSERT INTO points (id_routine, T1_Q, Ergebnis) VALUES (1, 1.5, 50.0)"
+    )
+    points.execute("INSERT INTO points (id_routine, Ergebnis) VALUES (2, 40.0)")
+
+    def wide_scores():
+        return unpivot_scores(points.get_data()).sort_values(LONG_COLS)
+
+    def long_scores():
+        return scores.get_data().sort_values(LONG_COLS)
+
+    assert switch_score_storage(STORAGE_WIDE, points, scores, meta)
+    assert STORAGE_WIDE == meta.get_value(META_KEY_SCORE_STORAGE)
+
+    assert switch_score_storage(STORAGE_LONG, points, scores, meta)
+    assert [(1, "T1", "Q", 1.5)] == list(
+        long_scores().itertuples(index=False, name=None)
+    )
+    scores.execute("INSERT INTO scores VALUES (2, 'D1', 'N', 3.0)")
+    scores.execute("DELETE FROM scores WHERE id_routine = 1")
+
+    assert switch_score_storage(STORAGE_WIDE, points, scores, meta)
+    assert [(2, "D1", "N", 3.0)] == list(
+        wide_scores().itertuples(index=False, name=None)
+    )
+    assert [50.0, 40.0] == points.get_data()["Ergebnis"].tolist()
+    points.execute("UPDATE points SET T2_Q = 2.0 WHERE id_routine = 1")
+
+    assert switch_score_storage(STORAGE_LONG, points, scores, meta)
+    assert STORAGE_LONG == meta.get_value(META_KEY_SCORE_STORAGE)
+    assert [(1, "T2", "Q", 2.0), (2, "D1", "N", 3.0)] == list(
+        long_scores().itertuples(index=False, name=None)
+    )
+    assert switch_score_storage(STORAGE_LONG, points, scores, meta)
+    assert 2 == len(long_scores())
+    points.disconnect()
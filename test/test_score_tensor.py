@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from src.unicycle.constants import SCORE_COLS
+from src.unicycle.dashboard.score_tensor import CATEGORIES, JUDGES, build_judge_mask
+from src.unicycle.dashboard.scoring import build_score_tensor
+
+
+def test_build_judge_mask():
+    mask = build_judge_mask(
+        np.array([CATEGORIES.index("pair"), CATEGORIES.index("large_group"), -1])
+    )
+
+    assert mask[0, JUDGES.index("D2")]
+    assert not mask[0, JUDGES.index("D3")]
+    assert mask[1, JUDGES.index("D4")]
+    assert not mask[2].any()
+
+
+def test_build_score_tensor():
+    df = pd.DataFrame([np.arange(len(SCORE_COLS), dtype=float)], columns=SCORE_COLS)
+    scores = build_score_tensor(df)
+
+    assert (1, len(JUDGES), 3) == scores.shape
+    assert df.loc[0, "P2_C"] == scores[0, JUDGES.index("P2"), 1]
+    assert df.loc[0, "D4_N"] == scores[0, JUDGES.index("D4"), 2]
@@ -1,4 +1,12 @@
-from src.unicycle.create_database import set_age_group
+import numpy as np
+import pandas as pd
+
+from src.unicycle.constants import AGE_GROUPS
+from src.unicycle.create_database import (
+    assign_age_groups,
+    compile_age_groups,
+    set_age_group,
+)
 
 
 def test_set_age_group():
@@ -6,3 +14,20 @@ def test_set_age_group():
     assert "U15" == set_age_group(14, ["U13", "U15", "15+"])
     assert "15+" == set_age_group(15, ["U13", "U15", "15+"])
     assert "15+" == set_age_group(16, ["U13", "U15", "15+"])
+
+
+def test_assign_age_groups():
+    ages = pd.Series(list(range(0, 30)) * len(AGE_GROUPS) + [np.nan, 10])
+    categories = pd.Series(
+        [category for category in AGE_GROUPS for _ in range(0, 30)]
+        + ["pair", "individual"]
+    )
+
+    assigned = assign_age_groups(ages, categories, compile_age_groups(AGE_GROUPS))
+
+    expected = [
+        set_age_group(age, AGE_GROUPS[category])
+        for age, category in zip(ages[:-2], categories[:-2])
+    ]
+    assert expected == assigned[:-2].tolist()
+    assert assigned[-2:].isna().all()
@@ -0,0 +1,60 @@
+from src.unicycle.dashboard.table_query import (
+    filter_query_to_sql,
+    sort_by_to_sql,
+    split_filter_part,
+    split_filter_query,
+)
+
+COLUMNS = {"routine_name": "routine_name", "category_label": "category_label"}
+
+
+def test_split_filter_part():
+    assert ("routine_name", "contains", "Die Eiskönigin") == split_filter_part(
+        '{routine_name} contains "Die Eiskönigin"'
+    )
+    assert ("age_group", "is blank", "") == split_filter_part("{age_group} is blank")
+    assert split_filter_part("routine_name contains x") is None
+
+
+def test_filter_query_to_sql():
+    where, params = filter_query_to_sql(
+        "{routine_name} icontains elsa && {category_label} = Paar", COLUMNS
+    )
+    expected = "WHERE instr(lower(routine_name), lower(?)) > 0 AND category_label = ?"
+    assert expected == where
+    assert ["elsa", "Paar"] == params
+
+
+def test_split_filter_query_respects_quotes():
+    assert [
+        '{routine_name} contains "Tom && Jerry" ',
+        " {category_label} = 'Paar'",
+    ] == split_filter_query(
+        "{routine_name} contains \"Tom && Jerry\" && {category_label} = 'Paar'"
+    )
+    assert ['{routine_name} = "a \\" && b"'] == split_filter_query(
+        '{routine_name} = "a \\" && b"'
+    )
+    where, params = filter_query_to_sql(
+        '{routine_name} contains "Tom && Jerry"', COLUMNS
+    )
+    assert "WHERE instr(routine_name, ?) > 0" == where
+    assert ["Tom && Jerry"] == params
+
+
+def test_filter_query_to_sql_ignores_unknown_columns():
+    where, params = filter_query_to_sql(
+        "{names} contains x && {routine_name} foo y", COLUMNS
+    )
+    assert ("", []) == (where, params)
+    assert ("", []) == filter_query_to_sql(None, COLUMNS)
+
+
+def test_sort_by_to_sql():
+    sort_by = [
+        {"column_id": "category_label", "direction": "desc"},
+        {"column_id": "names; DROP TABLE points", "direction": "asc"},
+    ]
+    assert "ORDER BY category_label DESC, id_routine" == sort_by_to_sql(
+        sort_by, COLUMNS, ["id_routine"]
+    )
@@ -0,0 +1,22 @@
+from src.unicycle.db_handler.connection_pool import CONNECTION_POOL
+from src.unicycle.db_handler.table_versions_db_handler import TableVersionsDbHandler
+
+
+def test_table_versions(monkeypatch, tmp_path):
+    db_path = tmp_path / "competition.db"
+    handler = TableVersionsDbHandler()
+    monkeypatch.setattr(handler, "db_path", db_path)
+    handler.execute("CREATE TABLE points (id_routine INTEGER PRIMARY KEY, T1_Q REAL)")
+
+    assert handler.create_table(["points", "riders"])
+    assert (0, None) == handler.get_versions(["points", "riders"])
+
+    handler.execute("INSERT INTO points (id_routine) VALUES (?)", [(1,), (2,)])
+    handler.execute("UPDATE points SET T1_Q = 2.0 WHERE id_routine = 1")
+    assert (3,) == handler.get_versions(["points"])
+
+    CONNECTION_POOL.close(db_path)
+    assert handler.create_table(["points"])
+    handler.execute("DELETE FROM points")
+    assert (5,) == handler.get_versions(["points"])
+    CONNECTION_POOL.close(db_path)
@@ -0,0 +1,47 @@
+import sqlite3
+
+import pytest
+
+from src.unicycle.db_handler.db_handler import DbHandler
+
+
+def count_rows(db_path, table_name: str) -> int:
+    with sqlite3.connect(db_path) as db_connection:
+        return db_connection.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+
+
+def test_transaction_commits_at_end(tmp_path):
+    db_path = tmp_path / "competition.db"
+    riders = DbHandler(db_path, "riders")
+    routines = DbHandler(db_path, "routines")
+    riders.execute("CREATE TABLE riders (id_rider INTEGER PRIMARY KEY)")
+    routines.execute("CREATE TABLE routines (id_routine INTEGER PRIMARY KEY)")
+
+    with riders.transaction():
+        riders.execute("INSERT INTO riders VALUES (?)", [(1,), (2,)])
+        with routines.transaction():
+            routines.execute_statements([("INSERT INTO routines VALUES (?)", [(1,)])])
+        assert 0 == count_rows(db_path, "riders")
+        assert 0 == count_rows(db_path, "routines")
+
+    assert 2 == count_rows(db_path, "riders")
+    assert 1 == count_rows(db_path, "routines")
+    assert not riders.in_transaction
+    riders.disconnect()
+
+
+def test_transaction_rolls_back_on_error(tmp_path):
+    db_path = tmp_path / "competition.db"
+    riders = DbHandler(db_path, "riders")
+    riders.execute("CREATE TABLE riders (id_rider INTEGER PRIMARY KEY)")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with riders.transaction():
+            riders.execute("INSERT INTO riders VALUES (?)", [(1,), (2,)])
+            riders.execute("INSERT INTO riders VALUES (?)", [(2,)])
+
+    assert 0 == count_rows(db_path, "riders")
+    assert not riders.in_transaction
+    riders.execute("INSERT INTO riders VALUES (?)", [(3,)])
+    assert 1 == count_rows(db_path, "riders")
+    riders.disconnect()
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from src.unicycle.dashboard.data_service import find_changed_cells
+from src.unicycle.db_handler.db_handler import DbHandler
+
+
+def test_upsert_rows(tmp_path):
+    db_handler = DbHandler(tmp_path / "points.db", "points")
+    db_handler.execute(
+        "CREATE TABLE points (id_routine INTEGER PRIMARY KEY, T1_Q REAL, T1_M REAL)"
+    )
+    db_handler.execute("INSERT INTO points VALUES (1, 1.0, 2.0), (2, 3.0, 4.0)")
+
+    df = pd.DataFrame({"id_routine": [2, 3], "T1_Q": [5.0, np.nan], "T1_M": [9.0, 6.0]})
+    db_handler.upsert_rows(df, ["id_routine"], ["T1_Q"])
+
+    points = db_handler.get_data().set_index("id_routine")
+    assert 1.0 == points.loc[1, "T1_Q"]
+    assert 5.0 == points.loc[2, "T1_Q"]
+    assert 4.0 == points.loc[2, "T1_M"]
+    assert np.isnan(points.loc[3, "T1_Q"])
+    assert np.isnan(points.loc[3, "T1_M"])
+    db_handler.disconnect()
+
+
+def test_find_changed_cells():
+    df_previous = pd.DataFrame(
+        {"id_routine": [1, 2], "T1_Q": [1.0, np.nan], "D3_S": ["–", 2]}
+    )
+    df = pd.DataFrame(
+        {"id_routine": [2, 1, 3], "T1_Q": [np.nan, 1.5, np.nan], "D3_S": [2, "–", 1]}
+    )
+
+    changed = find_changed_cells(df, df_previous, ["T1_Q", "D3_S"])
+
+    assert [False, True, True] == changed["T1_Q"].tolist()
+    assert [False, False, True] == changed["D3_S"].tolist()
+    assert find_changed_cells(df, None, ["T1_Q"])["T1_Q"].all()
@@ -0,0 +1,118 @@
+import pandas as pd
+
+from src.unicycle.dashboard import data_service
+from src.unicycle.dashboard.data_service import DataService
+
+
+def get_data_service(monkeypatch, tmp_path) -> DataService:
+    monkeypatch.setattr(data_service, "migrate_legacy_databases", lambda: None)
+    monkeypatch.setattr(data_service.POINTS_DB_HANDLER, "repair_table", lambda: None)
+    monkeypatch.setattr(data_service, "seed_score_events", lambda *args: False)
+    monkeypatch.setattr(
+        data_service.POINTS_DB_HANDLER, "execute_statements", lambda *args: True
+    )
+    monkeypatch.setattr(
+        data_service.TABLE_VERSIONS_DB_HANDLER, "create_table", lambda: True
+    )
+    monkeypatch.setattr(
+        data_service.TABLE_VERSIONS_DB_HANDLER,
+        "get_versions",
+        lambda tables: tuple(0 for _ in tables),
+    )
+    return DataService(tmp_path)
+
+
+def test_view_cache(monkeypatch, tmp_path):
+    service = get_data_service(monkeypatch, tmp_path)
+    loads = []
+
+    def query_participant_view_data():
+        loads.append(1)
+        return pd.DataFrame({"id_routine": [1], "Ergebnis": [50.0]})
+
+    monkeypatch.setattr(
+        service, "query_participant_view_data", query_participant_view_data
+    )
+
+    df = service.load_participant_view_data()
+    df.loc[0, "Ergebnis"] = 0.0
+    assert 50.0 == service.load_participant_view_data().loc[0, "Ergebnis"]
+    assert 1 == len(loads)
+
+    service.save_points(pd.DataFrame({"id_routine": [1], "T1_Q": [2.0]}))
+    service.load_participant_view_data()
+    assert 2 == len(loads)
+
+    service.save_points(pd.DataFrame({"id_routine": [1]}), previous=None)
+    service.load_participant_view_data()
+    assert 2 == len(loads)
+
+
+def test_view_cache_detects_writes_of_other_processes(monkeypatch, tmp_path):
+    service = get_data_service(monkeypatch, tmp_path)
+    versions = {"riders": 0, "routines": 0, "riders_routines": 0, "points": 0}
+    monkeypatch.setattr(
+        data_service.TABLE_VERSIONS_DB_HANDLER,
+        "get_versions",
+        lambda tables: tuple(versions.get(table) for table in tables),
+    )
+    loads = []
+
+    def query_jury_view_data():
+        loads.append("jury")
+        return pd.DataFrame({"id_routine": [1]})
+
+    def query_participant_view_data():
+        loads.append("participant")
+        return pd.DataFrame({"id_routine": [1]})
+
+    monkeypatch.setattr(service, "query_jury_view_data", query_jury_view_data)
+    monkeypatch.setattr(
+        service, "query_participant_view_data", query_participant_view_data
+    )
+
+    service.load_jury_view_data()
+    service.load_participant_view_data()
+    versions["riders"] += 1
+    service.load_jury_view_data()
+    service.load_participant_view_data()
+    assert ["jury", "participant", "participant"] == loads
+
+    versions["points"] += 1
+    service.load_jury_view_data()
+    service.load_jury_view_data()
+    assert ["jury", "participant", "participant", "jury"] == loads
+
+
+def test_view_cache_without_table_versions(monkeypatch, tmp_path):
+    service = get_data_service(monkeypatch, tmp_path)
+    monkeypatch.setattr(
+        data_service.TABLE_VERSIONS_DB_HANDLER,
+        "get_versions",
+        lambda tables: tuple(None for _ in tables),
+    )
+    loads = []
+
+    def query_participant_view_data():
+        loads.append(1)
+        return pd.DataFrame({"id_routine": [1]})
+
+    monkeypatch.setattr(
+        service, "query_participant_view_data", query_participant_view_data
+    )
+
+    service.load_participant_view_data()
+    service.load_participant_view_data()
+    assert 2 == len(loads)
+
+
+def test_view_cache_waits_briefly_for_queued_writes(monkeypatch, tmp_path):
+    service = get_data_service(monkeypatch, tmp_path)
+    timeouts = []
+    monkeypatch.setattr(
+        service, "flush_points", lambda timeout=None: timeouts.append(timeout)
+    )
+
+    service.load_cached_view("view", lambda: pd.DataFrame({"a": [1]}), ["points"])
+
+    assert [data_service.VIEW_FLUSH_TIMEOUT] == timeouts
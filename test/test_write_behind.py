@@ -0,0 +1,136 @@
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.unicycle.dashboard.data_service import (
+    collect_changed_cells,
+    find_changed_cells,
+)
+from src.unicycle.dashboard.write_behind import WriteBehindQueue, coalesce_changes
+
+
+def test_coalesce_changes():
+    batch = [{1: {"T1_Q": 1.0}}, {1: {"T1_Q": 2.0, "T1_M": 3.0}, 2: {"D1_S": 1}}]
+    assert {1: {"T1_Q": 2.0, "T1_M": 3.0}, 2: {"D1_S": 1}} == coalesce_changes(batch)
+
+
+def test_collect_changed_cells():
+    df_previous = pd.DataFrame({"id_routine": [1, 2], "T1_Q": [1.0, 2.0]})
+    df = pd.DataFrame({"id_routine": [1, 2], "T1_Q": [1.0, np.nan]})
+    changed = find_changed_cells(df, df_previous, ["T1_Q"])
+    assert {2: {"T1_Q": None}} == collect_changed_cells(df, changed)
+
+
+def test_write_behind_queue():
+    written = []
+    release_writer = threading.Event()
+
+    def write_changes(change_sets):
+        release_writer.wait()
+        written.extend(change_sets)
+        return True
+
+    writer = WriteBehindQueue(write_changes)
+    writer.enqueue({1: {"T1_Q": 1.0}})
+    writer.enqueue({1: {"T1_Q": 2.0}})
+    writer.enqueue({2: {"T1_Q": 3.0}})
+    assert 3 == writer.status()["pending"]
+    assert not writer.flush(timeout=0.01)
+
+    release_writer.set()
+    assert writer.flush(timeout=5)
+    assert {
+        "pending": 0,
+        "durable": 3,
+        "failed": 0,
+        "rejected": 0,
+        "last_error": None,
+    } == (writer.status())
+    assert {1: {"T1_Q": 2.0}, 2: {"T1_Q": 3.0}} == coalesce_changes(written)
+    writer.close(timeout=5)
+    assert not writer.thread.is_alive()
+
+
+def test_write_behind_queue_retries_failed_write():
+    persisted = {}
+    attempts = []
+
+    def write_changes(change_sets):
+        attempts.append(list(change_sets))
+        if len(attempts) == 1:
+            raise RuntimeError("database is locked")
+        for id_routine, cells in coalesce_changes(change_sets).items():
+            persisted.setdefault(id_routine, {}).update(cells)
+        return True
+
+    writer = WriteBehindQueue(write_changes, retry_delay=0.01)
+    writer.enqueue({1: {"T1_Q": 1.0}})
+    assert writer.flush(timeout=5)
+
+    assert 2 == len(attempts)
+    assert {1: {"T1_Q": 1.0}} == persisted
+    assert {
+        "pending": 0,
+        "durable": 1,
+        "failed": 0,
+        "rejected": 0,
+        "last_error": None,
+    } == (writer.status())
+    writer.close(timeout=5)
+    assert not writer.thread.is_alive()
+
+
+def test_write_behind_queue_coalesces_retry_with_newer_changes():
+    persisted = {}
+    attempts = []
+    release_retry = threading.Event()
+
+    def write_changes(change_sets):
+        attempts.append(list(change_sets))
+        if len(attempts) == 1:
+            release_retry.wait()
+            return False
+        for id_routine, cells in coalesce_changes(change_sets).items():
+            persisted.setdefault(id_routine, {}).update(cells)
+        return True
+
+    writer = WriteBehindQueue(write_changes, retry_delay=0.01)
+    writer.enqueue({1: {"T1_Q": 1.0}})
+    writer.enqueue({1: {"T1_Q": 2.0}})
+    release_retry.set()
+    assert writer.flush(timeout=5)
+
+    assert {1: {"T1_Q": 2.0}} == persisted
+    assert 2 == writer.status()["durable"]
+    writer.close(timeout=5)
+
+
+def test_write_behind_queue_rejects_permanently_failing_change_set():
+    persisted = {}
+    release_writer = threading.Event()
+
+    def write_changes(change_sets):
+        release_writer.wait()
+        if any(2 in change_set for change_set in change_sets):
+            raise sqlite3.IntegrityError("NOT NULL constraint failed")
+        for id_routine, cells in coalesce_changes(change_sets).items():
+            persisted.setdefault(id_routine, {}).update(cells)
+        return True
+
+    writer = WriteBehindQueue(write_changes, retry_delay=0.01, max_attempts=2)
+    writer.enqueue({1: {"T1_Q": 1.0}})
+    writer.enqueue({2: {"T1_Q": 2.0}})
+    release_writer.set()
+    assert writer.flush(timeout=5)
+
+    assert {1: {"T1_Q": 1.0}} == persisted
+    status = writer.status()
+    assert (0, 1, 1) == (status["pending"], status["durable"], status["rejected"])
+    assert "NOT NULL constraint failed" == status["last_error"]
+
+    writer.enqueue({3: {"T1_Q": 3.0}})
+    assert writer.flush(timeout=5)
+    assert {1: {"T1_Q": 1.0}, 3: {"T1_Q": 3.0}} == persisted
+    writer.close(timeout=5)